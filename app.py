@@ -1,35 +1,69 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import google.generativeai as genai
-from datetime import datetime
-import requests
-import json
-import random
-import base64
-from io import BytesIO
-import matplotlib.pyplot as plt
-import seaborn as sns
-import PyPDF2
-import docx
-
-from src.data_analyzer import DataAnalyzer
-from src.visualization import create_visualization
+import os
+import threading
+import time
+
 from src.news_analyzer import NewsAnalyzer
+from src.processing_cache import ProcessingCache
+from src.rendering import ChartRenderer
+from src.context_builder import ContextBuilder, estimate_tokens
+from src.llm_client import GeminiClient
+from src.jobs import DONE, JobScheduler
+
+# Location of the on-disk news cache shared by all sessions
+NEWS_CACHE_PATH = ".cache/news.sqlite"
+# Memory budget for processed uploads kept across reruns and sessions
+PROCESSING_CACHE_BYTES = 2 * 1024 ** 3
+# Estimated tokens of retrieved passages allowed into a chat prompt
+CONTEXT_TOKEN_BUDGET = 2000
+# Tokens of precomputed column statistics added to each chat prompt
+STATS_TOKEN_BUDGET = 800
+# Background news analyses running at once across all sessions
+NEWS_JOB_WORKERS = 4
+# News analyses still running after this many seconds are stopped
+NEWS_JOB_TIMEOUT = 120
+# How often the News tab checks a running analysis for new articles
+NEWS_POLL_SECONDS = 1
+# Wider datasets only show their strongest correlation pairs
+MAX_CORRELATION_MATRIX_COLUMNS = 30
+
+@st.cache_resource
+def get_news_analyzer():
+    """One NewsAnalyzer per server so its caches are shared across sessions"""
+    os.makedirs(os.path.dirname(NEWS_CACHE_PATH), exist_ok=True)
+    return NewsAnalyzer(cache_path=NEWS_CACHE_PATH)
+
+@st.cache_resource
+def get_processing_cache():
+    """One processing cache per server so reruns and sessions share processed files"""
+    return ProcessingCache(max_bytes=PROCESSING_CACHE_BYTES)
+
+@st.cache_resource
+def get_chart_renderer():
+    """One chart renderer per server so rendered charts are shared across sessions"""
+    return ChartRenderer()
+
+@st.cache_resource
+def get_context_builder():
+    """Shared packer for the passages sent with chat prompts"""
+    return ContextBuilder(token_budget=CONTEXT_TOKEN_BUDGET)
+
+@st.cache_resource
+def get_job_scheduler():
+    """One job scheduler per server so sessions analyzing the same dataset share a job"""
+    return JobScheduler(max_workers=NEWS_JOB_WORKERS, timeout=NEWS_JOB_TIMEOUT)
 
 # Initialize session state variables
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'df' not in st.session_state:
     st.session_state.df = None
-if 'analyzer' not in st.session_state:
-    st.session_state.analyzer = DataAnalyzer()
 if 'news_analyzer' not in st.session_state:
-    st.session_state.news_analyzer = NewsAnalyzer()
+    st.session_state.news_analyzer = get_news_analyzer()
 if 'news_data' not in st.session_state:
     st.session_state.news_data = None
+if 'tab_seconds' not in st.session_state:
+    st.session_state.tab_seconds = {}
 
 # Set page configuration
 st.set_page_config(
@@ -115,27 +149,31 @@ st.markdown("""
 
 # Configure Gemini API
 GOOGLE_API_KEY = "Google_API_KEY"
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_MODEL = "gemini-2.0-flash"
 
-def get_gemini_response(df, query, analyzer):
-    """Get response from Gemini model using RAG approach"""
-    try:
-        # Search for relevant documents
-        relevant_docs = analyzer.search_documents(query)
-        
-        # Prepare context with relevant documents
-        context = f"""
+@st.cache_resource
+def get_llm_client():
+    """One pooled, caching Gemini client per server"""
+    return GeminiClient(GOOGLE_API_KEY, model=GEMINI_MODEL)
+
+def build_prompt(df, query, context, stats):
+    """Prompt for the RAG approach, with the passages packed into ``context`` and column statistics"""
+    return f"""
         You are a data analysis expert. Analyze the following data and answer the user's question.
-        Base your response ONLY on the provided data from the Excel file.
+        Base your response ONLY on the provided data from the Excel file. The retrieved rows are only
+        examples; use the statistics, which cover every row, for totals, distributions and comparisons.
         
         Relevant Data from Excel:
-        {json.dumps(relevant_docs, indent=2)}
+        {context.text}
         
         Dataset Information:
         - Number of rows: {len(df)}
         - Number of columns: {len(df.columns)}
         - Column names: {', '.join(df.columns)}
         
+        Statistics computed over all rows:
+        {stats.text(STATS_TOKEN_BUDGET)}
+        
         User Query: {query}
         
         Please provide:
@@ -147,50 +185,106 @@ def get_gemini_response(df, query, analyzer):
         If the query involves calculations, perform them on the provided data and show your work.
         Format your response in a clear, structured way with specific numbers and insights from the data.
         """
-        
-        # Prepare the API request
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        
-        data = {
-            "contents": [{
-                "parts": [{"text": context}]
-            }]
-        }
-        
-        # Make the API request
-        response = requests.post(
-            f"{GEMINI_API_URL}?key={GOOGLE_API_KEY}",
-            headers=headers,
-            json=data
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result['candidates'][0]['content']['parts'][0]['text']
-        else:
-            st.error(f"API Error: {response.status_code} - {response.text}")
-            return "I apologize, but I'm having trouble processing your request. Please try again or rephrase your question."
-            
+
+def stream_gemini_response(prompt, timing):
+    """Yield the Gemini response to a prepared prompt as it streams in.
+
+    Any answer still streaming for this session is cancelled first, so a new
+    question stops reading the previous one. Time to first token and total
+    time are written into ``timing``.
+    """
+    previous = st.session_state.get('chat_cancel')
+    if previous is not None:
+        previous.set()
+    cancel = st.session_state.chat_cancel = threading.Event()
+    start = time.perf_counter()
+    try:
+        for chunk in get_llm_client().stream(prompt, cancel):
+            timing.setdefault('first_token', time.perf_counter() - start)
+            yield chunk
     except Exception as e:
         st.error(f"Error with Gemini API: {str(e)}")
-        return "I apologize, but I'm having trouble processing your request. Please try again or rephrase your question."
+        yield "I apologize, but I'm having trouble processing your request. Please try again or rephrase your question."
+    finally:
+        timing['total'] = time.perf_counter() - start
 
 def process_file(uploaded_file):
-    """Process uploaded file and return DataFrame"""
+    """Process uploaded file, reusing earlier results for the same file contents"""
     try:
         if uploaded_file is not None:
-            df = st.session_state.analyzer.load_data(uploaded_file)
-            if df is not None:
-                # Clean the data
-                df = st.session_state.analyzer.clean_data(df)
-                return df
+            return get_processing_cache().process(uploaded_file)
         return None
     except Exception as e:
         st.error(f"Error processing file: {str(e)}")
         return None
 
+def display_cleaning_report(report):
+    """Display the data-quality report produced while cleaning"""
+    if report is None:
+        return
+        
+    st.markdown("#### Data Quality")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Rows Loaded", f"{report.n_rows:,}")
+    with col2:
+        st.metric("Duplicate Rows Removed", f"{report.duplicates:,}")
+    with col3:
+        st.metric("Columns With Missing Values", int((report.missing['Missing Values'] > 0).sum()))
+    
+    missing = report.missing[report.missing['Missing Values'] > 0]
+    if not missing.empty:
+        st.markdown("##### Missing Values")
+        st.dataframe(missing)
+    
+    if not report.outliers.empty:
+        st.markdown("##### Outliers (IQR method)" + (" - approximate quartiles" if report.approximate else ""))
+        st.dataframe(report.outliers)
+
+def display_cache_stats():
+    """Show how much processing the cache has saved"""
+    stats = get_processing_cache().stats()
+    with st.sidebar.expander("Processing Cache"):
+        st.metric("Reruns Served From Cache", stats['hits'])
+        st.metric("Processing Time Saved", f"{stats['seconds_saved']:.1f}s")
+        st.caption(f"{stats['entries']} datasets cached, {stats['bytes'] / 2 ** 20:,.0f} MB, "
+                   f"{stats['evictions']} evicted")
+
+def display_llm_stats():
+    """Show request, cache and latency metrics of the Gemini client"""
+    stats = get_llm_client().stats()
+    with st.sidebar.expander("Gemini Client"):
+        st.metric("Cached Answers", stats['cache']['hits'])
+        st.caption(f"{stats['requests']} requests, {stats['retries']} retries, {stats['errors']} errors, "
+                   f"{stats['coalesced']} coalesced, {stats['cancelled']} cancelled")
+        st.caption(f"Tokens: {stats['prompt_tokens']:,} prompt, {stats['response_tokens']:,} response")
+        if stats['latency_p50'] is not None:
+            st.caption(f"Latency: p50 {stats['latency_p50']:.2f}s, p95 {stats['latency_p95']:.2f}s")
+        if stats['first_token_p50'] is not None:
+            st.caption(f"First token: p50 {stats['first_token_p50']:.2f}s, p95 {stats['first_token_p95']:.2f}s")
+
+def display_news_card(article):
+    """Show one impact row as a card colored by its sentiment"""
+    sentiment_class = article['sentiment'].lower()
+    # Syndicated copies of the story were merged into this card
+    copies = int(article.get('cluster_size', 1)) - 1
+    also_on = f" and {copies} other site{'s' if copies > 1 else ''}" if copies else ''
+    if article['sentiment'] == 'Pending':
+        sentiment = "Sentiment: scored once all articles have arrived"
+    else:
+        sentiment = f"Sentiment: {article['sentiment']} (Confidence: {article['confidence']:.2f})"
+    st.markdown(f"""
+    <div class="news-card {sentiment_class}">
+        <h4>{article['title']}</h4>
+        <p>{article['summary']}</p>
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <span>Source: {article['source']}{also_on}</span>
+            <span>{sentiment}</span>
+        </div>
+        <a href="{article['url']}" target="_blank">Read More</a>
+    </div>
+    """, unsafe_allow_html=True)
+
 def display_news_analysis(news_data):
     """Display news analysis in a structured format"""
     if news_data is None:
@@ -213,104 +307,201 @@ def display_news_analysis(news_data):
             st.metric("Negative News", sentiment_counts.get('Negative', 0))
         with col3:
             st.metric("Neutral News", sentiment_counts.get('Neutral', 0))
+        counts = news_data.get('counts')
+        if counts is not None:
+            st.caption(f"{counts['new']} articles fetched, {counts['cached']} reused from the article store, "
+                       f"{counts.get('duplicates', 0)} syndicated copies merged")
         
         # Display news articles
         st.markdown("### Latest News Articles")
         for _, article in impact_df.iterrows():
-            sentiment_class = article['sentiment'].lower()
-            st.markdown(f"""
-            <div class="news-card {sentiment_class}">
-                <h4>{article['title']}</h4>
-                <p>{article['summary']}</p>
-                <div style="display: flex; justify-content: space-between; align-items: center;">
-                    <span>Source: {article['source']}</span>
-                    <span>Sentiment: {article['sentiment']} (Confidence: {article['confidence']:.2f})</span>
-                </div>
-                <a href="{article['url']}" target="_blank">Read More</a>
-            </div>
-            """, unsafe_allow_html=True)
+            display_news_card(article)
     else:
         st.info("No relevant news articles found. Try uploading a different dataset or try again later.")
 
+def wait_for(result, label):
+    """Show progress until a lazy result is ready, then return its value, or None after showing its error"""
+    if not result.done():
+        bar = st.progress(result.progress, text=label)
+        while not result.done():
+            time.sleep(0.1)
+            bar.progress(result.progress, text=result.message or label)
+        bar.empty()
+    try:
+        return result.result()
+    except Exception as e:
+        st.error(f"Error computing {result.name}: {str(e)}")
+        return None
+
+def show_analysis_tab(dataset):
+    st.markdown("### Data Analysis")
+    display_cleaning_report(dataset.report)
+    
+    # Display basic statistics
+    summary = wait_for(dataset.results.get('summary'), "Summarizing columns...")
+    if summary is not None:
+        st.markdown("#### Basic Statistics")
+        st.write(summary['describe'])
+        
+        # Display data types
+        st.markdown("#### Data Types")
+        st.write(summary['dtypes'].astype(str))
+    
+    # Display correlations between numeric columns
+    correlation = wait_for(dataset.results.get('correlation'), "Correlating columns...")
+    if correlation is not None and correlation['matrix'] is not None:
+        st.markdown("#### Strongest Correlations")
+        st.dataframe(correlation['strongest_pairs'])
+        # The full matrix is only readable for a modest number of columns
+        if len(correlation['matrix']) <= MAX_CORRELATION_MATRIX_COLUMNS:
+            st.markdown("#### Correlation Matrix")
+            st.write(correlation['matrix'])
+
+def show_visualization_tab(dataset):
+    df = dataset.df
+    st.markdown("### Visualization")
+    # Visualization options
+    chart_type = st.selectbox("Select Chart Type", 
+        ["Bar Chart", "Line Chart", "Scatter Plot", "Histogram", "Box Plot", "Violin Plot"])
+    
+    # Column selection
+    x_col = st.selectbox("Select X-axis column", df.columns)
+    
+    if chart_type in ["Bar Chart", "Line Chart", "Scatter Plot", "Box Plot", "Violin Plot"]:
+        y_col = st.selectbox("Select Y-axis column", df.columns)
+    else:
+        y_col = None
+    
+    if chart_type == "Scatter Plot":
+        color_col = st.selectbox("Select color column (optional)", ["None"] + list(df.columns))
+        if color_col == "None":
+            color_col = None
+    else:
+        color_col = None
+    
+    if st.button("Generate Visualization"):
+        image = get_chart_renderer().render(df, chart_type, x_col, y_col, color_col,
+                                            data_hash=dataset.source_hash)
+        if image is not None:
+            st.image(image)
+
+def show_chat_tab(dataset):
+    st.markdown("### Chat with Your Data")
+    # Start indexing as soon as the tab is opened, while the user types
+    search = dataset.results.get('search')
+    query = dataset.results.get('query')
+    user_query = st.text_input("Ask a question about your data:")
+    
+    if user_query:
+        # Aggregate questions are answered exactly from the full table, without the LLM
+        engine = wait_for(query, "Reading column values...")
+        try:
+            answer = engine['engine'].answer(user_query) if engine is not None else None
+        except Exception:
+            # A question the parser misread is still worth asking the LLM
+            answer = None
+        if answer is not None:
+            st.write(answer.text)
+            if answer.table is not None:
+                st.dataframe(answer.table)
+            st.caption(f"Computed locally as {answer.intent.describe()} over {answer.rows:,} rows "
+                       f"in {answer.seconds * 1000:.1f} ms")
+            return
+        search = wait_for(search, "Indexing rows for search...")
+        stats = wait_for(dataset.results.get('stats'), "Summarizing columns...")
+        if search is None or stats is None:
+            return
+        context = get_context_builder().build(search['analyzer'], user_query)
+        prompt = build_prompt(dataset.df, user_query, context, stats['stats'])
+        timing = {}
+        st.write_stream(stream_gemini_response(prompt, timing))
+        st.caption(
+            f"Prompt ~{estimate_tokens(prompt):,} tokens, {context.tokens:,} of them context from "
+            f"{len(context.passages)} of {context.candidates} passages "
+            f"({context.duplicates} near-duplicates, {context.over_budget} over budget); "
+            f"packed in {context.seconds * 1000:.1f} ms"
+        )
+        if 'first_token' in timing:
+            st.caption(f"First token after {timing['first_token']:.2f}s, full answer in {timing['total']:.2f}s")
+
+@st.fragment(run_every=NEWS_POLL_SECONDS)
+def poll_news_job(key):
+    """Show a running news job's articles as they arrive, rerunning the page once it finishes"""
+    job = get_job_scheduler().get(key)
+    if job is None or job.done:
+        st.rerun()
+    articles = job.partial
+    st.info(f"Analyzing news related to your data... {len(articles)} article(s) so far ({job.elapsed:.0f}s)")
+    if st.button("Cancel", key="cancel_news"):
+        job.cancel()
+        st.rerun()
+    for article in articles:
+        display_news_card(article)
+
+def show_news_tab(dataset):
+    st.markdown("### News Analysis")
+    scheduler = get_job_scheduler()
+    key = ('news', dataset.source_hash)
+    if st.button("Analyze Related News"):
+        # Runs in the background, shared with any other session analyzing the same data
+        # while it is in flight; pressing the button again after it finished refreshes the news
+        analyzer, df = st.session_state.news_analyzer, dataset.df
+        scheduler.submit(key, lambda job: analyzer.analyze_news_for_dataset(
+            df, on_impact=job.publish, cancel=job.cancel_event), force=True)
+
+    job = scheduler.get(key)
+    if job is None:
+        if st.session_state.news_data is not None:
+            display_news_analysis(st.session_state.news_data)
+    elif not job.done:
+        poll_news_job(key)
+    elif job.status == DONE:
+        st.session_state.news_data = job.result
+        display_news_analysis(job.result)
+    else:
+        if job.error is not None:
+            st.error(f"Error analyzing news: {str(job.error)}")
+        else:
+            st.warning(f"News analysis {job.status} after {job.elapsed:.0f}s.")
+        st.info("Please try again or upload a different dataset.")
+        for article in job.partial:
+            display_news_card(article)
+
+TABS = {
+    "📈 Data Analysis": show_analysis_tab,
+    "📊 Visualization": show_visualization_tab,
+    "💬 Chat with Data": show_chat_tab,
+    "📰 News Analysis": show_news_tab
+}
+
+def display_compute_times(dataset):
+    """Show the time spent loading the dataset, computing results and rendering each tab"""
+    with st.sidebar.expander("Compute Time"):
+        st.caption(f"Load and clean: {dataset.load_seconds:.2f}s")
+        for name, seconds in dataset.results.timings().items():
+            st.caption(f"{name.capitalize()}: {seconds:.2f}s")
+        for tab, seconds in st.session_state.tab_seconds.items():
+            st.caption(f"{tab} tab: {seconds:.2f}s")
+
 def main():
     st.title("📊 Data Analysis Dashboard")
     
     # File upload section
     uploaded_file = st.file_uploader("Upload your data file", type=['csv', 'xlsx', 'json', 'txt', 'pdf', 'docx'])
+    display_cache_stats()
+    display_llm_stats()
     
     if uploaded_file is not None:
-        df = process_file(uploaded_file)
-        if df is not None:
-            st.session_state.df = df
-            
-            # Create tabs
-            tab1, tab2, tab3, tab4 = st.tabs([
-                "📈 Data Analysis", 
-                "📊 Visualization", 
-                "💬 Chat with Data",
-                "📰 News Analysis"
-            ])
-            
-            with tab1:
-                st.markdown("### Data Analysis")
-                # Perform and display analysis
-                st.session_state.analyzer.analyze_data(df)
-                
-                # Display basic statistics
-                st.markdown("#### Basic Statistics")
-                st.write(df.describe())
-                
-                # Display data types
-                st.markdown("#### Data Types")
-                st.write(df.dtypes)
-            
-            with tab2:
-                st.markdown("### Visualization")
-                # Visualization options
-                chart_type = st.selectbox("Select Chart Type", 
-                    ["Bar Chart", "Line Chart", "Scatter Plot", "Histogram", "Box Plot", "Violin Plot"])
-                
-                # Column selection
-                x_col = st.selectbox("Select X-axis column", df.columns)
-                
-                if chart_type in ["Bar Chart", "Line Chart", "Scatter Plot", "Box Plot", "Violin Plot"]:
-                    y_col = st.selectbox("Select Y-axis column", df.columns)
-                else:
-                    y_col = None
-                
-                if chart_type == "Scatter Plot":
-                    color_col = st.selectbox("Select color column (optional)", ["None"] + list(df.columns))
-                    if color_col == "None":
-                        color_col = None
-                else:
-                    color_col = None
-                
-                if st.button("Generate Visualization"):
-                    fig = create_visualization(df, chart_type, x_col, y_col, color_col)
-                    if fig is not None:
-                        st.pyplot(fig)
-            
-            with tab3:
-                st.markdown("### Chat with Your Data")
-                user_query = st.text_input("Ask a question about your data:")
-                
-                if user_query:
-                    response = get_gemini_response(df, user_query, st.session_state.analyzer)
-                    st.write(response)
+        dataset = process_file(uploaded_file)
+        if dataset is not None:
+            st.session_state.df = dataset.df
             
-            with tab4:
-                st.markdown("### News Analysis")
-                if st.button("Analyze Related News"):
-                    with st.spinner("Analyzing news related to your data... This may take a few moments."):
-                        try:
-                            news_data = st.session_state.news_analyzer.analyze_news_for_dataset(df)
-                            st.session_state.news_data = news_data
-                            display_news_analysis(news_data)
-                        except Exception as e:
-                            st.error(f"Error analyzing news: {str(e)}")
-                            st.info("Please try again or upload a different dataset.")
-                elif st.session_state.news_data is not None:
-                    display_news_analysis(st.session_state.news_data)
+            # Only the selected tab runs, so each tab's work happens when it is viewed
+            tab = st.radio("Section", list(TABS), horizontal=True, label_visibility="collapsed")
+            start = time.perf_counter()
+            TABS[tab](dataset)
+            st.session_state.tab_seconds[tab] = time.perf_counter() - start
+            display_compute_times(dataset)
 
 if __name__ == "__main__":
     main() 
@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Data Analysis Dashboard
+"""
@@ -0,0 +1,54 @@
+"""
+Prompt context size: top-5 whole documents as JSON versus packed passages.
+
+Usage: python -m benchmarks.bench_context [--docs 50] [--words 5000] [--budget 2000]
+"""
+import argparse
+import json
+import time
+import numpy as np
+from src.context_builder import ContextBuilder, estimate_tokens
+from src.data_analysis import DataAnalyzer
+
+QUERIES = ['quarterly revenue growth north region', 'supplier contract renewal terms',
+           'employee hiring plan', 'warehouse capacity costs']
+
+
+def make_documents(n_docs, n_words, seed=0):
+    """Report-like documents built from a small vocabulary, with repeated boilerplate"""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"term{i}" for i in range(3000)] + ' '.join(QUERIES).split())
+    boilerplate = "this report is confidential and intended only for internal planning purposes"
+    documents = []
+    for _ in range(n_docs):
+        paragraphs = [' '.join(rng.choice(vocabulary, 80)) for _ in range(n_words // 80)]
+        paragraphs[::10] = [boilerplate] * len(paragraphs[::10])
+        documents.append('\n\n'.join(paragraphs))
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=50)
+    parser.add_argument('--words', type=int, default=5000)
+    parser.add_argument('--budget', type=int, default=2000)
+    args = parser.parse_args()
+
+    whole = DataAnalyzer(passage_words=10 ** 9)
+    passages = DataAnalyzer()
+    for i, text in enumerate(make_documents(args.docs, args.words)):
+        whole._add_document(text, f"doc{i}.pdf")
+        passages._add_document(text, f"doc{i}.pdf")
+    builder = ContextBuilder(token_budget=args.budget)
+
+    print(f"{'query':>38} {'json tokens':>12} {'packed tokens':>14} {'passages':>9} {'pack ms':>8}")
+    for query in QUERIES:
+        json_tokens = estimate_tokens(json.dumps(whole.search_documents(query), indent=2))
+        start = time.perf_counter()
+        context = builder.build(passages, query)
+        pack_ms = (time.perf_counter() - start) * 1000
+        print(f"{query:>38} {json_tokens:>12,} {context.tokens:>14,} {len(context.passages):>9} {pack_ms:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
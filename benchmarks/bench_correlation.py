@@ -0,0 +1,55 @@
+"""
+Correlation matrices of wide frames: df.corr() versus the Gram-matrix engine.
+
+Usage: python -m benchmarks.bench_correlation [--rows 100000] [--cols 100 300 1000] [--missing 0.01]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.correlation import CorrelationEngine
+
+
+def make_frame(n_rows, n_cols, missing, seed=0):
+    """Correlated numeric columns with a fraction of values missing"""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(size=(n_rows, 8))
+    values = factors @ rng.normal(size=(8, n_cols)) + rng.normal(size=(n_rows, n_cols))
+    if missing:
+        values[rng.random(values.shape) < missing] = np.nan
+    return pd.DataFrame(values, columns=[f"x{i}" for i in range(n_cols)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--missing', type=float, nargs='+', default=[0.0, 0.01])
+    parser.add_argument('--pandas-limit', type=int, default=300,
+                        help='skip df.corr() above this many columns')
+    args = parser.parse_args()
+
+    print(f"{'cols':>6} {'missing':>8} {'df.corr s':>10} {'engine s':>9} {'top-20 s':>9} {'max |diff|':>11}")
+    for n_cols in args.cols:
+        for missing in args.missing:
+            df = make_frame(args.rows, n_cols, missing)
+            start = time.perf_counter()
+            engine = CorrelationEngine.from_frame(df)
+            result = engine.matrix()
+            engine_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            engine.top_pairs(20)
+            pairs_time = time.perf_counter() - start
+
+            pandas_time, diff = "skipped", ""
+            if n_cols <= args.pandas_limit:
+                start = time.perf_counter()
+                expected = df.corr()
+                pandas_time = f"{time.perf_counter() - start:.2f}"
+                diff = f"{np.nanmax(np.abs(result.to_numpy() - expected.to_numpy())):.1e}"
+            print(f"{n_cols:>6} {missing:>8.0%} {pandas_time:>10} {engine_time:>9.2f} {pairs_time:>9.3f} {diff:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""
+Cold import time of the package and of the modules the app loads at startup.
+
+Each module is imported in a fresh interpreter; the best of ``--repeat`` runs
+is reported, with the heavy dependencies that import pulled in.
+
+Usage: python -m benchmarks.bench_import [--repeat 3]
+"""
+import argparse
+from tests.test_imports import APP_MODULES, cold_import
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'module':>24} {'best ms':>9}  heavy modules loaded")
+    for modules in [['src']] + [[name] for name in APP_MODULES] + [APP_MODULES]:
+        runs = [cold_import(modules) for _ in range(args.repeat)]
+        seconds = min(run[0] for run in runs)
+        label = modules[0] if len(modules) == 1 else 'all app modules'
+        print(f"{label:>24} {seconds * 1000:>9.1f}  {', '.join(runs[0][1]) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
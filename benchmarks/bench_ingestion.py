@@ -0,0 +1,79 @@
+"""
+Peak memory of CSV ingestion: full read + clean versus chunked ingestion.
+
+Each mode runs in a fresh subprocess so its peak RSS is measured in isolation.
+
+Usage: python -m benchmarks.bench_ingestion [--rows 2000000] [--chunksize 100000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+
+def write_csv(path, n_rows, seed=0, block=500000):
+    """Write a sales-like CSV with numeric, low-cardinality text and duplicate rows"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, block):
+        n = min(block, n_rows - start)
+        pd.DataFrame({
+            'store_id': rng.integers(0, 500, n),
+            'region': rng.choice(['north', 'south', 'east', 'west'], n),
+            'product': rng.choice([f"product_{i}" for i in range(200)], n),
+            'units': rng.integers(0, 100, n),
+            'price': rng.integers(100, 10000, n) / 4,
+            'discount': rng.choice([0.0, 0.25, 0.5, np.nan], n),
+        }).to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def run_child(mode, path, chunksize):
+    from src.data_analyzer import DataAnalyzer
+
+    start = time.perf_counter()
+    analyzer = DataAnalyzer(chunksize=chunksize if mode == 'chunked' else None)
+    with open(path, 'rb') as f:
+        df = analyzer.load_data(f)
+    # clean_data prints its report; keep the child's stdout for the numbers
+    with contextlib.redirect_stdout(io.StringIO()):
+        df_clean = analyzer.clean_data(df)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{peak_mb:.1f} {elapsed:.2f} {len(df_clean)} {df.memory_usage(deep=True).sum() / 2**20:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.chunksize)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.csv')
+        write_csv(path, args.rows)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{args.rows:,} rows, {size_mb:.0f} MB on disk")
+        print(f"{'mode':>8} {'peak RSS MB':>12} {'frame MB':>9} {'seconds':>8} {'rows kept':>10}")
+        for mode in ('full', 'chunked'):
+            out = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_ingestion', '--chunksize', str(args.chunksize),
+                 '--child', mode, path],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            peak, elapsed, kept, frame = out[-4:]
+            print(f"{mode:>8} {float(peak):>12,.0f} {float(frame):>9,.0f} {float(elapsed):>8} {int(kept):>10,}")
+
+
+if __name__ == '__main__':
+    main()
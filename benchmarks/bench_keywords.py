@@ -0,0 +1,72 @@
+"""
+Keyword extraction on high-cardinality frames: every unique value versus ranked keywords.
+
+Usage: python -m benchmarks.bench_keywords [--rows 1000000] [--tfidf]
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.keywords import rank_keywords
+
+WORDS = np.array(['market', 'growth', 'supply', 'chain', 'delay', 'launch', 'battery', 'chip', 'demand', 'price',
+                  'quarter', 'forecast', 'customer', 'order', 'shipment', 'warehouse', 'the', 'a', 'of', 'in'])
+
+
+def make_frame(n_rows, seed=0):
+    """Orders with unique IDs and emails, free-text comments and a few real categories"""
+    rng = np.random.default_rng(seed)
+    comments = [' '.join(words) for words in rng.choice(WORDS, (n_rows, 8))]
+    return pd.DataFrame({
+        'order_id': [f"ORD-{i:09d}" for i in range(n_rows)],
+        'customer_email': [f"user{i}@example.com" for i in rng.permutation(n_rows)],
+        'comment': comments,
+        'company': rng.choice(['Apple', 'Tesla', 'Nvidia', 'Samsung', 'Toyota'], n_rows),
+        'product': rng.choice([f"Model {i}" for i in range(300)], n_rows),
+        'price': rng.uniform(1, 100, n_rows)
+    })
+
+
+def legacy_keywords(df):
+    """The previous extract_keywords: every unique value of every object column, deduplicated by a set"""
+    keywords = df.columns.tolist()
+    for col in df.select_dtypes(include=['object', 'str']).columns:
+        keywords.extend([str(val) for val in df[col].unique() if pd.notna(val)])
+    for col in df.select_dtypes(include=[np.number]).columns:
+        keywords.extend([f"{col} trend", f"{col} analysis", f"{col} forecast"])
+    return list(set(k for k in keywords if isinstance(k, str) and len(k.strip()) > 0))
+
+
+def measure(fn, df):
+    """Result, seconds and peak traced memory; timed separately since tracing slows allocation"""
+    start = time.perf_counter()
+    result = fn(df)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn(df)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--tfidf', action='store_true')
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    if args.tfidf:
+        # Keep sklearn's one-off import out of the timing
+        import sklearn.feature_extraction.text  # noqa: F401
+    print(f"{'method':>8} {'seconds':>8} {'peak MB':>8} {'keywords':>9}  first five")
+    legacy, seconds, peak = measure(legacy_keywords, df)
+    print(f"{'legacy':>8} {seconds:>8.2f} {peak / 2 ** 20:>8.0f} {len(legacy):>9,}  {legacy[:5]}")
+    ranked, seconds, peak = measure(lambda frame: rank_keywords(frame, tfidf=args.tfidf), df)
+    top = [keyword for keyword, _ in ranked[:5]]
+    print(f"{'ranked':>8} {seconds:>8.2f} {peak / 2 ** 20:>8.0f} {len(ranked):>9,}  {top}")
+
+
+if __name__ == '__main__':
+    main()
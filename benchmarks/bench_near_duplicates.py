@@ -0,0 +1,100 @@
+"""
+Near-duplicate clustering of a synthetic news corpus with injected syndicated
+copies: MinHash with LSH banding versus exact all-pairs shingle Jaccard, and
+the sentiment scoring saved by processing one article per cluster.
+
+Usage: python -m benchmarks.bench_near_duplicates [--stories 250 500 1000 2000] [--syndicated 0.3]
+"""
+import argparse
+import time
+from collections import Counter
+import numpy as np
+from src.near_duplicates import cluster_near_duplicates, shingle_hashes
+from src.news_analyzer import NewsAnalyzer
+
+THRESHOLD = 0.8
+
+
+def make_corpus(n_stories, syndicated, max_copies=5, words=400, seed=0):
+    """(texts, story id per text): stories of Zipf-distributed words, some rerun by other sites with small edits"""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"word{i}" for i in range(5000)])
+    weights = 1 / np.arange(1, len(vocab) + 1)
+    stories = [rng.choice(vocab, words, p=weights / weights.sum()) for _ in range(n_stories)]
+    texts = ['. '.join(' '.join(story[i:i + 20]) for i in range(0, words, 20)) for story in stories]
+    story_ids = list(range(n_stories))
+    for story in rng.choice(n_stories, int(n_stories * syndicated), replace=False):
+        for _ in range(rng.integers(1, max_copies + 1)):
+            copy = texts[story].split(' ')
+            for position in rng.integers(0, len(copy), 3):
+                copy[position] = 'edited'
+            texts.append(f"Reported by Wire Service. {' '.join(copy)} Read more at our site.")
+            story_ids.append(story)
+    order = rng.permutation(len(texts))
+    return [texts[i] for i in order], [story_ids[i] for i in order]
+
+
+def exact_clusters(texts):
+    """Union-find over every pair whose exact shingle Jaccard reaches THRESHOLD"""
+    shingles = [set(shingle_hashes(text).tolist()) for text in texts]
+    labels = list(range(len(texts)))
+
+    def find(i):
+        while labels[i] != i:
+            i = labels[i]
+        return i
+
+    for i in range(len(texts)):
+        for j in range(i):
+            if len(shingles[i] & shingles[j]) >= THRESHOLD * len(shingles[i] | shingles[j]):
+                low, high = sorted((find(i), find(j)))
+                labels[high] = low
+    return [find(i) for i in range(len(texts))]
+
+
+def pair_scores(labels, truth):
+    """Precision and recall of the same-cluster pairs against the true stories"""
+    def pairs(counts):
+        return sum(n * (n - 1) // 2 for n in counts.values())
+    predicted, actual = pairs(Counter(labels)), pairs(Counter(truth))
+    correct = pairs(Counter(zip(labels, truth)))
+    return correct / predicted if predicted else 1.0, correct / actual if actual else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--stories', type=int, nargs='+', default=[250, 500, 1000, 2000])
+    parser.add_argument('--syndicated', type=float, default=0.3, help='fraction of stories rerun by other sites')
+    parser.add_argument('--exact-max', type=int, default=1000, help='largest corpus to cluster with all pairs')
+    args = parser.parse_args()
+
+    print(f"{'texts':>6} {'stories':>8} {'MinHash s':>10} {'exact s':>8} {'precision':>10} {'recall':>7}")
+    for n_stories in args.stories:
+        texts, truth = make_corpus(n_stories, args.syndicated)
+        start = time.perf_counter()
+        labels = cluster_near_duplicates(texts, THRESHOLD)
+        lsh_seconds = time.perf_counter() - start
+        exact = '-'
+        if len(texts) <= args.exact_max:
+            start = time.perf_counter()
+            exact_clusters(texts)
+            exact = f"{time.perf_counter() - start:.2f}"
+        precision, recall = pair_scores(labels, truth)
+        print(f"{len(texts):>6} {n_stories:>8} {lsh_seconds:>10.2f} {exact:>8} {precision:>10.3f} {recall:>7.3f}")
+
+    # Sentiment for every copy versus one representative per cluster, on the last corpus
+    analyzer = NewsAnalyzer()
+    representatives = [text for i, (text, label) in enumerate(zip(texts, labels)) if label == i]
+    analyzer.score_sentiment_batch(texts[:10])  # load the lexicon outside the timings
+    start = time.perf_counter()
+    analyzer.score_sentiment_batch(texts)
+    every_copy = time.perf_counter() - start
+    start = time.perf_counter()
+    analyzer.score_sentiment_batch(representatives)
+    deduplicated = time.perf_counter() - start
+    print(f"sentiment: {len(texts)} texts {every_copy:.2f}s, {len(representatives)} representatives "
+          f"{deduplicated:.2f}s (+{lsh_seconds:.2f}s clustering)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Wall-clock time of serial versus concurrent article fetching against a local
+stub server that adds a fixed latency to every response.
+
+Usage: python -m benchmarks.bench_news_fetch [--articles 15] [--hosts 5] [--latency 0.3]
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.news_fetcher import ArticleFetcher
+
+
+class LatencyHandler(BaseHTTPRequestHandler):
+    latency = 0.3
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        title = f"Story {self.path.rsplit('/', 1)[-1]}"
+        paragraph = f"<p>{title} covers markets, trading volumes and the wider economy in detail today.</p>"
+        body = f"<html><head><title>{title}</title></head><body><article>{paragraph * 20}</article></body></html>"
+        body = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serial_fetch(fetcher, urls):
+    """The original loop: download then parse, one URL at a time"""
+    return {url: fetcher.parse(url, fetcher.download(url)) for url in urls}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=15)
+    parser.add_argument('--hosts', type=int, default=5, help='distinct loopback hosts (127.0.0.N)')
+    parser.add_argument('--latency', type=float, default=0.3, help='seconds added to every response')
+    args = parser.parse_args()
+
+    LatencyHandler.latency = args.latency
+    server = ThreadingHTTPServer(('', 0), LatencyHandler)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.{i % args.hosts + 1}:{port}/article/{i}" for i in range(args.articles)]
+
+    try:
+        fetcher = ArticleFetcher(nlp=False)
+        start = time.perf_counter()
+        serial = serial_fetch(fetcher, urls)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = fetcher.fetch_all(urls)
+        concurrent_time = time.perf_counter() - start
+        assert serial == concurrent, "pipelines disagree"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{len(urls)} articles over {args.hosts} hosts, {args.latency:.2f}s latency each")
+    print(f"serial:     {serial_time:.2f} s")
+    print(f"concurrent: {concurrent_time:.2f} s ({serial_time / concurrent_time:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Repeated news analysis from scratch versus an incremental refresh against the
+article store, with a local stub server adding a fixed latency per article.
+
+Usage: python -m benchmarks.bench_news_refresh [--articles 15] [--new 3] [--latency 0.3]
+"""
+import argparse
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from benchmarks.bench_news_fetch import LatencyHandler
+from src.news_analyzer import NewsAnalyzer
+from src.news_fetcher import ArticleFetcher
+
+
+def run(analyzer, urls):
+    """Seconds and new/cached counts of one refresh returning ``urls``"""
+    analyzer.search_fn = lambda query, num_results: urls
+    analyzer.query_cache.memory.clear()
+    start = time.perf_counter()
+    news, counts = analyzer.refresh_news(['markets'], num_articles=len(urls))
+    assert len(news) == len(urls)
+    return time.perf_counter() - start, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=15)
+    parser.add_argument('--new', type=int, default=3, help='articles in the second run not seen in the first')
+    parser.add_argument('--latency', type=float, default=0.3, help='seconds added to every response')
+    args = parser.parse_args()
+
+    LatencyHandler.latency = args.latency
+    server = ThreadingHTTPServer(('', 0), LatencyHandler)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    urls = [f"http://127.0.0.{i % 5 + 1}:{port}/article/{i}" for i in range(args.articles + args.new)]
+    first, second = urls[:args.articles], urls[args.new:]
+
+    try:
+        analyzer = NewsAnalyzer(fetcher=ArticleFetcher(nlp=False))
+        scratch_analyzer = NewsAnalyzer(fetcher=ArticleFetcher(nlp=False))
+        analyzer.sia, scratch_analyzer.sia  # keep the lexicon load out of the timings
+        cold, cold_counts = run(analyzer, first)
+        scratch, _ = run(scratch_analyzer, second)
+        refresh, counts = run(analyzer, second)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{args.articles} articles per run, {args.new} new in the second, {args.latency:.2f}s latency each")
+    print(f"{'run':>12} {'seconds':>8} {'new':>5} {'cached':>7}")
+    print(f"{'cold':>12} {cold:>8.2f} {cold_counts['new']:>5} {cold_counts['cached']:>7}")
+    print(f"{'from scratch':>12} {scratch:>8.2f} {args.articles:>5} {0:>7}")
+    print(f"{'refresh':>12} {refresh:>8.2f} {counts['new']:>5} {counts['cached']:>7}")
+
+
+if __name__ == '__main__':
+    main()
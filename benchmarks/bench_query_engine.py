@@ -0,0 +1,68 @@
+"""
+Aggregate chat questions: local QueryEngine versus the retrieval + LLM round trip.
+
+The LLM is a stub that sleeps for a fixed latency, so the round trip time is
+retrieval, context packing and that latency; the stub never sees more than
+the packed passages, while the local engine reads every row.
+
+Usage: python -m benchmarks.bench_query_engine [--rows 1000000] [--llm-seconds 2.0]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.context_builder import ContextBuilder
+from src.data_analysis import DataAnalyzer
+from src.query_engine import QueryEngine
+
+QUESTIONS = ['average net sales by region', 'max unit price in 2023', 'how many orders where quantity > 10',
+             'top 5 products by net sales', 'total quantity for North', 'which region has the highest average net sales']
+
+
+def make_orders(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'region': rng.choice(['North', 'South', 'East', 'West'], n_rows),
+        'product': rng.choice([f"P{i}" for i in range(200)], n_rows),
+        'order_date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 1095, n_rows), unit='D'),
+        'unit_price': rng.uniform(1, 100, n_rows).round(2),
+        'quantity': rng.integers(1, 20, n_rows),
+        'net_sales': rng.normal(100, 30, n_rows).round(2)
+    })
+
+
+def stub_llm(prompt, seconds):
+    time.sleep(seconds)
+    return "stub answer"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--index-rows', type=int, default=100000,
+                        help='rows indexed for the retrieval path (indexing is not timed)')
+    parser.add_argument('--llm-seconds', type=float, default=2.0)
+    args = parser.parse_args()
+
+    df = make_orders(args.rows)
+    engine = QueryEngine(df)
+    search = DataAnalyzer()
+    search.index_frame(df.head(args.index_rows), 'orders.csv')
+    builder = ContextBuilder()
+
+    print(f"{'question':>48} {'local ms':>9} {'round trip ms':>14} {'rows used':>10} {'rows in prompt':>15}")
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        answer = engine.answer(question)
+        local_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        context = builder.build(search, question)
+        stub_llm(context.text + question, args.llm_seconds)
+        round_trip_ms = (time.perf_counter() - start) * 1000
+        rows = answer.rows if answer is not None else 0
+        print(f"{question:>48} {local_ms:>9.1f} {round_trip_ms:>14.1f} {rows:>10,} {len(context.passages):>15}")
+
+
+if __name__ == '__main__':
+    main()
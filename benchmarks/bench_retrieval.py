@@ -0,0 +1,86 @@
+"""
+Recall@k and latency of the approximate IVF backend against exact search.
+
+Usage: python -m benchmarks.bench_retrieval [--docs 200000] [--k 10] [--probes 1 2 4 8 16]
+"""
+import argparse
+import time
+import numpy as np
+from src.retrieval import ExactBackend, IVFBackend
+from src.search_index import IncrementalTfidfIndex
+
+
+def make_corpus(n_docs, n_topics=200, words_per_topic=50, words_per_doc=25, seed=0):
+    """Documents drawn from a mixture of two topics plus shared filler words"""
+    rng = np.random.default_rng(seed)
+    topic_words = np.array([[f"t{t}w{w}" for w in range(words_per_topic)] for t in range(n_topics)])
+    filler = np.array([f"common{w}" for w in range(500)])
+    topics = rng.integers(0, n_topics, size=(n_docs, 2))
+    docs = []
+    for first, second in topics:
+        words = np.concatenate([
+            rng.choice(topic_words[first], words_per_doc // 2),
+            rng.choice(topic_words[second], words_per_doc // 4),
+            rng.choice(filler, words_per_doc - words_per_doc // 2 - words_per_doc // 4),
+        ])
+        docs.append(" ".join(words))
+    queries = [" ".join(rng.choice(topic_words[t], 4)) for t in rng.integers(0, n_topics, 100)]
+    return docs, queries
+
+
+def recall_at_k(index, query_vectors, found, truth_scores):
+    """Share of returned documents that score at least the exact k-th best.
+
+    Counting by score rather than by id keeps ties at the cut-off from
+    being reported as misses.
+    """
+    hits = []
+    for q, rows in enumerate(found):
+        rows = rows[rows >= 0]
+        scores = (index.matrix[rows] @ query_vectors[q].T).toarray().ravel()
+        hits.append(np.sum(scores >= truth_scores[q, -1] - 1e-12) / truth_scores.shape[1])
+    return float(np.mean(hits))
+
+
+def run(backend, query_vectors, k):
+    """Search all queries, returning result ids and mean latency per query"""
+    start = time.perf_counter()
+    indices, _ = backend.search(query_vectors, k)
+    return indices, (time.perf_counter() - start) / query_vectors.shape[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=200000)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--probes', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--components', type=int, default=64)
+    args = parser.parse_args()
+
+    docs, queries = make_corpus(args.docs)
+    index = IncrementalTfidfIndex()
+    index.add_documents(docs)
+    query_vectors = index.transform(queries)
+
+    exact = ExactBackend()
+    exact.build(index)
+    start = time.perf_counter()
+    _, truth_scores = exact.search(query_vectors, args.k)
+    exact_latency = (time.perf_counter() - start) / query_vectors.shape[0]
+    print(f"exact: {exact_latency * 1000:.2f} ms/query over {args.docs} docs")
+
+    ivf = IVFBackend(n_components=args.components)
+    start = time.perf_counter()
+    ivf.build(index)
+    print(f"IVF build: {time.perf_counter() - start:.1f} s, {len(ivf.centroids)} cells")
+
+    print(f"{'n_probe':>8} {'recall@' + str(args.k):>10} {'ms/query':>9} {'speedup':>8}")
+    for n_probe in args.probes:
+        ivf.n_probe = n_probe
+        found, latency = run(ivf, query_vectors, args.k)
+        recall = recall_at_k(index, query_vectors, found, truth_scores)
+        print(f"{n_probe:>8} {recall:>10.3f} {latency * 1000:>9.2f} {exact_latency / latency:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare refitting TF-IDF on every document add with the incremental index.
+
+Usage: python -m benchmarks.bench_search_index [--adds 20] [--sizes 1000 10000 50000]
+"""
+import argparse
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from src.search_index import IncrementalTfidfIndex
+
+
+def make_corpus(n_docs, words_per_doc=12, vocab_size=5000, seed=0):
+    """Generate random documents from a synthetic vocabulary"""
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"term{i}" for i in range(vocab_size)])
+    words = vocab[rng.zipf(1.3, size=(n_docs, words_per_doc)) % vocab_size]
+    return [" ".join(row) for row in words]
+
+
+def full_refit(base, new_docs, query):
+    """Refit the vectorizer over the whole corpus after every add"""
+    texts = list(base)
+    start = time.perf_counter()
+    for doc in new_docs:
+        texts.append(doc)
+        vectorizer = TfidfVectorizer()
+        matrix = vectorizer.fit_transform(texts)
+        cosine_similarity(vectorizer.transform([query]), matrix)
+    return time.perf_counter() - start
+
+
+def incremental(base, new_docs, query):
+    """Append documents to the index and search after every add"""
+    index = IncrementalTfidfIndex()
+    index.add_documents(base)
+    start = time.perf_counter()
+    for doc in new_docs:
+        index.add_documents([doc])
+        index.similarities(query)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--adds', type=int, default=20, help='documents added one at a time')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    query = "term1 term7 term42"
+    print(f"{'corpus':>10} {'refit (s)':>12} {'incremental (s)':>16} {'speedup':>9}")
+    for size in args.sizes:
+        corpus = make_corpus(size + args.adds)
+        base, new_docs = corpus[:size], corpus[size:]
+        refit_time = full_refit(base, new_docs, query)
+        incremental_time = incremental(base, new_docs, query)
+        print(f"{size:>10} {refit_time:>12.3f} {incremental_time:>16.3f} {refit_time / incremental_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Throughput of row-to-text serialization: iterrows versus column-wise.
+
+Usage: python -m benchmarks.bench_serialize_rows [--rows 100000 1000000] [--cols 20]
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.search_index import serialize_rows
+
+
+def make_frame(n_rows, n_cols, seed=0):
+    """Build a spreadsheet-like frame with numeric, text and date columns"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(n_cols):
+        kind = i % 4
+        if kind == 0:
+            data[f"amount_{i}"] = rng.random(n_rows) * 1000
+        elif kind == 1:
+            data[f"count_{i}"] = rng.integers(0, 10000, n_rows)
+        elif kind == 2:
+            data[f"region_{i}"] = rng.choice(['north', 'south', 'east', 'west', None], n_rows)
+        else:
+            data[f"date_{i}"] = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 10**8, n_rows), unit='s')
+    return pd.DataFrame(data)
+
+
+def iterrows_serialize(df):
+    """The original per-row serializer"""
+    return [" | ".join([f"{col}: {val}" for col, val in row.items()]) for _, row in df.iterrows()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--cols', type=int, default=20)
+    parser.add_argument('--iterrows-limit', type=int, default=200000,
+                        help='skip the iterrows baseline above this many rows')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'iterrows rows/s':>16} {'column-wise rows/s':>19}")
+    for n_rows in args.rows:
+        df = make_frame(n_rows, args.cols)
+        start = time.perf_counter()
+        texts = serialize_rows(df)
+        vectorized_rate = n_rows / (time.perf_counter() - start)
+
+        baseline = "skipped"
+        if n_rows <= args.iterrows_limit:
+            start = time.perf_counter()
+            expected = iterrows_serialize(df)
+            baseline = f"{n_rows / (time.perf_counter() - start):,.0f}"
+            assert texts == expected, "serializers disagree"
+        print(f"{n_rows:>10} {baseline:>16} {vectorized_rate:>19,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Search latency: dense cosine similarity + argsort versus blocked top-k.
+
+Usage: python -m benchmarks.bench_topk [--sizes 10000 100000 1000000] [--queries 8] [--k 5]
+"""
+import argparse
+import time
+import numpy as np
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+from src.search_index import top_k
+
+
+def make_matrix(n_rows, n_terms=50000, terms_per_row=20, seed=0):
+    """Random L2-normalized TF-IDF-like matrix"""
+    rng = np.random.default_rng(seed)
+    indices = rng.zipf(1.2, size=n_rows * terms_per_row) % n_terms
+    indptr = np.arange(0, n_rows * terms_per_row + 1, terms_per_row)
+    data = rng.random(n_rows * terms_per_row)
+    matrix = sp.csr_matrix((data, indices, indptr), shape=(n_rows, n_terms))
+    matrix.sum_duplicates()
+    return normalize(matrix)
+
+
+def argsort_search(matrix, queries, k):
+    """The original approach, one query at a time"""
+    results = []
+    for q in range(queries.shape[0]):
+        similarities = cosine_similarity(queries[q], matrix).flatten()
+        results.append(similarities.argsort()[-k:][::-1])
+    return results
+
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--queries', type=int, default=8)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--block-size', type=int, default=65536)
+    args = parser.parse_args()
+
+    print(f"{'docs':>10} {'argsort ms/query':>17} {'top-k ms/query':>15} {'speedup':>8}")
+    for size in args.sizes:
+        matrix = make_matrix(size)
+        queries = make_matrix(args.queries, seed=1)
+        baseline = timed(argsort_search, matrix, queries, args.k) / args.queries
+        blocked = timed(top_k, matrix, queries, args.k, args.block_size) / args.queries
+        print(f"{size:>10} {baseline * 1000:>17.2f} {blocked * 1000:>15.2f} {baseline / blocked:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Chart render time versus row count: raw seaborn plotting against pre-aggregation.
+
+Times cover building the figure and drawing it on the Agg canvas.
+
+Usage: python -m benchmarks.bench_visualization [--rows 10000 100000 1000000] [--raw-limit 200000]
+"""
+import argparse
+import time
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from src.aggregation import DEFAULT_BUDGETS
+from src.visualization import create_visualization
+
+CHARTS = [
+    ('Bar Chart', 'region', 'sales', None),
+    ('Line Chart', 'day', 'sales', None),
+    ('Scatter Plot', 'price', 'sales', None),
+    ('Box Plot', 'region', 'sales', None),
+    ('Violin Plot', 'region', 'sales', None),
+]
+
+
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    price = rng.gamma(2.0, 50.0, n_rows)
+    return pd.DataFrame({
+        'region': rng.choice(['north', 'south', 'east', 'west', 'central'], n_rows),
+        'day': rng.integers(0, max(n_rows // 10, 1), n_rows),
+        'price': price,
+        'sales': price * rng.normal(3.0, 0.5, n_rows) + rng.normal(0, 20, n_rows),
+    })
+
+
+def render_seconds(df, chart_type, x_col, y_col, color_col, budgets):
+    start = time.perf_counter()
+    fig = create_visualization(df, chart_type, x_col, y_col, color_col, budgets=budgets)
+    fig.canvas.draw()
+    elapsed = time.perf_counter() - start
+    plt.close(fig)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--raw-limit', type=int, default=200000,
+                        help='skip raw plotting above this many rows')
+    args = parser.parse_args()
+
+    raw_budgets = dict.fromkeys(DEFAULT_BUDGETS)
+    print(f"{'chart':>12} {'rows':>10} {'raw s':>8} {'aggregated s':>13}")
+    for n_rows in args.rows:
+        df = make_frame(n_rows)
+        for chart_type, x_col, y_col, color_col in CHARTS:
+            raw = "skipped"
+            if n_rows <= args.raw_limit:
+                raw = f"{render_seconds(df, chart_type, x_col, y_col, color_col, raw_budgets):.2f}"
+            aggregated = render_seconds(df, chart_type, x_col, y_col, color_col, None)
+            print(f"{chart_type:>12} {n_rows:>10,} {raw:>8} {aggregated:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
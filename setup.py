@@ -5,10 +5,11 @@ setup(
     version="1.0.0",
     packages=find_packages(),
     install_requires=[
-        "streamlit>=1.31.0",
+        "streamlit>=1.37.0",
         "pandas>=2.1.0",
         "numpy>=1.24.0",
         "scikit-learn>=1.3.0",
+        "scipy>=1.10.0",
         "google-generativeai>=0.3.0",
         "matplotlib>=3.7.0",
         "seaborn>=0.12.0",
@@ -9,8 +9,25 @@ analysis, and real-time news integration.
 __version__ = "1.0.0"
 __author__ = "Amit Khopade"
 
-from .data_analyzer import DataAnalyzer
-from .news_analyzer import NewsAnalyzer
-from .visualization import create_visualization
+import importlib
 
-__all__ = ['DataAnalyzer', 'NewsAnalyzer', 'create_visualization'] 
\ No newline at end of file
+# Public names and the submodules defining them. Submodules pull in pandas,
+# sklearn, matplotlib or nltk, so they are imported on first attribute access
+# rather than with the package.
+_EXPORTS = {
+    'DataAnalyzer': '.data_analyzer',
+    'NewsAnalyzer': '.news_analyzer',
+    'create_visualization': '.visualization'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
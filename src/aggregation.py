@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+# Most rows handed to the plotting library per chart; larger frames are
+# aggregated or downsampled first. None disables the reduction.
+DEFAULT_BUDGETS = {
+    'Bar Chart': 20000,
+    'Line Chart': 2000,
+    'Scatter Plot': 20000,
+    'Histogram': None,
+    'Box Plot': 20000,
+    'Violin Plot': 20000
+}
+# Most categories drawn along the x axis of a reduced bar, box or violin plot
+MAX_GROUPS = 50
+
+
+def as_numeric(values):
+    """Float view of numeric or datetime values, or None for anything else"""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        numbers = values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+        # NaT casts to the int64 minimum, not NaN
+        numbers[values.isna().to_numpy()] = np.nan
+        return numbers
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    return None
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets selection of ``n_out`` points.
+
+    ``x`` must be sorted. The first and last points are always kept; each
+    bucket in between keeps the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of ``n_out // 2`` equal buckets"""
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    size = -(-n // n_buckets)
+    low = np.full(n_buckets * size, np.inf)
+    high = np.full(n_buckets * size, -np.inf)
+    low[:n] = y
+    high[:n] = y
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + low.reshape(n_buckets, size).argmin(axis=1)
+    highs = offsets + high.reshape(n_buckets, size).argmax(axis=1)
+    return np.unique(np.concatenate([lows, highs]))
+
+
+def downsample_line(df, x_col, y_col, n_out, method='lttb'):
+    """Mean of y per x value, sorted by x and reduced to at most ``n_out`` points"""
+    data = df[[x_col, y_col]].dropna()
+    # Repeated x values are averaged, as seaborn's lineplot does
+    line = data.groupby(x_col, sort=True, observed=True)[y_col].mean().reset_index()
+    if n_out is None or len(line) <= n_out:
+        return line
+    y = line[y_col].to_numpy(dtype=float)
+    if method == 'minmax':
+        keep = minmax_indices(y, n_out)
+    else:
+        x = as_numeric(line[x_col])
+        keep = lttb_indices(np.arange(len(line), dtype=float) if x is None else x, y, n_out)
+    return line.iloc[keep].reset_index(drop=True)
+
+
+def histogram_2d(df, x_col, y_col, bins=200):
+    """Counts of (x, y) pairs on a ``bins`` x ``bins`` grid, with the bin edges"""
+    x, y = as_numeric(df[x_col]), as_numeric(df[y_col])
+    valid = ~(np.isnan(x) | np.isnan(y))
+    return np.histogram2d(x[valid], y[valid], bins=bins)
+
+
+def stratified_sample(df, n, by=None, seed=0, max_groups=None):
+    """At most ``n`` rows, sampled in proportion to each ``by`` group.
+
+    Every group keeps at least one row while there are fewer groups than
+    ``n``; with more, rows are sampled uniformly. ``max_groups`` first
+    restricts the frame to its most frequent groups, as group_summary does.
+    """
+    if by is not None and max_groups is not None:
+        df = df[df[by].isin(top_groups(df, by, max_groups))]
+    if len(df) <= n:
+        return df
+    if by is None:
+        return df.sample(n, random_state=seed)
+    firsts = df.drop_duplicates(by)
+    if len(firsts) >= n:
+        return df.sample(n, random_state=seed)
+    # Room is left for the first row of each group too small to be drawn
+    sample = df.groupby(by, observed=True).sample(frac=(n - len(firsts)) / len(df), random_state=seed)
+    return pd.concat([sample, firsts[~firsts[by].isin(sample[by])]])
+
+
+def top_groups(df, x_col, max_groups):
+    """The ``max_groups`` most frequent values of ``x_col``, in sorted order"""
+    counts = df[x_col].value_counts()
+    return counts.index[:max_groups].sort_values() if len(counts) > max_groups else counts.index.sort_values()
+
+
+def group_summary(df, x_col, y_col, max_groups=MAX_GROUPS):
+    """Mean of y per group with a normal-approximation 95% confidence interval"""
+    groups = top_groups(df, x_col, max_groups)
+    stats = df[df[x_col].isin(groups)].groupby(x_col, observed=True)[y_col].agg(['mean', 'std', 'count'])
+    stats = stats.reindex(groups)
+    stats['ci'] = 1.96 * stats['std'].fillna(0) / np.sqrt(stats['count'])
+    return stats
+
+
+def box_summary(df, x_col, y_col, max_groups=MAX_GROUPS):
+    """Box-plot statistics per group in the form ``Axes.bxp`` expects"""
+    groups = top_groups(df, x_col, max_groups)
+    data = df.loc[df[x_col].isin(groups), [x_col, y_col]].dropna()
+    grouped = data.groupby(x_col, observed=True)[y_col]
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack().reindex(groups)
+    iqr = quartiles[0.75] - quartiles[0.25]
+    # Whiskers reach the most extreme values inside 1.5 IQR of the box
+    bounds = pd.DataFrame({'low': quartiles[0.25] - 1.5 * iqr, 'high': quartiles[0.75] + 1.5 * iqr})
+    data = data.join(bounds, on=x_col)
+    inside = data[(data[y_col] >= data['low']) & (data[y_col] <= data['high'])].groupby(x_col, observed=True)[y_col]
+    whislo, whishi = inside.min().reindex(groups), inside.max().reindex(groups)
+    return [
+        {
+            'label': str(group),
+            'q1': quartiles.at[group, 0.25],
+            'med': quartiles.at[group, 0.5],
+            'q3': quartiles.at[group, 0.75],
+            'whislo': whislo[group],
+            'whishi': whishi[group],
+            'fliers': []
+        }
+        for group in groups if not np.isnan(quartiles.at[group, 0.5])
+    ]
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+# Columns of a stored article, in table order after the URL hash and fetch time
+ARTICLE_COLUMNS = ['url', 'title', 'text', 'summary', 'keywords', 'published_date', 'source',
+                   'compound', 'pos', 'neg', 'neu']
+
+
+def url_hash(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class ArticleStore:
+    """Persistent store of parsed, sentiment-scored news articles keyed by URL hash.
+
+    Rows are fresh for ``ttl`` seconds after they were fetched, measured in
+    wall-clock time so they survive restarts. ``path`` defaults to an
+    in-memory database for a store that only lives as long as the process.
+    """
+
+    def __init__(self, path=':memory:', ttl=3600, table='article_store', clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (url_hash TEXT PRIMARY KEY, fetched REAL, "
+                "url TEXT, title TEXT, text TEXT, summary TEXT, keywords TEXT, published_date TEXT, "
+                "source TEXT, compound REAL, pos REAL, neg REAL, neu REAL)"
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def get_many(self, urls, chunk_size=500):
+        """{url: article} for the URLs stored within the TTL; missing and expired ones are left out"""
+        urls = list(dict.fromkeys(urls))
+        hashes = {url_hash(url): url for url in urls}
+        keys = list(hashes)
+        rows = []
+        with self._lock:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start:start + chunk_size]
+                rows.extend(self._conn.execute(
+                    f"SELECT url_hash, fetched, {', '.join(ARTICLE_COLUMNS)} FROM {self.table} "
+                    f"WHERE url_hash IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall())
+            cutoff = self.clock() - self.ttl
+            articles = {hashes[row[0]]: _article(row[2:]) for row in rows if row[1] > cutoff}
+            self.expired += len(rows) - len(articles)
+            self.hits += len(articles)
+            self.misses += len(urls) - len(articles)
+        return articles
+
+    def put_many(self, articles):
+        """Insert or refresh scored article dicts, stamping them with the current time"""
+        now = self.clock()
+        rows = [(url_hash(article['url']), now) + _row(article) for article in articles]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} VALUES ({', '.join('?' * (len(ARTICLE_COLUMNS) + 2))})", rows
+            )
+
+    def purge_expired(self):
+        """Delete rows older than the TTL and return how many were removed"""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                f"DELETE FROM {self.table} WHERE fetched <= ?", (self.clock() - self.ttl,)
+            ).rowcount
+
+    def close(self):
+        self._conn.close()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'expired': self.expired, 'size': len(self)}
+
+
+def _row(article):
+    published = article.get('published_date')
+    if published is None or published != published:
+        published = None  # None, or NaN/NaT from a DataFrame round trip
+    elif hasattr(published, 'isoformat'):
+        published = published.isoformat()
+    else:
+        published = str(published)
+    return (
+        str(article['url']), article.get('title', ''), article.get('text', ''), article.get('summary', ''),
+        json.dumps(list(article.get('keywords') or [])), published, article.get('source', ''),
+        float(article['compound']), float(article['pos']), float(article['neg']), float(article['neu'])
+    )
+
+
+def _article(values):
+    article = dict(zip(ARTICLE_COLUMNS, values))
+    article['keywords'] = json.loads(article['keywords'])
+    if article['published_date'] is not None:
+        try:
+            article['published_date'] = datetime.fromisoformat(article['published_date'])
+        except ValueError:
+            pass  # stored as given when it was not a datetime
+    return article
@@ -0,0 +1,141 @@
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize=1024, ttl=3600, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] <= self.clock():
+                del self._data[key]
+                self.expirations += 1
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size': len(self._data)
+        }
+
+
+class SQLiteCache:
+    """On-disk cache tier storing pickled values with an expiry timestamp.
+
+    Expiry uses wall-clock time so entries survive process restarts.
+    """
+
+    def __init__(self, path, ttl=86400, table='cache', clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, expires REAL, value BLOB)"
+            )
+
+    def get(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT expires, value FROM {self.table} WHERE key = ?", (repr(key),)
+            ).fetchone()
+            if row is None or row[0] <= self.clock():
+                self.misses += 1
+                return default
+            self.hits += 1
+        return pickle.loads(row[1])
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, expires, value) VALUES (?, ?, ?)",
+                (repr(key), self.clock() + self.ttl, blob)
+            )
+
+    def purge_expired(self):
+        """Delete expired rows and return how many were removed"""
+        with self._lock, self._conn:
+            return self._conn.execute(f"DELETE FROM {self.table} WHERE expires <= ?", (self.clock(),)).rowcount
+
+    def close(self):
+        self._conn.close()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+class TieredCache:
+    """In-memory LRU cache backed by an optional on-disk tier.
+
+    Disk hits are promoted into memory; writes go to both tiers.
+    """
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is _MISSING and self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+        return default if value is _MISSING else value
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def stats(self):
+        stats = {'memory': self.memory.stats()}
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats()
+        return stats
@@ -0,0 +1,109 @@
+import re
+import time
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_WORD = re.compile(r'\w+')
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate: about four characters per token, at least one per word"""
+    return max(len(text.split()), -(-len(text) // 4))
+
+
+def split_passages(text, max_words=150):
+    """Split text into passages of at most ``max_words`` words.
+
+    Paragraphs are kept whole and merged with their neighbours while they
+    fit; longer paragraphs are cut into consecutive word windows.
+    """
+    passages = []
+    current = []
+    for paragraph in _PARAGRAPH_BREAK.split(str(text)):
+        words = paragraph.split()
+        if not words:
+            continue
+        if len(current) + len(words) > max_words and current:
+            passages.append(' '.join(current))
+            current = []
+        for start in range(0, len(words), max_words):
+            window = words[start:start + max_words]
+            if len(window) == max_words:
+                passages.append(' '.join(window))
+            else:
+                current.extend(window)
+    if current:
+        passages.append(' '.join(current))
+    return passages
+
+
+def _shingles(text, size=3):
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class PackedContext:
+    """Passages chosen for a prompt, with the metrics of how they were chosen"""
+
+    def __init__(self, passages, tokens, seconds, candidates, duplicates, over_budget):
+        self.passages = passages
+        self.tokens = tokens
+        self.seconds = seconds
+        self.candidates = candidates
+        self.duplicates = duplicates
+        self.over_budget = over_budget
+
+    @property
+    def text(self):
+        return "\n\n".join(f"[{source}]\n{text}" for source, text, _ in self.passages)
+
+    def metrics(self):
+        return {
+            'context_tokens': self.tokens,
+            'passages': len(self.passages),
+            'candidates': self.candidates,
+            'duplicates_dropped': self.duplicates,
+            'over_budget_dropped': self.over_budget,
+            'pack_ms': self.seconds * 1000
+        }
+
+
+class ContextBuilder:
+    """Packs the best retrieved passages for a query under a token budget.
+
+    The top ``candidates`` passages are visited in score order; a passage
+    whose word 3-gram Jaccard similarity with an already chosen one reaches
+    ``similarity_threshold`` is skipped as a near duplicate, and one that
+    would push the estimated total past ``token_budget`` is skipped in
+    favour of shorter, lower-scoring ones.
+    """
+
+    def __init__(self, token_budget=2000, candidates=20, similarity_threshold=0.8):
+        self.token_budget = token_budget
+        self.candidates = candidates
+        self.similarity_threshold = similarity_threshold
+
+    def build(self, analyzer, query):
+        """PackedContext for ``query`` from a search analyzer's passages"""
+        start = time.perf_counter()
+        results = analyzer.search(query, self.candidates) if len(analyzer.document_texts) else []
+        chosen = []
+        chosen_shingles = []
+        tokens = duplicates = over_budget = 0
+        for i, score, source in results:
+            text = analyzer.document_texts[i]
+            shingles = _shingles(text)
+            if any(len(shingles & other) / len(shingles | other) >= self.similarity_threshold
+                   for other in chosen_shingles):
+                duplicates += 1
+                continue
+            # Each passage also carries its source line
+            cost = estimate_tokens(text) + estimate_tokens(source) + 2
+            if tokens + cost > self.token_budget:
+                over_budget += 1
+                continue
+            chosen.append((source, text, score))
+            chosen_shingles.append(shingles)
+            tokens += cost
+        return PackedContext(chosen, tokens, time.perf_counter() - start, len(results), duplicates, over_budget)
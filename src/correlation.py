@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+
+class CorrelationEngine:
+    """Pairwise-complete correlation matrix built from BLAS Gram products.
+
+    For column blocks X (missing values zeroed) and M (1 where a value is
+    present) the engine accumulates ``M'M`` (pair counts), ``X'M`` and
+    ``(X*X)'M`` (per-pair sums and sums of squares) and ``X'X``, which is
+    everything Pearson's r needs for every pair over the rows where both
+    columns are present, matching ``df.corr()``. Frames without missing
+    values only need ``X'X`` and column sums. Values are shifted by the
+    first block's column means to keep the sums well conditioned.
+
+    Statistics are additive, so ``update`` can be called again with
+    appended rows. Ranks are not, so with ``method='spearman'`` the engine
+    takes a single update, whose rows are ranked per column before
+    accumulating; it matches ``df.corr('spearman')`` for frames without
+    missing values (pandas ranks each pair's complete rows separately).
+    """
+
+    def __init__(self, method='pearson', min_periods=1, block_rows=65536):
+        if method not in ('pearson', 'spearman'):
+            raise ValueError(f"Unsupported correlation method: {method}")
+        self.method = method
+        self.min_periods = min_periods
+        self.block_rows = block_rows
+        self.columns = None
+        self.n_rows = 0
+        self._shift = None
+        self._sums = None
+        self._xx = None
+        self._xm = None
+        self._x2m = None
+        self._mm = None
+
+    @classmethod
+    def from_frame(cls, df, method='pearson', min_periods=1):
+        engine = cls(method, min_periods)
+        engine.update(df)
+        return engine
+
+    def update(self, df, progress=None):
+        """Accumulate the numeric columns of new rows.
+
+        ``progress`` is called with the fraction of rows done after each block.
+        """
+        if self.method == 'spearman' and self.columns is not None:
+            raise ValueError("Spearman correlation ranks all rows at once and cannot be updated")
+        if self.columns is None:
+            self.columns = df.select_dtypes(include=[np.number]).columns
+        values = df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if self.method == 'spearman':
+            values = pd.DataFrame(values).rank().to_numpy()
+        for start in range(0, len(values), self.block_rows):
+            self._accumulate(values[start:start + self.block_rows])
+            if progress is not None:
+                progress(min(start + self.block_rows, len(values)) / len(values))
+        return self
+
+    def _accumulate(self, x):
+        p = x.shape[1]
+        if self._xx is None:
+            self._shift = np.nan_to_num(np.nanmean(x, axis=0)) if len(x) else np.zeros(p)
+            self._xx = np.zeros((p, p))
+            self._sums = np.zeros(p)
+        missing = np.isnan(x)
+        x = x - self._shift
+        if missing.any():
+            if self._mm is None:
+                # Until now every row was complete, so the pairwise sums are implied
+                self._mm = np.full((p, p), float(self.n_rows))
+                self._xm = np.repeat(self._sums[:, None], p, axis=1)
+                self._x2m = np.repeat(np.diag(self._xx)[:, None], p, axis=1)
+            present = (~missing).astype(np.float64)
+            x[missing] = 0.0
+            self._mm += present.T @ present
+            self._xm += x.T @ present
+            self._x2m += (x * x).T @ present
+        elif self._mm is not None:
+            self._mm += len(x)
+            self._xm += x.sum(axis=0)[:, None]
+            self._x2m += (x * x).sum(axis=0)[:, None]
+        self._xx += x.T @ x
+        self._sums += x.sum(axis=0)
+        self.n_rows += len(x)
+
+    def matrix(self):
+        """Correlation matrix as a DataFrame labelled by column"""
+        if self.columns is None:
+            return pd.DataFrame()
+        if self._xx is None:
+            return pd.DataFrame(np.nan, index=self.columns, columns=self.columns)
+        if self._mm is None:
+            n = np.full(self._xx.shape, float(self.n_rows))
+            sums = np.broadcast_to(self._sums[:, None], self._xx.shape)
+            squares = np.broadcast_to(np.diag(self._xx)[:, None], self._xx.shape)
+        else:
+            n, sums, squares = self._mm, self._xm, self._x2m
+        # sums[i, j] is the sum of column i over rows where column j is present
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = n * self._xx - sums * sums.T
+            var = n * squares - sums * sums
+            corr = cov / np.sqrt(var * var.T)
+        corr[n < max(self.min_periods, 1)] = np.nan
+        np.clip(corr, -1, 1, out=corr)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def top_pairs(self, n=20):
+        """The ``n`` column pairs with the largest absolute correlation"""
+        corr = self.matrix()
+        values = corr.to_numpy()
+        rows, cols = np.triu_indices(len(values), k=1)
+        strength = np.abs(values[rows, cols])
+        valid = np.flatnonzero(~np.isnan(strength))
+        if len(valid) > n:
+            valid = valid[np.argpartition(-strength[valid], n - 1)[:n]]
+        valid = valid[np.argsort(-strength[valid], kind='stable')]
+        counts = self._mm[rows[valid], cols[valid]] if self._mm is not None else np.full(len(valid), float(self.n_rows))
+        return pd.DataFrame({
+            'column_a': corr.columns[rows[valid]],
+            'column_b': corr.columns[cols[valid]],
+            'correlation': values[rows[valid], cols[valid]],
+            'observations': counts.astype(np.int64)
+        })
+
+
+def correlation_matrix(df, method='pearson', min_periods=1):
+    """Drop-in for ``df.corr(method)`` on the numeric columns of a frame"""
+    return CorrelationEngine.from_frame(df, method, min_periods).matrix()
@@ -1,18 +1,33 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import PyPDF2
-import docx
+import hashlib
+
+from .context_builder import split_passages
+from .ingestion import extract_text
+from .retrieval import ExactBackend
+from .search_index import IncrementalTfidfIndex, IndexStore, content_key, file_hash, iter_serialized_rows
 
 class DataAnalyzer:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer()
+    def __init__(self, row_chunksize=100000, index_dir=None, backend=None, passage_words=150,
+                 index_max_bytes=1024 ** 3):
+        self.row_chunksize = row_chunksize
+        self.passage_words = passage_words
+        self.backend = backend or ExactBackend()
+        self.index_store = IndexStore(index_dir, index_max_bytes) if index_dir else None
         self.df = None
         self.df_clean = None
+        self.sheet_name = None
+        self.sheet_hash = None
         self.document_texts = []
-        self.tfidf_matrix = None
+        self.index = IncrementalTfidfIndex()
         self.documents = []
+
+    @property
+    def tfidf_matrix(self):
+        """TF-IDF matrix of the current search index"""
+        if len(self.index) == 0:
+            return None
+        return self.index.matrix
         
     def load_data(self, file):
         """Load and preprocess the file based on its type"""
@@ -21,75 +36,138 @@ class DataAnalyzer:
             
             if file_type in ['xlsx', 'xls']:
                 # Handle Excel files
+                source_hash = file_hash(file)
                 df = pd.read_excel(file)
-                self.df = df
-                self.df_clean = df.copy()
-                self._update_document_texts()
+                self.index_frame(df, file.name, source_hash)
                 return df
                 
-            elif file_type == 'pdf':
-                # Handle PDF files
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                self._add_document(text, file.name)
-                return None
-                
-            elif file_type == 'docx':
-                # Handle Word files
-                doc = docx.Document(file)
-                text = ""
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
-                self._add_document(text, file.name)
+            elif file_type in ['pdf', 'docx']:
+                # Handle PDF and Word files; use ingestion.ingest_files for many at once
+                self._add_document(extract_text(file, file.name), file.name, file_hash(file))
                 return None
                 
         except Exception as e:
             print(f"Error loading data: {str(e)}")
             return None
     
-    def _add_document(self, text, filename):
-        """Add document to the collection"""
-        self.documents.append({
-            'text': text,
-            'filename': filename
-        })
+    def index_frame(self, df, name, source_hash=None):
+        """Use an already loaded frame as the spreadsheet source and index its rows"""
+        self.sheet_name = name
+        self.sheet_hash = source_hash or hashlib.sha256(pd.util.hash_pandas_object(df).to_numpy().tobytes()).hexdigest()
+        self.df = df
+        self.df_clean = df
         self._update_document_texts()
     
+    def _add_document(self, text, filename, source_hash=None):
+        """Add document to the collection, indexed as passages of about passage_words words"""
+        self.add_documents([(text, filename, source_hash)])
+    
+    def add_documents(self, documents):
+        """Add (text, filename, source_hash) documents, extending and saving the index once"""
+        new_documents = [{
+            'text': text,
+            'filename': filename,
+            'hash': source_hash or hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            'passages': split_passages(text, self.passage_words) or [text]
+        } for text, filename, source_hash in documents]
+        if not new_documents:
+            return
+        self.documents.extend(new_documents)
+        if self._load_saved_index():
+            return
+        
+        # Documents always follow the spreadsheet rows, so appending keeps
+        # the same order a full rebuild would produce
+        if not isinstance(self.document_texts, list):
+            self.document_texts = list(self.document_texts)
+        passages = [passage for doc in new_documents for passage in doc['passages']]
+        self.document_texts.extend(passages)
+        self.index.add_documents(passages)
+        self._save_index()
+    
+    def _index_key(self):
+        """Content address of the index for the current set of sources"""
+        hashes = [(self.sheet_hash or '') if self.df_clean is not None else '']
+        hashes.extend(doc['hash'] for doc in self.documents)
+        # Documents are stored as passages, so the passage size is part of the content
+        hashes.append(f"passages:{self.passage_words}")
+        return content_key(hashes)
+    
+    def _load_saved_index(self):
+        """Reuse a persisted index for the current sources if one exists"""
+        if self.index_store is None or self._index_key() not in self.index_store:
+            return False
+        try:
+            self.index, self.document_texts = self.index_store.load(self._index_key())
+        except KeyError:
+            return False
+        return True
+    
+    def _save_index(self):
+        """Persist the current index when an index directory is configured"""
+        if self.index_store is not None and len(self.index):
+            self.index_store.save(self._index_key(), self.index, self.document_texts)
+    
     def _update_document_texts(self):
-        """Update document texts and TF-IDF matrix"""
+        """Rebuild document texts and the search index from scratch"""
+        if self._load_saved_index():
+            return
+        
         self.document_texts = []
+        self.index = IncrementalTfidfIndex()
         
-        # Add Excel data if available
+        # Add Excel data if available, streaming row texts into the index
         if self.df_clean is not None:
-            for _, row in self.df_clean.iterrows():
-                doc_text = " | ".join([f"{col}: {val}" for col, val in row.items()])
-                self.document_texts.append(doc_text)
+            for texts in iter_serialized_rows(self.df_clean, self.row_chunksize):
+                self.document_texts.extend(texts)
+                self.index.add_documents(texts)
         
-        # Add PDF/Word documents
+        # Add PDF/Word document passages
+        texts = [passage for doc in self.documents for passage in doc['passages']]
+        self.document_texts.extend(texts)
+        self.index.add_documents(texts)
+        self._save_index()
+    
+    def _source(self, i):
+        """Describe where the i-th indexed text came from"""
+        n_rows = len(self.df_clean) if self.df_clean is not None else 0
+        if i < n_rows:
+            return f"{self.sheet_name} row {self.df_clean.index[i]}"
+        i -= n_rows
         for doc in self.documents:
-            self.document_texts.append(doc['text'])
+            if i < len(doc['passages']):
+                return doc['filename'] if len(doc['passages']) == 1 else f"{doc['filename']} passage {i + 1}"
+            i -= len(doc['passages'])
+        raise IndexError(i)
+    
+    def set_backend(self, backend):
+        """Switch the retrieval backend used by search"""
+        self.backend = backend
+    
+    def search(self, queries, k=5):
+        """Return (index, score, source) tuples for one query or a list of queries"""
+        single = isinstance(queries, str)
+        batch = [queries] if single else list(queries)
+        if len(self.index) == 0:
+            return [] if single else [[] for _ in batch]
+        
+        # Rebuild the backend whenever the indexed documents have changed
+        if self.backend.index is not self.index or self.backend.n_docs != len(self.index):
+            self.backend.build(self.index)
         
-        # Update TF-IDF matrix if we have documents
-        if self.document_texts:
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.document_texts)
+        indices, scores = self.backend.search(self.index.transform(batch), k)
+        results = [
+            [(i, score, self._source(i)) for i, score in zip(row_indices.tolist(), row_scores.tolist()) if i >= 0]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
+        return results[0] if single else results
     
     def search_documents(self, query, k=5):
-        """Search documents using TF-IDF and cosine similarity"""
+        """Return the texts of the k best matching rows and document passages"""
         if not self.document_texts or self.tfidf_matrix is None:
             return []
-            
-        # Transform query to TF-IDF
-        query_vector = self.vectorizer.transform([query])
-        
-        # Calculate cosine similarity
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
-        
-        # Get top k similar documents
-        top_k_indices = similarities.argsort()[-k:][::-1]
         
-        # Get the relevant documents
-        relevant_docs = [self.document_texts[i] for i in top_k_indices]
+        # Get the top k documents from a blocked, partial-selection scan
+        relevant_docs = [self.document_texts[i] for i, _, _ in self.search(query, k)]
         
         return relevant_docs 
\ No newline at end of file
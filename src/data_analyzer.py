@@ -1,27 +1,239 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import warnings
+import weakref
+
+from .correlation import CorrelationEngine
 warnings.filterwarnings('ignore')
 
-class DataAnalyzer:
-    def __init__(self):
+def downcast_frame(df, category_columns=None, max_category_ratio=0.5):
+    """Shrink dtypes: smallest integer types, lossless float32, categoricals.
+
+    String columns whose unique-value ratio is at most ``max_category_ratio``
+    become categoricals, unless ``category_columns`` fixes the choice.
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(series) and isinstance(series.dtype, np.dtype):
+            unsigned = len(series) > 0 and series.min() >= 0
+            df[col] = pd.to_numeric(series, downcast='unsigned' if unsigned else 'integer')
+        elif pd.api.types.is_float_dtype(series) and series.dtype == np.float64:
+            narrowed = series.astype(np.float32)
+            # Only keep float32 when it round-trips every value exactly
+            if ((narrowed.astype(np.float64) == series) | series.isna()).all():
+                df[col] = narrowed
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if category_columns is not None:
+                to_category = col in category_columns
+            else:
+                to_category = len(series) > 0 and series.nunique() / len(series) <= max_category_ratio
+            if to_category:
+                df[col] = series.astype('category')
+    return df
+
+class ReservoirQuantiles:
+    """Approximate quantiles from a fixed-size uniform sample of a stream"""
+
+    def __init__(self, size=10000, seed=0):
+        self.size = size
+        self.sample = np.empty(0)
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        room = self.size - len(self.sample)
+        if room > 0:
+            self.sample = np.concatenate([self.sample, values[:room]])
+            self.seen += min(room, len(values))
+            values = values[room:]
+        if len(values) == 0:
+            return
+        # Algorithm R, vectorized: item j replaces a random slot with probability size / (seen + j + 1)
+        slots = self.rng.integers(0, self.seen + np.arange(1, len(values) + 1))
+        keep = slots < self.size
+        self.sample[slots[keep]] = values[keep]
+        self.seen += len(values)
+
+    def quantile(self, q):
+        return float(np.quantile(self.sample, q)) if len(self.sample) else np.nan
+
+class IngestionStats:
+    """Cleaning statistics accumulated chunk by chunk while a file is read"""
+
+    def __init__(self, sample_size=10000):
+        self.sample_size = sample_size
+        self.n_rows = 0
+        self.missing = None
+        self.row_hashes = []
+        self.sketches = {}
+
+    def update(self, chunk):
+        missing = chunk.isnull().sum()
+        self.missing = missing if self.missing is None else self.missing.add(missing, fill_value=0)
+        self.row_hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+        for col in chunk.select_dtypes(include=[np.number]).columns:
+            if col not in self.sketches:
+                self.sketches[col] = ReservoirQuantiles(self.sample_size)
+            self.sketches[col].update(chunk[col].to_numpy())
+        self.n_rows += len(chunk)
+
+    def hashes(self):
+        return np.concatenate(self.row_hashes) if self.row_hashes else np.empty(0, dtype=np.uint64)
+
+    def duplicate_mask(self):
+        """True for every row whose hash was already seen earlier in the file"""
+        hashes = self.hashes()
+        _, first = np.unique(hashes, return_index=True)
+        mask = np.ones(len(hashes), dtype=bool)
+        mask[first] = False
+        return mask
+
+def duplicate_rows(df, hashes=None):
+    """Boolean mask of rows repeating an earlier row, like ``df.duplicated()``.
+
+    Rows are matched by 64-bit hash and every match is confirmed against the
+    row it repeats; a hash collision falls back to ``df.duplicated()``.
+    """
+    if hashes is None:
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    repeats = np.flatnonzero(first[inverse] != np.arange(len(hashes)))
+    mask = np.zeros(len(hashes), dtype=bool)
+    if len(repeats):
+        rows = df.iloc[repeats].reset_index(drop=True)
+        originals = df.iloc[first[inverse[repeats]]].reset_index(drop=True)
+        if not ((rows == originals) | (rows.isna() & originals.isna())).all(axis=None):
+            return df.duplicated().to_numpy()
+        mask[repeats] = True
+    return mask
+
+def column_quantiles(values, q=(0.25, 0.75)):
+    """Linearly interpolated quantiles of every column of a 2-D float array, skipping NaN.
+
+    Returns an array of shape ``(len(q), n_columns)``; all-NaN columns give NaN.
+    """
+    q = np.asarray(q, dtype=float)
+    n_rows, n_cols = values.shape
+    if n_rows == 0:
+        return np.full((len(q), n_cols), np.nan)
+    # Sort each column as a contiguous row of a transposed copy; NaN sorts last
+    ordered = np.array(values.T, order='C')
+    ordered.sort(axis=1)
+    n_valid = n_rows - np.isnan(ordered).sum(axis=1)
+    positions = np.multiply.outer(q, np.maximum(n_valid - 1, 0))
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(n_valid - 1, 0))
+    cols = np.arange(n_cols)
+    low_values = ordered[cols, lower]
+    result = low_values + (positions - lower) * (ordered[cols, upper] - low_values)
+    result[:, n_valid == 0] = np.nan
+    return result
+
+class CleaningReport:
+    """Data-quality findings from DataAnalyzer.profile_data.
+
+    ``missing`` has one row per column with its missing count and percentage,
+    ``outliers`` one row per numeric column with its IQR bounds and the
+    number of values outside them, and ``duplicate_mask`` flags the rows
+    that repeat an earlier row.
+    """
+
+    def __init__(self, n_rows, missing, duplicate_mask, outliers, approximate=False):
+        self.n_rows = n_rows
+        self.missing = missing
+        self.duplicate_mask = duplicate_mask
+        self.outliers = outliers
+        self.approximate = approximate
+
+    @property
+    def duplicates(self):
+        return int(self.duplicate_mask.sum())
+
+    def __str__(self):
+        missing = self.missing[self.missing['Missing Values'] > 0]
+        return "\n".join([
+            "=== Missing Value Analysis ===",
+            str(missing) if len(missing) else "No missing values",
+            f"\nNumber of duplicate rows: {self.duplicates}",
+            "\n=== Outlier Analysis ===",
+            str(self.outliers[['Lower Bound', 'Upper Bound', 'Outliers']])
+        ])
+
+_plotting_modules = None
+
+def _plotting():
+    """matplotlib.pyplot and seaborn, imported and styled the first time a chart is drawn"""
+    global _plotting_modules
+    if _plotting_modules is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         # Set style for better visualizations
         plt.style.use('default')  # Using default style instead of seaborn
         sns.set_theme(style="whitegrid")  # Using seaborn's set_theme instead
+        _plotting_modules = plt, sns
+    return _plotting_modules
+
+class DataAnalyzer:
+    def __init__(self, chunksize=None, max_heatmap_columns=30, top_correlations=20):
+        self.chunksize = chunksize
+        self.max_heatmap_columns = max_heatmap_columns
+        self.top_correlations = top_correlations
+        self.ingestion_stats = None
+        self.cleaning_report = None
+        self._ingested_frame = None
+        
+    def _read_csv_chunked(self, uploaded_file, chunksize):
+        """Read a CSV in bounded chunks, downcasting and profiling each one"""
+        stats = IngestionStats()
+        chunks = []
+        category_columns = None
+        for chunk in pd.read_csv(uploaded_file, chunksize=chunksize):
+            stats.update(chunk)
+            if category_columns is None:
+                # The first chunk decides which columns become categoricals
+                chunk = downcast_frame(chunk)
+                category_columns = set(chunk.select_dtypes(include=['category']).columns)
+            else:
+                chunk = downcast_frame(chunk, category_columns)
+            chunks.append(chunk)
         
-    def load_data(self, uploaded_file):
+        if not chunks:
+            df = pd.DataFrame()
+        else:
+            df = pd.concat(chunks, ignore_index=True)
+            for col in category_columns:
+                try:
+                    df[col] = pd.api.types.union_categoricals([chunk[col] for chunk in chunks])
+                except TypeError:
+                    # Chunks disagreed on the category dtype (e.g. an all-empty chunk)
+                    df[col] = df[col].astype('category')
+        # The statistics describe this very frame, not any other of the same length
+        self.ingestion_stats = stats
+        self._ingested_frame = weakref.ref(df)
+        return df
+        
+    def load_data(self, uploaded_file, chunksize=None):
         """Load data from Streamlit uploaded file"""
         try:
             # Get the file name to determine the file type
             file_name = uploaded_file.name.lower()
+            chunksize = chunksize or self.chunksize
+            self.ingestion_stats = None
+            self._ingested_frame = None
             
             if file_name.endswith('.csv'):
+                if chunksize:
+                    return self._read_csv_chunked(uploaded_file, chunksize)
                 return pd.read_csv(uploaded_file)
             elif file_name.endswith(('.xlsx', '.xls')):
-                return pd.read_excel(uploaded_file)
+                # Excel has no streaming reader in pandas, so only downcast
+                df = pd.read_excel(uploaded_file)
+                return downcast_frame(df) if chunksize else df
             else:
                 print("Error: Unsupported file format. Please use .csv, .xlsx, or .xls files.")
                 return None
@@ -29,44 +241,69 @@ class DataAnalyzer:
             print(f"Error loading data: {str(e)}")
             return None
 
-    def clean_data(self, df):
-        """Perform comprehensive data cleaning"""
-        if df is None:
-            return None
-            
-        # Create a copy to avoid modifying original data
-        df_clean = df.copy()
-        
-        # 1. Handle missing values
-        missing_values = df_clean.isnull().sum()
-        missing_percentage = (missing_values / len(df_clean)) * 100
+    def profile_data(self, df, column_block=32):
+        """Profile missing values, duplicates and IQR outliers of a frame.
+
+        Outliers are counted over the de-duplicated rows. Numeric columns are
+        processed ``column_block`` at a time, with one quantile computation
+        and one comparison pass per block.
+        """
+        # Reuse statistics gathered during chunked ingestion, only for the frame that was ingested
+        ingested = self._ingested_frame() if self._ingested_frame is not None else None
+        stats = self.ingestion_stats if ingested is df else None
         
-        print("\n=== Missing Value Analysis ===")
-        missing_stats = pd.DataFrame({
-            'Missing Values': missing_values,
-            'Percentage': missing_percentage
+        missing_values = stats.missing.reindex(df.columns) if stats else df.isnull().sum()
+        missing = pd.DataFrame({
+            'Missing Values': missing_values.astype(np.int64),
+            'Percentage': (missing_values / len(df)) * 100 if len(df) else 0.0
         })
-        print(missing_stats[missing_stats['Missing Values'] > 0])
+        duplicate_mask = duplicate_rows(df, stats.hashes() if stats else None)
+        keep = ~duplicate_mask if duplicate_mask.any() else None
         
-        # 2. Handle duplicates
-        duplicates = df_clean.duplicated().sum()
-        print(f"\nNumber of duplicate rows: {duplicates}")
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        quartiles = np.empty((2, len(numeric_cols)))
+        counts = np.empty(len(numeric_cols), dtype=np.int64)
+        for start in range(0, len(numeric_cols), column_block):
+            block_cols = numeric_cols[start:start + column_block]
+            values = df[block_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            if keep is not None:
+                values = values[keep]
+            if stats and all(col in stats.sketches for col in block_cols):
+                # Approximate quartiles from the ingestion sample
+                block_quartiles = np.array([[stats.sketches[col].quantile(q) for col in block_cols] for q in (0.25, 0.75)])
+            else:
+                block_quartiles = column_quantiles(values)
+            iqr = block_quartiles[1] - block_quartiles[0]
+            lower, upper = block_quartiles[0] - 1.5 * iqr, block_quartiles[1] + 1.5 * iqr
+            counts[start:start + len(block_cols)] = ((values < lower) | (values > upper)).sum(axis=0)
+            quartiles[:, start:start + len(block_cols)] = block_quartiles
         
-        # 3. Remove duplicates
-        df_clean = df_clean.drop_duplicates()
+        iqr = quartiles[1] - quartiles[0]
+        outliers = pd.DataFrame({
+            'Q1': quartiles[0],
+            'Q3': quartiles[1],
+            'IQR': iqr,
+            'Lower Bound': quartiles[0] - 1.5 * iqr,
+            'Upper Bound': quartiles[1] + 1.5 * iqr,
+            'Outliers': counts
+        }, index=numeric_cols)
+        return CleaningReport(len(df), missing, duplicate_mask, outliers, approximate=stats is not None)
+
+    def clean_data(self, df):
+        """Perform comprehensive data cleaning"""
+        if df is None:
+            return None
         
-        # 4. Handle outliers using IQR method for numeric columns
-        numeric_cols = df_clean.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            Q1 = df_clean[col].quantile(0.25)
-            Q3 = df_clean[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            outliers = ((df_clean[col] < lower_bound) | (df_clean[col] > upper_bound)).sum()
-            print(f"\nOutliers in {col}: {outliers}")
+        # The report is kept for the dashboard and printed for the console
+        self.cleaning_report = self.profile_data(df)
+        print(self.cleaning_report)
         
-        return df_clean
+        # Remove duplicates; indexing returns a new frame, so the input is never modified
+        duplicate_mask = self.cleaning_report.duplicate_mask
+        if not duplicate_mask.any():
+            # Nothing to drop, so skip copying the whole frame
+            return df
+        return df[~duplicate_mask]
 
     def analyze_data(self, df):
         """Perform comprehensive data analysis"""
@@ -87,17 +324,22 @@ class DataAnalyzer:
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         if len(numeric_cols) > 1:
             print("\n=== Correlation Analysis ===")
-            correlation = df[numeric_cols].corr()
-            plt.figure(figsize=(10, 8))
-            sns.heatmap(correlation, annot=True, cmap='coolwarm', center=0)
-            plt.title('Correlation Heatmap')
-            plt.tight_layout()
-            plt.show()
+            engine = CorrelationEngine.from_frame(df[numeric_cols])
+            print(engine.top_pairs(self.top_correlations))
+            # A heatmap is only readable for a modest number of columns
+            if len(numeric_cols) <= self.max_heatmap_columns:
+                plt, sns = _plotting()
+                plt.figure(figsize=(10, 8))
+                sns.heatmap(engine.matrix(), annot=len(numeric_cols) <= 15, cmap='coolwarm', center=0)
+                plt.title('Correlation Heatmap')
+                plt.tight_layout()
+                plt.show()
 
     def visualize_data(self, df):
         """Create various visualizations for data insights"""
         if df is None:
             return
+        plt, sns = _plotting()
             
         # 1. Distribution of numeric columns
         numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from .context_builder import estimate_tokens
+from .data_analyzer import column_quantiles
+
+QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+QUANTILE_LABELS = ('min', 'p25', 'median', 'p75', 'max')
+
+
+def _num(value):
+    """Short human-readable number for prompts"""
+    if pd.isna(value):
+        return 'n/a'
+    value = float(value)
+    if value.is_integer() and abs(value) < 1e15:
+        return f"{value:,.0f}"
+    if abs(value) >= 1e4:
+        return f"{value:,.0f}"
+    return f"{value:.4g}"
+
+
+class DatasetStats:
+    """Compact statistics of a cleaned frame, for prompts instead of raw rows.
+
+    ``columns`` holds one dict per column with its dtype, null rate and
+    either quantiles and mean (numeric), distinct count and range (dates)
+    or distinct count and the most frequent values (everything else).
+    ``correlations`` is a strongest-pairs frame and ``group_means`` maps a
+    category column to the row count and numeric means of its largest groups.
+    """
+
+    def __init__(self, n_rows, columns, correlations=None, group_means=None):
+        self.n_rows = n_rows
+        self.columns = columns
+        self.correlations = correlations
+        self.group_means = group_means or {}
+
+    def _column_lines(self):
+        for column in self.columns:
+            header = f"- {column['name']} ({column['dtype']}, {column['null_rate']:.1%} null"
+            if 'quantiles' in column:
+                values = ', '.join(f"{label} {_num(value)}" for label, value in zip(QUANTILE_LABELS, column['quantiles']))
+                yield f"{header}): {values}, mean {_num(column['mean'])}"
+            elif 'range' in column:
+                first, last = column['range']
+                yield f"{header}, {column['distinct']:,} distinct): from {first} to {last}"
+            else:
+                top = ', '.join(f"{value} {share:.1%}" for value, share in column['top_values'])
+                yield f"{header}, {column['distinct']:,} distinct): {top}"
+
+    def _correlation_lines(self):
+        if self.correlations is None or self.correlations.empty:
+            return
+        yield "Strongest correlations:"
+        for row in self.correlations.itertuples(index=False):
+            yield f"- {row.column_a} ~ {row.column_b}: {row.correlation:+.2f}"
+
+    def _group_lines(self):
+        for column, means in self.group_means.items():
+            metrics = [name for name in means.columns if name != 'rows']
+            yield f"Means by {column} (rows, {', '.join(map(str, metrics))}):"
+            for group, row in means.iterrows():
+                yield f"- {group}: {int(row['rows']):,} rows, " + ', '.join(_num(row[name]) for name in metrics)
+
+    def text(self, token_budget=800):
+        """Statistics as prompt lines, cut at ``token_budget``.
+
+        Lines are kept in priority order (columns, correlations, group
+        means) up to the first one that does not fit.
+        """
+        candidates = [*self._column_lines(), *self._correlation_lines(), *self._group_lines()]
+        lines = [f"{self.n_rows:,} rows, {len(self.columns)} columns:"]
+        tokens = estimate_tokens(lines[0])
+        for i, line in enumerate(candidates):
+            cost = estimate_tokens(line) + 1
+            if tokens + cost > token_budget:
+                lines.append(f"({len(candidates) - i} more lines omitted for length)")
+                break
+            lines.append(line)
+            tokens += cost
+        return '\n'.join(lines)
+
+
+def compute_stats(df, correlations=None, top_k=5, max_group_columns=3, max_groups=10, max_metrics=5,
+                  max_category_values=50, column_block=32):
+    """DatasetStats for a frame.
+
+    Quantiles are computed for blocks of ``column_block`` numeric columns at
+    a time. Group means are reported for up to ``max_group_columns`` text or
+    categorical columns with at most ``max_category_values`` distinct values,
+    over their ``max_groups`` largest groups and the first ``max_metrics``
+    numeric columns.
+    """
+    n_rows = len(df)
+    null_rates = df.isna().mean() if n_rows else pd.Series(0.0, index=df.columns)
+    numeric = [column for column in df.columns
+               if pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column])]
+
+    quantiles = {}
+    means = {}
+    for start in range(0, len(numeric), column_block):
+        block = numeric[start:start + column_block]
+        values = df[block].to_numpy(dtype=float, na_value=np.nan)
+        block_quantiles = column_quantiles(values, QUANTILES)
+        with np.errstate(invalid='ignore'):
+            block_means = np.nanmean(values, axis=0) if n_rows else np.full(len(block), np.nan)
+        for i, column in enumerate(block):
+            quantiles[column] = block_quantiles[:, i]
+            means[column] = block_means[i]
+
+    columns = []
+    categories = []
+    for column in df.columns:
+        info = {'name': column, 'dtype': str(df[column].dtype), 'null_rate': float(null_rates[column])}
+        if column in quantiles:
+            info['quantiles'] = quantiles[column]
+            info['mean'] = means[column]
+        elif pd.api.types.is_datetime64_any_dtype(df[column]):
+            info['distinct'] = df[column].nunique()
+            info['range'] = (df[column].min(), df[column].max())
+        else:
+            counts = df[column].value_counts(sort=True)
+            info['distinct'] = len(counts)
+            info['top_values'] = [(value, count / n_rows) for value, count in counts.head(top_k).items()]
+            if 1 < len(counts) <= max_category_values:
+                categories.append(column)
+        columns.append(info)
+
+    group_means = {}
+    metrics = numeric[:max_metrics]
+    for column in categories[:max_group_columns]:
+        grouped = df.groupby(column, observed=True)
+        summary = grouped[metrics].mean() if metrics else pd.DataFrame(index=grouped.size().index)
+        summary.insert(0, 'rows', grouped.size())
+        group_means[column] = summary.nlargest(max_groups, 'rows')
+    return DatasetStats(n_rows, columns, correlations, group_means)
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+TIMED_OUT = 'timed out'
+FINISHED = (DONE, FAILED, CANCELLED, TIMED_OUT)
+
+
+class Job:
+    """A background computation that can be polled, cancelled and timed out.
+
+    The job function is called with the Job itself. It should hand partial
+    results to ``publish`` as they become available and check
+    ``cancel_event`` (set on cancellation and on timeout) to stop early;
+    whatever it returns after that is discarded.
+    """
+
+    def __init__(self, key, fn, timeout=None):
+        self.key = key
+        self.fn = fn
+        self.timeout = timeout
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self._partial = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._future = None
+        self._timer = None
+
+    def publish(self, item):
+        """Add a partial result for pollers to show before the job finishes"""
+        with self._lock:
+            self._partial.append(item)
+
+    @property
+    def partial(self):
+        """Copy of the partial results published so far"""
+        with self._lock:
+            return list(self._partial)
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns whether it did"""
+        return self._done.wait(timeout)
+
+    def _finish(self, status, result=None, error=None):
+        with self._lock:
+            if self.done:
+                return False
+            self.status = status
+            self.result = result
+            self.error = error
+            self.finished = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+        self._done.set()
+        logger.info(f"Job {self.key} {status} after {self.elapsed:.2f}s")
+        return True
+
+    def cancel(self, status=CANCELLED):
+        """Stop the job: drop it from the queue or signal it to stop, and discard its result"""
+        self.cancel_event.set()
+        if self._future is not None:
+            self._future.cancel()
+        if self.started is None:
+            self.started = time.monotonic()
+        return self._finish(status)
+
+    def _run(self):
+        with self._lock:
+            if self.done:
+                return
+            self.status = RUNNING
+            self.started = time.monotonic()
+        if self.timeout is not None:
+            self._timer = threading.Timer(self.timeout, self.cancel, args=(TIMED_OUT,))
+            self._timer.daemon = True
+            self._timer.start()
+        try:
+            result = self.fn(self)
+        except Exception as e:
+            logger.error(f"Job {self.key} failed: {str(e)}")
+            self._finish(FAILED, error=e)
+        else:
+            self._finish(DONE, result=result)
+
+
+class JobScheduler:
+    """Thread pool plus a registry of jobs keyed by what they compute.
+
+    Submitting a key that already has a pending, running or successfully
+    finished job returns that job instead of starting another, so every
+    session asking for the same dataset shares one computation. Failed,
+    cancelled and timed-out jobs are replaced on the next submit, and with
+    ``force`` a successfully finished one is replaced too. At most
+    ``keep_finished`` finished jobs are remembered, least recently used
+    first out.
+    """
+
+    def __init__(self, max_workers=4, timeout=None, keep_finished=64):
+        self.timeout = timeout
+        self.keep_finished = keep_finished
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix='job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.deduplicated = 0
+
+    def submit(self, key, fn, timeout=None, force=False):
+        """Job computing ``fn(job)`` for ``key``, reusing a live one or, unless ``force``, a successful one"""
+        with self._lock:
+            job = self._jobs.get(key)
+            reusable = (PENDING, RUNNING) if force else (PENDING, RUNNING, DONE)
+            if job is not None and job.status in reusable:
+                self._jobs.move_to_end(key)
+                self.deduplicated += 1
+                return job
+            job = Job(key, fn, timeout if timeout is not None else self.timeout)
+            self._jobs[key] = job
+            self.submitted += 1
+            self._trim()
+        job._future = self._pool.submit(job._run)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def cancel(self, key):
+        """Cancel the job for ``key``; returns whether a live job was cancelled"""
+        job = self.get(key)
+        return job is not None and job.cancel()
+
+    def _trim(self):
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[key]
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        counts = {status: statuses.count(status) for status in (PENDING, RUNNING) + FINISHED}
+        return {'submitted': self.submitted, 'deduplicated': self.deduplicated, **counts}
+
+    def shutdown(self, cancel=True):
+        """Stop accepting jobs, cancelling live ones first when ``cancel`` is set"""
+        if cancel:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            for job in jobs:
+                job.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=cancel)
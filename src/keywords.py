@@ -0,0 +1,109 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Relative weight of each kind of keyword. Category values score between
+# 60% and 100% of their weight depending on the share of rows holding them,
+# and TF-IDF terms by their score relative to the column's best term.
+KEYWORD_WEIGHTS = {'value': 1.0, 'term': 0.8, 'column': 0.4, 'metric': 0.3, 'default': 0.1}
+_ID_NAME = re.compile(r'(?:^|[\s_-])(?:id|uuid|guid|key|code|email|url|phone|hash)$|^id[\s_-]', re.IGNORECASE)
+_NOT_A_WORD = re.compile(r'^[\W\d_]+$')
+
+
+def _is_text(series):
+    return (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+            or isinstance(series.dtype, pd.CategoricalDtype))
+
+
+def _sample(series, size):
+    """Evenly spaced rows, so the sample is deterministic and covers the whole column"""
+    if len(series) <= size:
+        return series
+    return series.iloc[np.linspace(0, len(series) - 1, size).astype(np.int64)]
+
+
+def _is_free_text(sample, min_words):
+    """Whether a column holds sentences rather than labels"""
+    lengths = sample.dropna().astype(str).str.count(r'\s+') + 1
+    return len(lengths) > 0 and lengths.mean() >= min_words
+
+
+def tfidf_terms(texts, top_k=20):
+    """(term, score) for the top terms of a text sample, scores scaled to a maximum of 1"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    texts = [text for text in texts if text.strip()]
+    if not texts:
+        return []
+    vectorizer = TfidfVectorizer(stop_words='english', max_features=10000, token_pattern=r'(?u)\b[a-zA-Z][a-zA-Z]+\b')
+    try:
+        matrix = vectorizer.fit_transform(texts)
+    except ValueError:
+        # Nothing but stop words
+        return []
+    scores = np.asarray(matrix.sum(axis=0)).ravel()
+    terms = vectorizer.get_feature_names_out()
+    order = np.lexsort((terms, -scores))[:top_k]
+    return [(str(terms[i]), float(scores[i] / scores[order[0]])) for i in order]
+
+
+def rank_keywords(df, max_keywords=50, top_values=10, sample_size=10000, max_unique_ratio=0.5,
+                  free_text_words=5, tfidf=False, default_keywords=()):
+    """Scored news-search keywords for a frame, best first.
+
+    Each text or categorical column contributes its ``top_values`` most
+    frequent values, ranked by their share of rows. A column is skipped
+    without counting the full column when its name looks like an identifier,
+    or when an evenly spaced sample of ``sample_size`` rows is more than
+    ``max_unique_ratio`` distinct (IDs, free text). With ``tfidf`` free-text
+    columns contribute their top TF-IDF terms from that sample instead.
+    Column names (other than identifiers), "<numeric column> trend" phrases
+    and ``default_keywords`` follow with fixed lower weights.
+
+    Time is linear in the rows of the kept columns and memory is bounded by
+    their distinct values. Returns at most ``max_keywords`` (keyword, score)
+    pairs, ordered by score and then keyword, with case-insensitive
+    duplicates dropped.
+    """
+    n_rows = len(df)
+    scores = {}
+
+    def add(keyword, score):
+        keyword = str(keyword).strip()
+        if len(keyword) < 2 or _NOT_A_WORD.match(keyword):
+            return
+        key = keyword.lower()
+        if key not in scores or score > scores[key][1]:
+            scores[key] = (keyword, score)
+
+    for column in df.columns:
+        series = df[column]
+        if not _is_text(series) or n_rows == 0:
+            continue
+        if _ID_NAME.search(str(column)):
+            continue
+        sample = _sample(series, sample_size)
+        sample_valid = sample.dropna()
+        if len(sample_valid) == 0:
+            continue
+        if _is_free_text(sample_valid, free_text_words):
+            if tfidf:
+                for term, score in tfidf_terms(sample_valid.astype(str).tolist(), top_values):
+                    add(term, KEYWORD_WEIGHTS['term'] * score)
+            continue
+        if len(sample_valid) >= 20 and sample_valid.nunique() / len(sample_valid) > max_unique_ratio:
+            continue
+        counts = series.value_counts(sort=True, dropna=True)
+        for value, count in counts.head(top_values).items():
+            add(value, KEYWORD_WEIGHTS['value'] * (0.6 + 0.4 * count / n_rows))
+
+    for column in df.columns:
+        if not _ID_NAME.search(str(column)):
+            add(column, KEYWORD_WEIGHTS['column'])
+    for column in df.select_dtypes(include=[np.number]).columns:
+        add(f"{column} trend", KEYWORD_WEIGHTS['metric'])
+    for keyword in default_keywords:
+        add(keyword, KEYWORD_WEIGHTS['default'])
+
+    ranked = sorted(scores.values(), key=lambda item: (-item[1], item[0].lower()))
+    return ranked[:max_keywords]
@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LazyResult:
+    """A computation that runs at most once, in a background thread, when first requested.
+
+    ``compute`` is called with a ``report(fraction, message='')`` callback
+    it can use to publish progress while it runs.
+    """
+
+    def __init__(self, name, compute):
+        self.name = name
+        self.compute = compute
+        self.progress = 0.0
+        self.message = ''
+        self.seconds = None
+        self._value = None
+        self._error = None
+        self._thread = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def _report(self, fraction, message=''):
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        self.message = message
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self._value = self.compute(self._report)
+            self._report(1.0)
+        except Exception as e:
+            logger.error(f"Error computing {self.name}: {str(e)}")
+            self._error = e
+        finally:
+            self.seconds = time.perf_counter() - start
+            logger.info(f"Computed {self.name} in {self.seconds:.2f}s")
+            self._done.set()
+
+    def start(self):
+        """Start the computation if it has not been started yet"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"lazy-{self.name}", daemon=True)
+                self._thread.start()
+        return self
+
+    @property
+    def started(self):
+        return self._thread is not None
+
+    def done(self):
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """Start if needed, wait for the value and return it, re-raising any error"""
+        self.start()
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{self.name} did not finish within {timeout}s")
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class LazyResults:
+    """Named LazyResults for one dataset, with their compute times"""
+
+    def __init__(self):
+        self._results = {}
+
+    def register(self, name, compute):
+        self._results[name] = LazyResult(name, compute)
+
+    def __getitem__(self, name):
+        return self._results[name]
+
+    def get(self, name):
+        """The named result, started in the background if it was not already"""
+        return self._results[name].start()
+
+    def values(self):
+        """Values of the computations that finished without error"""
+        return {name: result._value for name, result in self._results.items()
+                if result.done() and result._error is None}
+
+    def timings(self):
+        """Seconds spent on each finished computation"""
+        return {name: result.seconds for name, result in self._results.items() if result.done()}
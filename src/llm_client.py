@@ -0,0 +1,230 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """The model could not produce a response"""
+
+
+class GeminiClient:
+    """Reusable client for Gemini ``generateContent`` and ``streamGenerateContent`` calls.
+
+    Requests share one pooled keep-alive session, carry a ``(connect, read)``
+    timeout, and are retried on 429/5xx responses and connection errors with
+    full-jitter exponential backoff (honouring ``Retry-After``). Responses
+    are cached by (model, prompt hash) for ``cache_ttl`` seconds, and
+    identical prompts asked concurrently share a single in-flight request.
+    """
+
+    def __init__(self, api_key, model='gemini-2.0-flash', base_url=GEMINI_BASE_URL, timeout=(5, 60),
+                 max_retries=4, backoff=0.5, max_backoff=8.0, cache_size=256, cache_ttl=3600,
+                 pool_size=10, session=None, sleep=time.sleep, latency_window=1000):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.cache = TTLCache(cache_size, cache_ttl)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.coalesced = 0
+        self.cancelled = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.first_token_latencies = deque(maxlen=latency_window)
+
+    def url(self, method='generateContent'):
+        return f"{self.base_url}/{self.model}:{method}"
+
+    def cache_key(self, prompt):
+        return (self.model, hashlib.sha256(prompt.encode('utf-8')).hexdigest())
+
+    def generate(self, prompt):
+        """Response text for a prompt, from the cache, a shared in-flight call or the API"""
+        key = self.cache_key(prompt)
+        text = self.cache.get(key)
+        if text is not None:
+            return text
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            text = self._request(prompt)
+            self.cache.set(key, text)
+            future.set_result(text)
+            return text
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _post(self, method, payload, params=None, stream=False):
+        """POST to the model, retrying transient failures, and return the successful response"""
+        params = {'key': self.api_key, **(params or {})}
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                self.requests += 1
+                response = self.session.post(self.url(method), params=params, json=payload,
+                                             timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = LLMError(f"Request failed: {str(e)}")
+            else:
+                if response.status_code == 200:
+                    return response
+                error = LLMError(f"API Error: {response.status_code} - {response.text[:500]}")
+                response.close()
+                if response.status_code not in RETRY_STATUSES:
+                    self.errors += 1
+                    raise error
+                retry_after = response.headers.get('Retry-After')
+
+            if attempt == self.max_retries:
+                self.errors += 1
+                raise error
+            self.retries += 1
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            if retry_after is not None and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            logger.warning(f"{error}; retrying in {delay:.2f}s")
+            self.sleep(delay)
+
+    def _request(self, prompt):
+        start = time.perf_counter()
+        response = self._post('generateContent', self._payload(prompt))
+        try:
+            result = response.json()
+        except ValueError as e:
+            self.errors += 1
+            raise LLMError(f"Unexpected response format: {str(e)}")
+        text = self._parse(result)
+        self.latencies.append(time.perf_counter() - start)
+        return text
+
+    def _payload(self, prompt):
+        return {"contents": [{"parts": [{"text": prompt}]}]}
+
+    def stream(self, prompt, cancel=None):
+        """Yield the response to a prompt in chunks as the model produces them.
+
+        Uses ``streamGenerateContent`` with server-sent events. Setting the
+        ``cancel`` event, or closing the generator, stops reading and drops
+        the connection; only non-empty responses the model finished
+        (``finishReason`` STOP) are cached. A cached response is yielded as
+        a single chunk.
+        """
+        key = self.cache_key(prompt)
+        text = self.cache.get(key)
+        if text is not None:
+            yield text
+            return
+
+        start = time.perf_counter()
+        response = self._post('streamGenerateContent', self._payload(prompt), params={'alt': 'sse'}, stream=True)
+        parts = []
+        usage = {}
+        finish_reason = None
+        try:
+            for line in response.iter_lines():
+                if cancel is not None and cancel.is_set():
+                    self.cancelled += 1
+                    logger.info(f"Stream cancelled after {len(parts)} chunks")
+                    return
+                if not line.startswith(b'data:'):
+                    continue
+                event = json.loads(line[5:].decode('utf-8'))
+                # Every event carries the running token totals, so only the last one counts
+                usage = event.get('usageMetadata', usage)
+                candidate = (event.get('candidates') or [{}])[0]
+                finish_reason = candidate.get('finishReason', finish_reason)
+                chunk = ''.join(part.get('text', '') for part in candidate.get('content', {}).get('parts', []))
+                if not chunk:
+                    continue
+                if not parts:
+                    self.first_token_latencies.append(time.perf_counter() - start)
+                parts.append(chunk)
+                yield chunk
+        except requests.RequestException as e:
+            self.errors += 1
+            raise LLMError(f"Stream interrupted: {str(e)}")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self.errors += 1
+            raise LLMError(f"Unexpected stream event: {str(e)}")
+        finally:
+            response.close()
+            self._count_usage(usage)
+        self.latencies.append(time.perf_counter() - start)
+        if parts and finish_reason == 'STOP':
+            self.cache.set(key, ''.join(parts))
+        else:
+            logger.warning(f"Not caching stream that ended with {len(parts)} chunks and reason {finish_reason}")
+
+    def _count_usage(self, usage):
+        self.prompt_tokens += usage.get('promptTokenCount', 0)
+        self.response_tokens += usage.get('candidatesTokenCount', 0)
+
+    def _parse(self, result):
+        self._count_usage(result.get('usageMetadata', {}))
+        try:
+            return result['candidates'][0]['content']['parts'][0]['text']
+        except (KeyError, IndexError) as e:
+            self.errors += 1
+            raise LLMError(f"Unexpected response format: {str(e)}")
+
+    def stats(self):
+        latencies = np.array(self.latencies)
+        first_token = np.array(self.first_token_latencies)
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'errors': self.errors,
+            'coalesced': self.coalesced,
+            'cancelled': self.cancelled,
+            'cache': self.cache.stats(),
+            'prompt_tokens': self.prompt_tokens,
+            'response_tokens': self.response_tokens,
+            'latency_p50': float(np.percentile(latencies, 50)) if len(latencies) else None,
+            'latency_p95': float(np.percentile(latencies, 95)) if len(latencies) else None,
+            'first_token_p50': float(np.percentile(first_token, 50)) if len(first_token) else None,
+            'first_token_p95': float(np.percentile(first_token, 95)) if len(first_token) else None
+        }
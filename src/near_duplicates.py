@@ -0,0 +1,114 @@
+import re
+import threading
+import zlib
+
+import numpy as np
+
+_WORD = re.compile(r'\w+')
+_MIX = np.uint64(1000003)
+_SHIFT = np.uint64(32)
+# Signature value of texts without words; permuted hashes are below 2**32
+_EMPTY = np.uint64(2 ** 64 - 1)
+_MASK = np.uint64(0xFFFFFFFF)
+
+
+def shingle_hashes(text, size=3):
+    """Distinct 32-bit hashes of the lowercased ``size``-word shingles of a text"""
+    words = _WORD.findall(str(text).lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words))
+    if len(hashes) < size:
+        size = len(hashes)
+    shingles = hashes[:len(hashes) - size + 1].copy()
+    for offset in range(1, size):
+        shingles = ((shingles * _MIX) & _MASK) ^ hashes[offset:len(hashes) - size + 1 + offset]
+    return np.unique(shingles)
+
+
+def minhash_signatures(texts, num_perm=128, shingle_size=3, seed=1):
+    """(len(texts), num_perm) MinHash signatures; texts without words get rows of _EMPTY.
+
+    Each permutation is a multiply-shift hash, the high 32 bits of
+    ``a * h + b`` modulo 2**64 for a random odd ``a``, which numpy computes
+    with wrapping integer arithmetic and no division.
+    """
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)[:, None]
+    signatures = np.full((len(texts), num_perm), _EMPTY, dtype=np.uint64)
+    for i, text in enumerate(texts):
+        shingles = shingle_hashes(text, shingle_size)
+        if len(shingles):
+            signatures[i] = ((a * shingles + b) >> _SHIFT).min(axis=1)
+    return signatures
+
+
+def cluster_near_duplicates(texts, threshold=0.8, num_perm=128, bands=32, shingle_size=3, seed=1):
+    """Cluster label of each text: the index of the first text of its near-duplicate cluster.
+
+    Texts whose estimated Jaccard similarity of word shingles reaches
+    ``threshold`` end up in the same cluster. Candidates come from LSH: the
+    signatures are cut into ``bands`` bands and only texts sharing a band
+    are compared, so the cost grows with the number of texts rather than
+    with the number of pairs. Texts without words are never clustered.
+    """
+    labels = list(range(len(texts)))
+    if len(texts) < 2:
+        return labels
+    signatures = minhash_signatures(texts, num_perm, shingle_size, seed)
+    rows = num_perm // bands
+
+    def find(i):
+        while labels[i] != i:
+            labels[i] = labels[labels[i]]
+            i = labels[i]
+        return i
+
+    # Each bucket keeps one member per cluster that reached it, so big clusters stay cheap
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        if signature[0] == _EMPTY:
+            continue
+        for band in range(bands):
+            members = buckets.setdefault((band, signature[band * rows:(band + 1) * rows].tobytes()), [])
+            root = find(i)
+            for j in members:
+                other = find(j)
+                if other == root:
+                    break
+                if np.mean(signatures[j] == signature) >= threshold:
+                    # The smaller index becomes the root, so labels point at the first member
+                    labels[max(root, other)] = min(root, other)
+                    break
+            else:
+                members.append(i)
+    return [find(i) for i in range(len(texts))]
+
+
+class DuplicateFilter:
+    """Incremental check of whether a text near-duplicates one seen before.
+
+    Each new signature is compared with every remembered one, so this suits
+    streams of tens of texts, such as articles arriving from one news
+    search, rather than whole corpora (use cluster_near_duplicates there).
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=3, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self._signatures = []
+        self._lock = threading.Lock()
+
+    def add(self, text):
+        """Whether ``text`` is new, remembering it if so; texts without words are always new"""
+        signature = minhash_signatures([text], self.num_perm, self.shingle_size, self.seed)[0]
+        if signature[0] == _EMPTY:
+            return True
+        with self._lock:
+            if any(np.mean(seen == signature) >= self.threshold for seen in self._signatures):
+                return False
+            self._signatures.append(signature)
+            return True
@@ -1,29 +1,79 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
-from googlesearch import search
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
 import warnings
 import logging
+
+from .article_store import ArticleStore
+from .cache import SQLiteCache, TieredCache, TTLCache
+from .keywords import rank_keywords
+from .near_duplicates import DuplicateFilter, cluster_near_duplicates
+from .news_fetcher import ArticleFetcher
 warnings.filterwarnings('ignore')
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Download required NLTK data
-try:
-    nltk.data.find('vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
+SENTIMENT_COLUMNS = ['compound', 'pos', 'neg', 'neu']
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+_worker_sia = None
+
+def split_sentences(text):
+    """Split text into sentences on terminal punctuation"""
+    return [sentence for sentence in _SENTENCE_BOUNDARY.split(str(text)) if sentence.strip()]
+
+def load_sentiment_analyzer():
+    """VADER SentimentIntensityAnalyzer, downloading the lexicon if it is missing.
+
+    nltk is imported here rather than at module level so that importing
+    this module stays cheap until sentiment is first scored.
+    """
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon')
+    return SentimentIntensityAnalyzer()
+
+def google_search(query, num_results):
+    """Result URLs from Google search, importing googlesearch on first use"""
+    from googlesearch import search
+    return search(query, num_results=num_results)
+
+def _init_sentiment_worker():
+    global _worker_sia
+    _worker_sia = load_sentiment_analyzer()
+
+def _score_sentences(sentences, sia=None):
+    """VADER scores for a list of sentences as an (n, 4) array"""
+    sia = sia or _worker_sia
+    scores = [sia.polarity_scores(sentence) for sentence in sentences]
+    return np.array([[score[col] for col in SENTIMENT_COLUMNS] for score in scores], dtype=float).reshape(-1, 4)
 
 class NewsAnalyzer:
-    def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+    def __init__(self, search_fn=None, fetcher=None, cache_size=1024, cache_ttl=3600, cache_path=None,
+                 sentiment_workers=None, duplicate_threshold=0.8, query_ttl=300):
+        self._sia = None
+        self._sia_lock = threading.Lock()
+        self.sentiment_workers = sentiment_workers
+        self.search_fn = search_fn or google_search
+        self.fetcher = fetcher or ArticleFetcher()
+        # Query -> URL list, and URL -> parsed and scored article, optionally persisted to SQLite.
+        # Searches expire well before articles, so a refresh finds new URLs while the
+        # articles it already has are still served from the store.
+        self.query_cache = TieredCache(
+            TTLCache(cache_size, query_ttl),
+            SQLiteCache(cache_path, query_ttl, table='queries') if cache_path else None
+        )
+        self.article_store = ArticleStore(cache_path or ':memory:', cache_ttl)
+        # Shingle similarity at which syndicated copies of a story count as one article
+        self.duplicate_threshold = duplicate_threshold
         # Default industry keywords
         self.default_keywords = {
             'finance': ['stock market', 'cryptocurrency', 'banking', 'investment', 'fintech'],
@@ -31,137 +81,224 @@ class NewsAnalyzer:
             'real_estate': ['property market', 'real estate trends', 'housing market', 'commercial property', 'real estate investment']
         }
         
-    def extract_keywords(self, df):
-        """Extract relevant keywords from the dataset and combine with default industry keywords"""
+    @property
+    def sia(self):
+        """Sentiment analyzer, loaded with its lexicon on first use"""
+        with self._sia_lock:
+            if self._sia is None:
+                self._sia = load_sentiment_analyzer()
+            return self._sia
+
+    def extract_keywords(self, df, max_keywords=50, tfidf=False):
+        """Ranked keywords from the dataset, followed by all default industry keywords.
+
+        See keywords.rank_keywords; the most frequent category values come
+        first, so search_news searches the most representative ones. At most
+        ``max_keywords`` come from the dataset; the defaults do not count
+        towards it, and those repeating a dataset keyword are left out.
+        """
         try:
-            keywords = []
-            
-            # Add default industry keywords
-            for industry_keywords in self.default_keywords.values():
-                keywords.extend(industry_keywords)
-            
-            # Get column names as keywords
-            keywords.extend(df.columns.tolist())
-            
-            # Get unique values from categorical columns
-            categorical_cols = df.select_dtypes(include=['object']).columns
-            for col in categorical_cols:
-                try:
-                    unique_values = df[col].unique()
-                    # Convert all values to strings and filter out None/NaN
-                    keywords.extend([str(val) for val in unique_values if pd.notna(val)])
-                except Exception as e:
-                    logger.warning(f"Error processing column {col}: {str(e)}")
-                    continue
-                
-            # Get statistical keywords from numeric columns
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            for col in numeric_cols:
-                keywords.extend([
-                    f"{col} trend",
-                    f"{col} analysis",
-                    f"{col} forecast"
-                ])
-                
-            # Clean and filter keywords
-            keywords = [k for k in keywords if isinstance(k, str) and len(k.strip()) > 0]
-            return list(set(keywords))  # Remove duplicates
-            
+            keywords = [keyword for keyword, _ in self.rank_keywords(df, max_keywords, tfidf)]
         except Exception as e:
             logger.error(f"Error in extract_keywords: {str(e)}")
             return []
+        seen = {keyword.lower() for keyword in keywords}
+        for industry_keywords in self.default_keywords.values():
+            for keyword in industry_keywords:
+                if keyword.lower() not in seen:
+                    seen.add(keyword.lower())
+                    keywords.append(keyword)
+        return keywords
+
+    def rank_keywords(self, df, max_keywords=50, tfidf=False):
+        """(keyword, score) pairs for the dataset, best first"""
+        return rank_keywords(df, max_keywords=max_keywords, tfidf=tfidf)
     
-    def search_news(self, keywords, num_articles=3):
-        """Search for news articles related to the keywords"""
-        articles = []
-        
-        for keyword in keywords[:5]:  # Limit to first 5 keywords to avoid too many requests
-            try:
-                # Search Google News
-                search_query = f"{keyword} news {datetime.now().year}"
-                search_results = search(search_query, num_results=num_articles)
-                
-                for url in search_results:
-                    try:
-                        article = Article(url)
-                        article.download()
-                        article.parse()
-                        article.nlp()  # This will extract keywords, summary, etc.
-                        
-                        articles.append({
-                            'title': str(article.title) if article.title else '',
-                            'text': str(article.text) if article.text else '',
-                            'summary': str(article.summary) if article.summary else '',
-                            'keywords': list(article.keywords) if article.keywords else [],
-                            'url': str(url),
-                            'published_date': article.publish_date,
-                            'source': str(url.split('/')[2]) if len(url.split('/')) > 2 else url
-                        })
-                    except Exception as e:
-                        logger.warning(f"Error processing article {url}: {str(e)}")
-                        continue
-                        
-            except Exception as e:
-                logger.warning(f"Error searching for keyword {keyword}: {str(e)}")
-                continue
-                
-        return pd.DataFrame(articles) if articles else pd.DataFrame()
+    def _search_keyword(self, keyword, num_articles):
+        """Return the result URLs for one keyword, or [] if the search fails"""
+        search_query = f"{keyword} news {datetime.now().year}"
+        urls = self.query_cache.get((search_query, num_articles))
+        if urls is not None:
+            return urls
+        try:
+            # Search Google News
+            urls = list(self.search_fn(search_query, num_results=num_articles))
+        except Exception as e:
+            logger.warning(f"Error searching for keyword {keyword}: {str(e)}")
+            return []
+        self.query_cache.set((search_query, num_articles), urls)
+        return urls
+
+    def search_news(self, keywords, num_articles=3, on_article=None, cancel=None):
+        """Search for news articles related to the keywords.
+
+        ``on_article`` is called with each article as it becomes available,
+        stored ones first. Setting the ``cancel`` event stops the search and
+        returns whatever articles were fetched by then.
+        """
+        return self.refresh_news(keywords, num_articles, on_article, cancel)[0]
+
+    def refresh_news(self, keywords, num_articles=3, on_article=None, cancel=None):
+        """search_news plus {'new', 'cached', 'duplicates'} counts of distinct articles.
+
+        Only URLs missing from the article store, or stored longer ago than
+        its TTL, are downloaded and parsed; the rest come from the store
+        with their sentiment scores. Near-duplicate articles, such as one
+        wire story syndicated across sites, are then clustered (see
+        near_duplicates) and only one representative per cluster goes
+        through NLP and sentiment scoring, preferring one already stored.
+        The other copies take over its summary and scores and are left out
+        of the result, whose rows carry a 'cluster_size' column.
+        """
+        counts = {'new': 0, 'cached': 0, 'duplicates': 0}
+        keywords = keywords[:5]  # Limit to first 5 keywords to avoid too many requests
+        if not keywords:
+            return pd.DataFrame(), counts
+
+        # Searches all hit the same host, so they share its connection limit
+        with ThreadPoolExecutor(min(len(keywords), self.fetcher.max_per_host)) as pool:
+            url_lists = list(pool.map(lambda keyword: self._search_keyword(keyword, num_articles), keywords))
+        if cancel is not None and cancel.is_set():
+            return pd.DataFrame(), counts
+
+        # Each distinct URL is fetched once, then rows keep the search order
+        urls = [url for url_list in url_lists for url in url_list]
+        fetched = self.article_store.get_many(urls)
+        if on_article is not None:
+            for article in fetched.values():
+                on_article(article)
+        new_articles = self.fetcher.fetch_all([url for url in dict.fromkeys(urls) if url not in fetched],
+                                              on_article=on_article, cancel=cancel, nlp=False)
+
+        # Stored articles come first so they represent their clusters
+        distinct = [url for url in dict.fromkeys(urls) if url in fetched] + list(new_articles)
+        fetched.update(new_articles)
+        if self.duplicate_threshold is None:
+            labels = list(range(len(distinct)))
+        else:
+            labels = cluster_near_duplicates([fetched[url]['text'] for url in distinct], self.duplicate_threshold)
+        representative = {url: distinct[label] for url, label in zip(distinct, labels)}
+
+        new_representatives = [article for url, article in new_articles.items() if representative[url] == url]
+        if new_representatives:
+            self.fetcher.summarize(new_representatives)
+            scored = self.analyze_sentiment(pd.DataFrame(new_representatives)).to_dict('records')
+            fetched.update((article['url'], article) for article in scored)
+        for url in new_articles:
+            if representative[url] != url:
+                source = fetched[representative[url]]
+                fetched[url] = dict(fetched[url], summary=source['summary'], keywords=source['keywords'],
+                                    **{col: source[col] for col in SENTIMENT_COLUMNS})
+        self.article_store.put_many([fetched[url] for url in new_articles])
+
+        cluster_sizes = Counter(representative.values())
+        articles = [dict(fetched[url], cluster_size=cluster_sizes[url])
+                    for url in urls if representative.get(url) == url]
+        counts = {'new': len(new_articles), 'cached': len(distinct) - len(new_articles),
+                  'duplicates': len(distinct) - len(cluster_sizes)}
+
+        return (pd.DataFrame(articles) if articles else pd.DataFrame()), counts
+    
+    def cache_stats(self):
+        """Hit/miss counters for the query and article caches"""
+        return {
+            'queries': self.query_cache.stats(),
+            'articles': self.article_store.stats()
+        }
     
-    def analyze_sentiment(self, articles_df):
+    def score_sentiment_batch(self, texts, workers=None, chunk_size=500):
+        """Score many texts at once, returning compound/pos/neg/neu columns.
+
+        Each text is split into sentences and its scores are the mean of its
+        sentence scores. With ``workers`` > 1 the sentences are scored in
+        chunks across a process pool. Texts without any sentence score as
+        fully neutral.
+        """
+        texts = list(texts)
+        sentences = []
+        owners = []
+        for i, text in enumerate(texts):
+            text_sentences = split_sentences(text)
+            sentences.extend(text_sentences)
+            owners.extend([i] * len(text_sentences))
+
+        workers = workers if workers is not None else self.sentiment_workers
+        if workers and workers > 1 and len(sentences) > chunk_size:
+            chunks = [sentences[i:i + chunk_size] for i in range(0, len(sentences), chunk_size)]
+            with ProcessPoolExecutor(workers, initializer=_init_sentiment_worker) as pool:
+                sentence_scores = np.vstack(list(pool.map(_score_sentences, chunks)))
+        else:
+            sentence_scores = _score_sentences(sentences, self.sia)
+
+        # Average sentence scores per text with one bincount per column
+        owners = np.asarray(owners, dtype=np.int64)
+        counts = np.bincount(owners, minlength=len(texts))
+        totals = np.column_stack([
+            np.bincount(owners, weights=sentence_scores[:, j], minlength=len(texts)) for j in range(4)
+        ])
+        means = np.divide(totals, counts[:, None], out=np.zeros_like(totals), where=counts[:, None] > 0)
+        means[counts == 0, SENTIMENT_COLUMNS.index('neu')] = 1.0
+        return pd.DataFrame(means, columns=SENTIMENT_COLUMNS)
+
+    def analyze_sentiment(self, articles_df, workers=None):
         """Analyze sentiment of news articles"""
         if articles_df is None or len(articles_df) == 0:
             return pd.DataFrame()
-            
-        sentiments = []
-        for text in articles_df['text']:
-            try:
-                sentiment = self.sia.polarity_scores(str(text))
-                sentiments.append({
-                    'compound': float(sentiment['compound']),
-                    'positive': float(sentiment['pos']),
-                    'negative': float(sentiment['neg']),
-                    'neutral': float(sentiment['neu'])
-                })
-            except Exception as e:
-                logger.warning(f"Error analyzing sentiment: {str(e)}")
-                sentiments.append({
-                    'compound': 0.0,
-                    'positive': 0.0,
-                    'negative': 0.0,
-                    'neutral': 1.0
-                })
-            
-        articles_df['sentiment'] = sentiments
+        
+        scores = self.score_sentiment_batch(articles_df['text'].fillna(''), workers)
+        for col in SENTIMENT_COLUMNS:
+            articles_df[col] = scores[col].to_numpy()
         return articles_df
     
     def get_impact_analysis(self, articles_df):
         """Analyze the potential impact of news on the dataset"""
         if articles_df is None or len(articles_df) == 0:
             return pd.DataFrame()
-            
-        impact_analysis = []
-        for _, article in articles_df.iterrows():
-            try:
-                sentiment = article['sentiment']
-                impact = {
-                    'title': str(article['title']),
-                    'summary': str(article['summary']),
-                    'sentiment': 'Positive' if sentiment['compound'] > 0.2 else 
-                                'Negative' if sentiment['compound'] < -0.2 else 
-                                'Neutral',
-                    'confidence': float(abs(sentiment['compound'])),
-                    'source': str(article['source']),
-                    'url': str(article['url'])
-                }
-                impact_analysis.append(impact)
-            except Exception as e:
-                logger.warning(f"Error processing impact analysis: {str(e)}")
-                continue
-            
-        return pd.DataFrame(impact_analysis) if impact_analysis else pd.DataFrame()
+        
+        if 'compound' in articles_df.columns:
+            compound = articles_df['compound'].to_numpy(dtype=float)
+        else:
+            # Older frames carry a dict of scores per row in a 'sentiment' column
+            compound = np.array([sentiment['compound'] for sentiment in articles_df['sentiment']], dtype=float)
+        
+        return pd.DataFrame({
+            'title': articles_df['title'].astype(str).to_numpy(),
+            'summary': articles_df['summary'].astype(str).to_numpy(),
+            'sentiment': np.select([compound > 0.2, compound < -0.2], ['Positive', 'Negative'], 'Neutral'),
+            'confidence': np.abs(compound),
+            'source': articles_df['source'].astype(str).to_numpy(),
+            'url': articles_df['url'].astype(str).to_numpy(),
+            # Number of sites carrying the same story; 1 when duplicates were not clustered
+            'cluster_size': (articles_df['cluster_size'].to_numpy(dtype=int) if 'cluster_size' in articles_df.columns
+                             else np.ones(len(articles_df), dtype=int))
+        })
     
-    def analyze_news_for_dataset(self, df):
-        """Main function to analyze news for a given dataset"""
+    def analyze_news_for_dataset(self, df, on_impact=None, cancel=None):
+        """Main function to analyze news for a given dataset.
+
+        ``on_impact`` is called with a preview impact row (a dict) of each
+        article as soon as it is fetched, for showing results while the rest
+        are still downloading. Copies of a story already previewed are
+        skipped, and new articles are previewed with a 'Pending' sentiment
+        since they are only scored once duplicates are merged. ``cancel`` is
+        a threading.Event that stops the analysis early. The result's
+        'counts' say how many articles were fetched anew, how many came from
+        the article store and how many were merged as duplicates.
+        """
+        previewed = DuplicateFilter(self.duplicate_threshold) if self.duplicate_threshold is not None else None
+
+        def preview(article):
+            if previewed is not None and not previewed.add(article['text']):
+                return
+            # Summaries are extracted once duplicates are merged; preview the opening text until then
+            summary = article.get('summary') or article['text'][:300]
+            if 'compound' in article:
+                on_impact(self.get_impact_analysis(pd.DataFrame([dict(article, summary=summary)])).iloc[0].to_dict())
+            else:
+                on_impact({'title': article['title'], 'summary': summary, 'sentiment': 'Pending',
+                           'confidence': 0.0, 'source': article['source'], 'url': article['url'], 'cluster_size': 1})
+
+        counts = {'new': 0, 'cached': 0, 'duplicates': 0}
         try:
             # Extract keywords from dataset
             keywords = self.extract_keywords(df)
@@ -170,29 +307,33 @@ class NewsAnalyzer:
                 return {
                     'news': pd.DataFrame(),
                     'impact': pd.DataFrame(),
-                    'keywords': []
+                    'keywords': [],
+                    'counts': counts
                 }
             
-            # Search for relevant news
-            news_df = self.search_news(keywords)
+            # Search for relevant news; stored articles come with their sentiment scores
+            news_df, counts = self.refresh_news(keywords, on_article=preview if on_impact else None,
+                                                cancel=cancel)
+            if cancel is not None and cancel.is_set():
+                logger.info("News analysis cancelled")
+                news_df = pd.DataFrame()
             if news_df.empty:
                 logger.warning("No news articles found")
                 return {
                     'news': pd.DataFrame(),
                     'impact': pd.DataFrame(),
-                    'keywords': keywords
+                    'keywords': keywords,
+                    'counts': counts
                 }
             
-            # Analyze sentiment
-            news_df = self.analyze_sentiment(news_df)
-            
             # Get impact analysis
             impact_df = self.get_impact_analysis(news_df)
             
             return {
                 'news': news_df,
                 'impact': impact_df,
-                'keywords': keywords
+                'keywords': keywords,
+                'counts': counts
             }
             
         except Exception as e:
@@ -200,5 +341,6 @@ class NewsAnalyzer:
             return {
                 'news': pd.DataFrame(),
                 'impact': pd.DataFrame(),
-                'keywords': []
+                'keywords': [],
+                'counts': counts
             } 
\ No newline at end of file
@@ -0,0 +1,154 @@
+import threading
+import logging
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleFetcher:
+    """Bounded-concurrency download and parse pipeline for news articles.
+
+    Downloads run on a thread pool of ``max_workers`` with at most
+    ``max_per_host`` requests in flight per host and a ``timeout`` on every
+    request. Each finished download is handed straight to a separate parse
+    pool, so newspaper parsing and NLP overlap with the remaining downloads.
+    """
+
+    def __init__(self, max_workers=8, max_per_host=2, parse_workers=4, timeout=10, nlp=True, session=None):
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.parse_workers = parse_workers
+        self.timeout = timeout
+        self.nlp = nlp
+        self.session = session or requests.Session()
+        self.session.headers.setdefault('User-Agent', 'Mozilla/5.0 (compatible; NewsAnalyzer)')
+        self._host_limits = {}
+        self._host_lock = threading.Lock()
+
+    def _host_limit(self, url):
+        """Semaphore shared by all requests to the URL's host"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def download(self, url):
+        """Fetch the raw HTML of a URL"""
+        with self._host_limit(url):
+            response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def parse(self, url, html, nlp=None):
+        """Parse downloaded HTML into the article dict used by NewsAnalyzer.
+
+        ``nlp`` overrides the fetcher's setting for whether keywords and a
+        summary are extracted too; without them both are left empty.
+        """
+        from newspaper import Article
+        article = Article(url)
+        article.download(input_html=html)
+        article.parse()
+        if nlp is None:
+            nlp = self.nlp
+        if nlp:
+            article.nlp()  # This will extract keywords, summary, etc.
+
+        return {
+            'title': str(article.title) if article.title else '',
+            'text': str(article.text) if article.text else '',
+            'summary': str(article.summary) if article.summary else '',
+            'keywords': list(article.keywords) if article.keywords else [],
+            'url': str(url),
+            'published_date': article.publish_date,
+            'source': str(url.split('/')[2]) if len(url.split('/')) > 2 else url
+        }
+
+    def summarize(self, articles):
+        """Extract keywords and summaries for articles parsed with nlp=False, as Article.nlp() does.
+
+        Runs on a pool of ``parse_workers`` threads and updates the article
+        dicts in place; does nothing when the fetcher's ``nlp`` is off.
+        """
+        if self.nlp and articles:
+            with ThreadPoolExecutor(min(self.parse_workers, len(articles))) as pool:
+                list(pool.map(_summarize, articles))
+        return articles
+
+    def _download_and_queue(self, url, parse_pool, on_article=None, nlp=None):
+        html = self.download(url)
+        future = parse_pool.submit(self.parse, url, html, nlp)
+        if on_article is not None:
+            future.add_done_callback(lambda parsed: _notify(on_article, url, parsed))
+        return future
+
+    def fetch_all(self, urls, on_article=None, cancel=None, nlp=None):
+        """Fetch and parse URLs concurrently, returning {url: article dict}.
+
+        URLs that fail to download or parse are logged and left out.
+        ``on_article`` is called with each article as soon as it is parsed,
+        in completion order. Once the ``cancel`` event is set, queued
+        downloads are dropped and the articles finished so far are returned
+        without waiting for the ones in flight. ``nlp`` is passed to parse.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+
+        parse_pool = ThreadPoolExecutor(self.parse_workers)
+        download_pool = ThreadPoolExecutor(min(self.max_workers, len(urls)))
+        try:
+            downloads = {url: download_pool.submit(self._download_and_queue, url, parse_pool, on_article, nlp)
+                         for url in urls}
+
+            articles = {}
+            for url, download in downloads.items():
+                try:
+                    articles[url] = _result(_result(download, cancel), cancel)
+                except CancelledError:
+                    break
+                except Exception as e:
+                    logger.warning(f"Error processing article {url}: {str(e)}")
+            return articles
+        finally:
+            stop = cancel is not None and cancel.is_set()
+            download_pool.shutdown(wait=not stop, cancel_futures=stop)
+            parse_pool.shutdown(wait=not stop, cancel_futures=stop)
+
+
+def _summarize(article):
+    from newspaper import nlp
+    from newspaper.configuration import Configuration
+    config = Configuration()
+    try:
+        nlp.load_stopwords(config.get_language())
+        keywords = set(nlp.keywords(article['text'])) | set(nlp.keywords(article['title']))
+        summary = nlp.summarize(title=article['title'], text=article['text'], max_sents=config.MAX_SUMMARY_SENT)
+    except Exception as e:
+        logger.warning(f"Error summarizing article {article['url']}: {str(e)}")
+        return article
+    article['keywords'] = list(keywords)
+    article['summary'] = '\n'.join(summary)
+    return article
+
+
+def _notify(on_article, url, parsed):
+    if not parsed.cancelled() and parsed.exception() is None:
+        try:
+            on_article(parsed.result())
+        except Exception as e:
+            logger.warning(f"Article callback failed for {url}: {str(e)}")
+
+
+def _result(future, cancel, poll=0.1):
+    """future.result(), raising CancelledError once the ``cancel`` event is set"""
+    if cancel is None:
+        return future.result()
+    while not wait([future], timeout=poll).done:
+        if cancel.is_set():
+            raise CancelledError()
+    return future.result()
@@ -0,0 +1,234 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from .correlation import CorrelationEngine
+from .data_analysis import DataAnalyzer as SearchAnalyzer
+from .data_analyzer import DataAnalyzer
+from .dataset_stats import compute_stats
+from .lazy_results import LazyResults
+from .query_engine import QueryEngine
+from .search_index import file_hash
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessedDataset:
+    """Everything the dashboard derives from one uploaded file.
+
+    Only loading and cleaning happen up front. The summaries, correlations,
+    row search index, query engine and prompt statistics are LazyResults,
+    each computed in the background the first time it is asked for and kept
+    with the dataset afterwards; process_upload starts the statistics (and
+    so the correlations) as soon as the file is loaded.
+    """
+
+    def __init__(self, name, source_hash, df, report=None, build_seconds=0.0):
+        self.name = name
+        self.source_hash = source_hash
+        self.df = df
+        self.report = report
+        self.load_seconds = build_seconds
+        self._frame_bytes = int(df.memory_usage(deep=True).sum())
+        self.results = LazyResults()
+        self.results.register('summary', self._summarize)
+        self.results.register('correlation', self._correlate)
+        self.results.register('search', self._build_search)
+        self.results.register('query', self._build_query_engine)
+        self.results.register('stats', self._compute_stats)
+
+    # Each result records its own size so the cache budget never recomputes it
+    def _summarize(self, report):
+        describe = self.df.describe()
+        return {'describe': describe, 'dtypes': self.df.dtypes, 'nbytes': int(describe.memory_usage(deep=True).sum())}
+
+    def _correlate(self, report):
+        engine = CorrelationEngine()
+        engine.update(self.df, lambda fraction: report(fraction, 'Correlating columns'))
+        if len(engine.columns) < 2:
+            return {'matrix': None, 'strongest_pairs': None, 'nbytes': 0}
+        matrix = engine.matrix()
+        return {'matrix': matrix, 'strongest_pairs': engine.top_pairs(), 'nbytes': int(matrix.memory_usage().sum())}
+
+    def _build_search(self, report):
+        report(0.0, 'Indexing rows for search')
+        search = SearchAnalyzer()
+        search.index_frame(self.df, self.name, self.source_hash)
+        nbytes = search.index.nbytes + sum(len(text) for text in search.document_texts)
+        return {'analyzer': search, 'nbytes': nbytes}
+
+    def _build_query_engine(self, report):
+        report(0.0, 'Reading column values')
+        engine = QueryEngine(self.df)
+        return {'engine': engine, 'nbytes': sum(len(key) for key in engine.values)}
+
+    def _compute_stats(self, report):
+        try:
+            correlations = self.results.get('correlation').result()['strongest_pairs']
+        except Exception as e:
+            # The prompt is still worth sending without the strongest correlations
+            logger.warning(f"Summarizing without correlations: {str(e)}")
+            correlations = None
+        report(0.5, 'Summarizing columns for the prompt')
+        stats = compute_stats(self.df, correlations)
+        return {'stats': stats, 'nbytes': len(stats.text(token_budget=float('inf')))}
+
+    @property
+    def describe(self):
+        return self.results.get('summary').result()['describe']
+
+    @property
+    def dtypes(self):
+        return self.results.get('summary').result()['dtypes']
+
+    @property
+    def correlation(self):
+        return self.results.get('correlation').result()['matrix']
+
+    @property
+    def strongest_pairs(self):
+        return self.results.get('correlation').result()['strongest_pairs']
+
+    @property
+    def search(self):
+        """Search analyzer over the cleaned rows, built on first access"""
+        return self.results.get('search').result()['analyzer']
+
+    @property
+    def query_engine(self):
+        """QueryEngine answering aggregate questions over the cleaned rows"""
+        return self.results.get('query').result()['engine']
+
+    @property
+    def stats(self):
+        """DatasetStats summarizing the cleaned rows for prompts"""
+        return self.results.get('stats').result()['stats']
+
+    @property
+    def build_seconds(self):
+        """Time spent loading the file plus every lazy result computed so far"""
+        return self.load_seconds + sum(self.results.timings().values())
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the frame and the results computed so far"""
+        return self._frame_bytes + sum(value['nbytes'] for value in self.results.values().values())
+
+
+def process_upload(uploaded_file, source_hash=None, chunksize=None):
+    """Load, clean and summarize an uploaded CSV or Excel file"""
+    start = time.perf_counter()
+    analyzer = DataAnalyzer(chunksize=chunksize)
+    df = analyzer.load_data(uploaded_file)
+    if df is None:
+        return None
+    df = analyzer.clean_data(df)
+    dataset = ProcessedDataset(uploaded_file.name, source_hash or file_hash(uploaded_file), df,
+                               analyzer.cleaning_report, time.perf_counter() - start)
+    dataset.results.get('stats')
+    return dataset
+
+
+class ProcessingCache:
+    """Memory-budgeted LRU cache of processed uploads shared by all sessions.
+
+    Entries are keyed by the file's content hash and the processing options,
+    so a rerun with the same file skips loading and cleaning and reuses
+    every lazy result computed so far. ``seconds_saved`` adds up the build
+    time of every entry served from the cache. Entries are evicted least recently used first once their
+    combined ``nbytes`` exceeds ``max_bytes``; the newest entry is always
+    kept.
+    """
+
+    def __init__(self, max_bytes=2 * 1024 ** 3, processor=process_upload):
+        self.max_bytes = max_bytes
+        self.processor = processor
+        self._entries = OrderedDict()
+        self._hashes = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.seconds_saved = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def source_hash(self, uploaded_file):
+        """Content hash of an upload, memoized by Streamlit's per-upload file_id"""
+        file_id = getattr(uploaded_file, 'file_id', None)
+        with self._lock:
+            if file_id is not None and file_id in self._hashes:
+                self._hashes.move_to_end(file_id)
+                return self._hashes[file_id]
+        source_hash = file_hash(uploaded_file)
+        if file_id is not None:
+            with self._lock:
+                self._hashes[file_id] = source_hash
+                while len(self._hashes) > 1024:
+                    self._hashes.popitem(last=False)
+        return source_hash
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.seconds_saved += entry.build_seconds
+        # A lazily built search index may have grown the entry since it was stored
+        self._evict()
+        return entry
+
+    def process(self, uploaded_file, **options):
+        """Return the ProcessedDataset for an upload, computing it at most once"""
+        source_hash = self.source_hash(uploaded_file)
+        key = (source_hash, tuple(sorted(options.items())))
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+
+        # Concurrent sessions uploading the same file wait for one computation
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self.get(key)
+            if entry is not None:
+                return entry
+            try:
+                entry = self.processor(uploaded_file, source_hash=source_hash, **options)
+            finally:
+                with self._lock:
+                    self.misses += 1
+                    self._key_locks.pop(key, None)
+            if entry is not None:
+                with self._lock:
+                    self._entries[key] = entry
+                self._evict()
+            return entry
+
+    def _evict(self):
+        with self._lock:
+            total = sum(entry.nbytes for entry in self._entries.values())
+            while total > self.max_bytes and len(self._entries) > 1:
+                _, entry = self._entries.popitem(last=False)
+                total -= entry.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': sum(entry.nbytes for entry in self._entries.values()),
+                'seconds_saved': self.seconds_saved
+            }
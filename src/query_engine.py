@@ -0,0 +1,363 @@
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# Keyword lists are matched in order, so longer phrases come first
+AGGREGATES = (
+    ('mean', ('average', 'mean', 'avg')),
+    ('median', ('median',)),
+    ('sum', ('total', 'sum')),
+    ('count', ('how many', 'number of', 'count')),
+    ('max', ('maximum', 'max', 'highest', 'largest', 'biggest')),
+    ('min', ('minimum', 'min', 'lowest', 'smallest'))
+)
+AGGREGATE_LABELS = {'mean': 'average', 'median': 'median', 'sum': 'total', 'count': 'number of rows',
+                    'nunique': 'number of distinct values of', 'max': 'maximum', 'min': 'minimum'}
+COMPARISONS = (
+    ('>=', ('>=', 'at least')),
+    ('<=', ('<=', 'at most')),
+    ('>', ('>', 'above', 'over', 'greater than', 'more than')),
+    ('<', ('<', 'below', 'under', 'less than')),
+    ('==', ('=', 'equal to', 'equals'))
+)
+GROUP_WORDS = ('grouped by', 'group by', 'for each', 'for every', 'by', 'per', 'across', 'each', 'which', 'what')
+
+_WORD = re.compile(r"[\w'&.+-]+")
+_NUMBER = r'(-?\d[\d,]*(?:\.\d+)?)'
+_TOP = re.compile(r'\b(top|bottom)\s+(\d+)\b')
+_YEAR = re.compile(r'\b(?:in|during|for|of)\s+((?:19|20)\d{2})\b')
+_ROWS = re.compile(r'\b(?:rows?|records?|entries|entry)\b')
+
+
+def _keyword_pattern(words):
+    return re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(word) for word in words) + r')(?!\w)')
+
+
+_AGGREGATE_PATTERNS = [(name, _keyword_pattern(words)) for name, words in AGGREGATES]
+_COMPARISON_PATTERNS = [(op, re.compile(r'\s*(?:is\s+|are\s+|was\s+)?(?:' + '|'.join(re.escape(word) for word in words)
+                                        + r')\s*' + _NUMBER)) for op, words in COMPARISONS]
+_GROUP_PREFIX = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(word) for word in GROUP_WORDS)
+                           + r')\s+(?:the\s+|each\s+)?$')
+
+
+def _normalize(text):
+    return ' '.join(_WORD.findall(str(text).lower().replace('_', ' ')))
+
+
+def _format(value):
+    if isinstance(value, (int, np.integer)) or float(value).is_integer():
+        return f"{value:,.0f}"
+    return f"{value:,.2f}"
+
+
+class QueryIntent:
+    """A parsed aggregate question: ``aggregate`` of ``metric``, optionally per ``group``.
+
+    ``filters`` are ``(column, op, value)`` triples with op one of the
+    comparison operators, ``'in'`` or ``'year'``. ``top`` is ``(n,
+    ascending)`` for top/bottom-n questions and ``rank`` is ``'max'`` or
+    ``'min'`` when the question asks which group is highest or lowest.
+    """
+
+    def __init__(self, aggregate, metric=None, group=None, filters=None, top=None, rank=None):
+        self.aggregate = aggregate
+        self.metric = metric
+        self.group = group
+        self.filters = filters or []
+        self.top = top
+        self.rank = rank
+
+    def describe(self):
+        target = self.aggregate if self.aggregate else 'rows'
+        text = f"{target}({self.metric})" if self.metric is not None else f"{target}(*)"
+        if self.group is not None:
+            text += f" by {self.group}"
+        if self.filters:
+            text += ' where ' + ' and '.join(f"{column} {op} {value}" for column, op, value in self.filters)
+        if self.top is not None:
+            text += f" {'bottom' if self.top[1] else 'top'} {self.top[0]}"
+        return text
+
+
+class QueryAnswer:
+    """Exact result of a locally answered question"""
+
+    def __init__(self, question, intent, text, table=None, value=None, rows=0, seconds=0.0):
+        self.question = question
+        self.intent = intent
+        self.text = text
+        self.table = table
+        self.value = value
+        self.rows = rows
+        self.seconds = seconds
+
+
+class QueryEngine:
+    """Answers simple aggregate questions about a frame with vectorized pandas.
+
+    Questions such as "average sales by region", "max price in 2023",
+    "how many orders where quantity > 10" or "top 5 products by revenue" are
+    parsed against the frame's column names and the values of its
+    low-cardinality text columns, then computed exactly over every row.
+    Counts naming a text column ("how many regions") count its distinct
+    values. ``answer`` returns None when no intent matches, so the caller
+    can fall back to the LLM.
+    """
+
+    def __init__(self, df, max_categories=1000):
+        self.df = df
+        self.max_categories = max_categories
+        self._columns = None
+        self._values = None
+        self._dates = {}
+
+    @property
+    def columns(self):
+        """Column patterns, longest names first so "net sales" wins over "sales" """
+        if self._columns is None:
+            names = sorted(self.df.columns, key=lambda column: -len(str(column)))
+            self._columns = [(column, re.compile(r'(?<!\w)' + r'[\s_-]+'.join(map(re.escape, _normalize(column).split()))
+                                                 + r'(?:e?s)?(?!\w)'))
+                             for column in names if _normalize(column)]
+        return self._columns
+
+    @property
+    def values(self):
+        """Normalized category value -> (column, value) for low-cardinality text columns"""
+        if self._values is None:
+            self._values = {}
+            for column in self.df.columns:
+                series = self.df[column]
+                if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+                    continue
+                uniques = series.dropna().unique()
+                if len(uniques) > self.max_categories:
+                    continue
+                for value in uniques:
+                    key = _normalize(value)
+                    if len(key) > 1:
+                        self._values.setdefault(key, (column, value))
+        return self._values
+
+    def _is_numeric(self, column):
+        series = self.df[column]
+        return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+    def _mentions(self, question):
+        """(start, end, column) for each column named in the question, without overlaps"""
+        taken = np.zeros(len(question) + 1, dtype=bool)
+        mentions = []
+        for column, pattern in self.columns:
+            for match in pattern.finditer(question):
+                if not taken[match.start():match.end()].any():
+                    taken[match.start():match.end()] = True
+                    mentions.append((match.start(), match.end(), column))
+        return sorted(mentions, key=lambda mention: mention[0]), taken
+
+    def _value_filters(self, question, taken):
+        """Equality filters for category values named in the question outside column mentions"""
+        words = [(match.start(), match.end(), match.group()) for match in _WORD.finditer(question)]
+        found = {}
+        i = 0
+        while i < len(words):
+            for size in range(min(4, len(words) - i), 0, -1):
+                start, end = words[i][0], words[i + size - 1][1]
+                key = ' '.join(word for _, _, word in words[i:i + size])
+                if key in self.values and not taken[start:end].any():
+                    column, value = self.values[key]
+                    found.setdefault(column, []).append(value)
+                    i += size
+                    break
+            else:
+                i += 1
+        return [(column, '==', values[0]) if len(values) == 1 else (column, 'in', values)
+                for column, values in found.items()]
+
+    def _date_column(self):
+        """First datetime column, parsing text columns named like dates on demand"""
+        for column in self.df.columns:
+            if pd.api.types.is_datetime64_any_dtype(self.df[column]):
+                return column
+        for column in self.df.columns:
+            name = _normalize(column)
+            if 'date' in name or 'time' in name:
+                if column not in self._dates:
+                    self._dates[column] = pd.to_datetime(self.df[column], errors='coerce')
+                if self._dates[column].notna().any():
+                    return column
+        return None
+
+    def parse(self, question):
+        """QueryIntent for a question, or None when it is not a recognized aggregate"""
+        question = question.lower()
+        mentions, taken = self._mentions(question)
+
+        aggregates = sorted((match.start(), name) for name, pattern in _AGGREGATE_PATTERNS
+                            for match in pattern.finditer(question))
+        top = _TOP.search(question)
+        if not aggregates and top is None:
+            return None
+
+        filters = []
+        compared = set()
+        group = ranked = None
+        for start, end, column in mentions:
+            if self._is_numeric(column):
+                for op, pattern in _COMPARISON_PATTERNS:
+                    match = pattern.match(question, end)
+                    if match:
+                        filters.append((column, op, float(match.group(1).replace(',', ''))))
+                        compared.add(column)
+                        break
+            if top is not None and not question[top.end():start].strip():
+                ranked = column
+            elif _GROUP_PREFIX.search(question[:start]) and group is None:
+                if not (top is not None and self._is_numeric(column)):
+                    group = column
+
+        # "top 5 regions by sales" ranks regions; "top 5 orders by price" ranks rows
+        if ranked is not None and not self._is_numeric(ranked) and group is None:
+            group = ranked
+
+        year = _YEAR.search(question)
+        if year is not None:
+            column = self._date_column()
+            if column is None:
+                year_columns = [column for column in self.df.columns if _normalize(column) == 'year']
+                if not year_columns:
+                    return None
+                filters.append((year_columns[0], '==', int(year.group(1))))
+            else:
+                filters.append((column, 'year', int(year.group(1))))
+        filters.extend(self._value_filters(question, taken))
+
+        numeric = [column for _, _, column in mentions if self._is_numeric(column) and column != group]
+        metric = next((column for column in numeric if column not in compared), numeric[0] if numeric else None)
+
+        names = [name for _, name in aggregates]
+        statistics = [name for name in names if name not in ('max', 'min')]
+        extremes = [name for name in names if name in ('max', 'min')]
+        rank = None
+        if statistics:
+            aggregate = statistics[0]
+            rank = extremes[0] if extremes and group is not None else None
+        elif extremes:
+            aggregate = extremes[0]
+        elif group is not None:
+            aggregate = 'sum'
+        else:
+            aggregate = None
+
+        if aggregate != 'count' and metric is None:
+            return None
+        if aggregate is None and top is None:
+            return None
+        if top is not None and metric is None and group is None:
+            # "top 3 count" names nothing to rank by
+            return None
+        if aggregate == 'count' and group is None and top is None:
+            # "how many regions" asks for distinct values, not rows
+            categories = [column for _, _, column in mentions if not self._is_numeric(column)]
+            if categories:
+                aggregate, metric = 'nunique', categories[0]
+            elif metric is None and not filters and not _ROWS.search(question):
+                # "how many customers" counts something the frame has no column for
+                return None
+        top_n = (int(top.group(2)), top.group(1) == 'bottom') if top is not None else None
+        return QueryIntent(aggregate, metric, group, filters, top_n, rank)
+
+    def _mask(self, filters):
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, op, value in filters:
+            series = self.df[column]
+            if op == 'year':
+                dates = series if pd.api.types.is_datetime64_any_dtype(series) else self._dates[column]
+                mask &= (dates.dt.year == value).to_numpy(dtype=bool, na_value=False)
+            elif op == 'in':
+                mask &= series.isin(value).to_numpy(dtype=bool)
+            elif op == '==':
+                mask &= (series == value).to_numpy(dtype=bool, na_value=False)
+            else:
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+                with np.errstate(invalid='ignore'):
+                    if op == '>':
+                        mask &= values > value
+                    elif op == '<':
+                        mask &= values < value
+                    elif op == '>=':
+                        mask &= values >= value
+                    else:
+                        mask &= values <= value
+        return mask
+
+    def execute(self, intent):
+        """Compute an intent over the full frame; returns (text, table, value, rows)"""
+        mask = self._mask(intent.filters)
+        columns = [column for column in (intent.group, intent.metric) if column is not None]
+        frame = self.df.loc[mask, list(dict.fromkeys(columns))] if columns else self.df.loc[mask]
+        rows = len(frame)
+        where = f" where {self._describe_filters(intent.filters)}" if intent.filters else ''
+        label = AGGREGATE_LABELS.get(intent.aggregate, '')
+        metric = f" {intent.metric}" if intent.metric is not None and intent.aggregate != 'count' else ''
+
+        if intent.group is None and intent.top is not None:
+            n, ascending = intent.top
+            table = frame.nsmallest(n, intent.metric) if ascending else frame.nlargest(n, intent.metric)
+            table = self.df.loc[table.index]
+            text = f"{'Bottom' if ascending else 'Top'} {len(table)} rows by {intent.metric}{where}."
+            return text, table, None, rows
+
+        if intent.group is None:
+            if intent.aggregate == 'count':
+                return f"The {label}{where} is {rows:,}.", None, rows, rows
+            value = getattr(frame[intent.metric], intent.aggregate)()
+            if pd.isna(value):
+                return f"No rows{where} have a value for {intent.metric}.", None, None, rows
+            text = f"The {label}{metric}{where} is {_format(value)} (from {rows:,} rows)."
+            return text, None, value, rows
+
+        grouped = frame.groupby(intent.group, observed=True, sort=False)
+        if intent.aggregate == 'count':
+            result = grouped.size()
+        else:
+            result = grouped[intent.metric].agg(intent.aggregate)
+        ascending = intent.top[1] if intent.top is not None else intent.rank == 'min'
+        result = result.dropna().sort_values(ascending=ascending, kind='stable')
+        if intent.top is not None:
+            result = result.head(intent.top[0])
+        if result.empty:
+            return f"No rows{where} have a value for {intent.metric}.", None, None, rows
+
+        name = f"{label}{metric}".strip()
+        table = result.rename(name).reset_index()
+        leader, value = result.index[0], result.iloc[0]
+        if intent.rank is not None:
+            text = (f"{leader} has the {'lowest' if intent.rank == 'min' else 'highest'} {name} "
+                    f"({_format(value)}){where}.")
+        else:
+            text = f"{name.capitalize()} by {intent.group}{where}: {len(result)} groups, led by {leader} ({_format(value)})."
+        return text, table, None, rows
+
+    def _describe_filters(self, filters):
+        parts = []
+        for column, op, value in filters:
+            if op == 'year':
+                parts.append(f"{column} is in {value}")
+            elif op == 'in':
+                parts.append(f"{column} is one of {', '.join(map(str, value))}")
+            elif op == '==':
+                parts.append(f"{column} is {value}")
+            else:
+                parts.append(f"{column} {op} {_format(value)}")
+        return ' and '.join(parts)
+
+    def answer(self, question):
+        """QueryAnswer computed from the full frame, or None to fall back to the LLM"""
+        start = time.perf_counter()
+        intent = self.parse(question)
+        if intent is None:
+            return None
+        text, table, value, rows = self.execute(intent)
+        return QueryAnswer(question, intent, text, table, value, rows, time.perf_counter() - start)
@@ -0,0 +1,110 @@
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .cache import TTLCache
+
+_worker_df = None
+
+
+def render_figure(fig, fmt='png', dpi=100):
+    """Encode a figure as PNG or SVG bytes and close it"""
+    import matplotlib.pyplot as plt
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi)
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def render_chart(df, chart_type, x_col, y_col=None, color_col=None, fmt='png', dpi=100, **options):
+    """Build a chart with create_visualization and return its encoded bytes, or None"""
+    # matplotlib and seaborn are only imported once a chart is actually drawn
+    from .visualization import create_visualization
+    fig = create_visualization(df, chart_type, x_col, y_col, color_col, **options)
+    if fig is None:
+        return None
+    return render_figure(fig, fmt, dpi)
+
+
+def dataset_hash(df):
+    """Content hash of a frame, for callers that have no file hash at hand"""
+    digest = hashlib.sha256(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _init_render_worker(df):
+    global _worker_df
+    # Workers never display anything, so always draw with the Agg backend
+    import matplotlib
+    matplotlib.use('Agg')
+    _worker_df = df
+
+
+def _render_spec(spec):
+    return render_chart(_worker_df, **spec)
+
+
+class ChartRenderer:
+    """Renders charts to image bytes and keeps the most recent ones in an LRU cache.
+
+    Charts are keyed by (dataset hash, chart type, columns, options), so
+    pressing "Generate Visualization" again for an unchanged selection
+    returns the cached bytes without touching matplotlib. Every figure is
+    closed as soon as it has been encoded.
+    """
+
+    def __init__(self, maxsize=64, fmt='png', dpi=100):
+        self.fmt = fmt
+        self.dpi = dpi
+        self.cache = TTLCache(maxsize, ttl=float('inf'))
+
+    @staticmethod
+    def _spec(chart_type, x_col, y_col=None, color_col=None, **options):
+        return dict(chart_type=chart_type, x_col=x_col, y_col=y_col, color_col=color_col, **options)
+
+    def _key(self, data_hash, spec):
+        # Dict options such as budgets are frozen so the key stays hashable
+        items = ((name, tuple(sorted(value.items())) if isinstance(value, dict) else value)
+                 for name, value in sorted(spec.items()))
+        return (data_hash, self.fmt, self.dpi) + tuple(items)
+
+    def render(self, df, chart_type, x_col, y_col=None, color_col=None, data_hash=None, **options):
+        """Encoded bytes of one chart, or None if it could not be drawn"""
+        spec = self._spec(chart_type, x_col, y_col, color_col, **options)
+        key = self._key(data_hash or dataset_hash(df), spec)
+        image = self.cache.get(key)
+        if image is None:
+            image = render_chart(df, fmt=self.fmt, dpi=self.dpi, **spec)
+            if image is not None:
+                self.cache.set(key, image)
+        return image
+
+    def render_batch(self, df, specs, data_hash=None, workers=None):
+        """Render many charts of one frame, in parallel worker processes.
+
+        ``specs`` are dicts of create_visualization arguments (chart_type,
+        x_col, y_col, color_col and options). Cached charts are reused and
+        the frame is sent to each worker once. Returns bytes (or None) per
+        spec, in order.
+        """
+        data_hash = data_hash or dataset_hash(df)
+        specs = [self._spec(**spec) for spec in specs]
+        keys = [self._key(data_hash, spec) for spec in specs]
+        images = [self.cache.get(key) for key in keys]
+        missing = [i for i, image in enumerate(images) if image is None]
+        if missing:
+            jobs = [dict(specs[i], fmt=self.fmt, dpi=self.dpi) for i in missing]
+            with ProcessPoolExecutor(workers, initializer=_init_render_worker, initargs=(df,)) as pool:
+                for i, image in zip(missing, pool.map(_render_spec, jobs)):
+                    images[i] = image
+                    if image is not None:
+                        self.cache.set(keys[i], image)
+        return images
+
+    def stats(self):
+        return self.cache.stats()
@@ -0,0 +1,127 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .search_index import top_k
+
+
+class RetrievalBackend(ABC):
+    """Interface between a TF-IDF index and the search that runs over it.
+
+    ``build`` is called with the index whenever the set of indexed documents
+    has changed, and ``search`` receives already vectorized queries.
+    """
+
+    index = None
+    n_docs = 0
+
+    @abstractmethod
+    def build(self, index):
+        """Prepare to search the documents of ``index``"""
+
+    @abstractmethod
+    def search(self, query_vectors, k=5):
+        """Return ``(indices, scores)`` arrays sorted by descending score.
+
+        Rows may be padded with index ``-1`` when fewer than ``k`` documents
+        were considered.
+        """
+
+
+class ExactBackend(RetrievalBackend):
+    """Brute-force scan of the full TF-IDF matrix"""
+
+    def __init__(self, block_size=65536):
+        self.block_size = block_size
+
+    def build(self, index):
+        self.index = index
+        self.n_docs = len(index)
+
+    def search(self, query_vectors, k=5):
+        return top_k(self.index.matrix, query_vectors, k, self.block_size)
+
+
+class IVFBackend(RetrievalBackend):
+    """Approximate search over an inverted file of k-means cells.
+
+    Documents are projected to ``n_components`` dimensions with TruncatedSVD
+    and grouped into ``n_clusters`` k-means cells. The TF-IDF rows are then
+    stored grouped by cell, so a query only scores the members of the
+    ``n_probe`` cells whose centroids are closest, exactly, as contiguous
+    sparse slices. The cost per query grows with the size of the probed
+    cells rather than the corpus, at the price of one permuted copy of the
+    matrix. Corpora smaller than ``min_docs`` are searched exactly.
+    """
+
+    def __init__(self, n_components=64, n_clusters=None, n_probe=8, train_size=100000,
+                 min_docs=10000, random_state=0):
+        self.n_components = n_components
+        self.n_clusters = n_clusters
+        self.n_probe = n_probe
+        self.train_size = train_size
+        self.min_docs = min_docs
+        self.random_state = random_state
+        self.svd = None
+
+    def build(self, index):
+        self.index = index
+        self.n_docs = len(index)
+        self.svd = None
+        n_terms = len(index.vocabulary)
+        if self.n_docs < max(self.min_docs, 2) or n_terms < 2:
+            return
+
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.preprocessing import normalize
+
+        matrix = index.matrix
+        rng = np.random.default_rng(self.random_state)
+        sample = rng.choice(self.n_docs, min(self.train_size, self.n_docs), replace=False)
+        n_components = min(self.n_components, n_terms - 1, len(sample) - 1)
+        self.svd = TruncatedSVD(n_components, random_state=self.random_state).fit(matrix[sample])
+
+        reduced = self._reduce(matrix)
+        n_clusters = self.n_clusters or int(np.sqrt(self.n_docs))
+        n_clusters = max(1, min(n_clusters, len(sample)))
+        kmeans = MiniBatchKMeans(n_clusters, random_state=self.random_state, n_init=3)
+        kmeans.fit(reduced[sample])
+        self.centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+
+        # Store rows grouped by cell so each cell is a contiguous CSR slice
+        labels = kmeans.predict(reduced)
+        self.order = np.argsort(labels, kind='stable')
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_clusters))])
+        self.cell_matrix = matrix[self.order]
+
+    def _reduce(self, vectors, block_size=65536):
+        """Project rows to the SVD space in blocks, L2-normalized as float32"""
+        from sklearn.preprocessing import normalize
+        blocks = [self.svd.transform(vectors[start:start + block_size])
+                  for start in range(0, vectors.shape[0], block_size)]
+        return normalize(np.vstack(blocks)).astype(np.float32)
+
+    def search(self, query_vectors, k=5):
+        if self.svd is None:
+            return top_k(self.index.matrix, query_vectors, k)
+
+        n_probe = min(self.n_probe, len(self.centroids))
+        centroid_scores = self._reduce(query_vectors) @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+
+        indices = np.full((len(probes), k), -1, dtype=np.int64)
+        scores = np.zeros((len(probes), k))
+        for q, cells in enumerate(probes):
+            positions = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in cells])
+            cell_scores = (self.cell_matrix[positions] @ query_vectors[q].T).toarray().ravel()
+
+            # Pad with -1 when the probed cells hold fewer than k documents
+            if len(cell_scores) > k:
+                best = np.argpartition(-cell_scores, k - 1)[:k]
+                best = best[np.argsort(-cell_scores[best], kind='stable')]
+            else:
+                best = np.argsort(-cell_scores, kind='stable')
+            indices[q, :len(best)] = self.order[positions[best]]
+            scores[q, :len(best)] = cell_scores[best]
+        return indices, scores
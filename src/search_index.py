@@ -0,0 +1,471 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Bump when the on-disk layout or the text serialization changes
+INDEX_FORMAT_VERSION = 1
+
+
+def top_k(matrix, query_vectors, k=5, block_size=65536):
+    """Best ``k`` rows of ``matrix`` for each query by dot-product score.
+
+    Rows are scored ``block_size`` at a time so peak memory is bounded by
+    ``n_queries * block_size`` dense scores, and each block only keeps its
+    own top ``k`` candidates via ``argpartition`` before they are merged.
+    Returns ``(indices, scores)`` arrays of shape ``(n_queries, k')`` sorted
+    by descending score, where ``k' = min(k, n_rows)``.
+    """
+    n_queries = query_vectors.shape[0]
+    query_columns = query_vectors.T.tocsr()
+    best_indices = np.zeros((n_queries, 0), dtype=np.int64)
+    best_scores = np.zeros((n_queries, 0))
+
+    if matrix.shape[0] == 0 or k <= 0:
+        return best_indices, best_scores
+
+    for start in range(0, matrix.shape[0], block_size):
+        scores = (matrix[start:start + block_size] @ query_columns).toarray().T
+        if scores.shape[1] > k:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, candidates, axis=1)
+        else:
+            candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+
+        best_indices = np.concatenate([best_indices, candidates + start], axis=1)
+        best_scores = np.concatenate([best_scores, scores], axis=1)
+        if best_scores.shape[1] > k:
+            keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+            best_indices = np.take_along_axis(best_indices, keep, axis=1)
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+
+    # Highest score first, ties broken by the lower row index
+    order = np.lexsort((best_indices, -best_scores), axis=1)
+    return np.take_along_axis(best_indices, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+class IncrementalTfidfIndex:
+    """TF-IDF index that grows by appending documents instead of refitting.
+
+    Raw term counts are stored as CSR chunks and document frequencies are
+    kept up to date on every append. IDF weights and the normalized TF-IDF
+    matrix are only recomputed when a search needs them, using the same
+    formula as ``TfidfVectorizer`` (smooth IDF, L2 norm), so scores match a
+    full refit over the same documents.
+    """
+
+    def __init__(self, analyzer=None):
+        if analyzer is None:
+            # sklearn takes over a second to import, so it is loaded with the first index
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            analyzer = TfidfVectorizer().build_analyzer()
+        self.analyzer = analyzer
+        self.vocabulary = {}
+        self.n_docs = 0
+        self._df = np.zeros(0, dtype=np.int64)
+        self._chunks = []
+        self._matrix = None
+        self._idf = None
+        self._norms = None
+
+    def __len__(self):
+        return self.n_docs
+
+    def add_documents(self, texts):
+        """Tokenize new documents and append their term counts"""
+        if self._norms is not None:
+            self._recover_counts()
+        vocabulary = self.vocabulary
+        analyze = self.analyzer
+        indices = []
+        counts = []
+        indptr = [0]
+
+        for text in texts:
+            doc_counts = {}
+            for term in analyze(text):
+                term_id = vocabulary.get(term)
+                if term_id is None:
+                    term_id = vocabulary[term] = len(vocabulary)
+                doc_counts[term_id] = doc_counts.get(term_id, 0) + 1
+            indices.extend(doc_counts.keys())
+            counts.extend(doc_counts.values())
+            indptr.append(len(indices))
+
+        if len(indptr) == 1:
+            return
+
+        indices = np.asarray(indices, dtype=np.int32)
+        counts = np.asarray(counts, dtype=np.float64)
+        indptr = np.asarray(indptr, dtype=np.int64)
+
+        # Grow document frequencies to the new vocabulary size
+        df = np.zeros(len(vocabulary), dtype=np.int64)
+        df[:len(self._df)] = self._df
+        df += np.bincount(indices, minlength=len(vocabulary))
+        self._df = df
+
+        self._chunks.append((indptr, indices, counts))
+        self.n_docs += len(indptr) - 1
+        self._matrix = None
+        self._idf = None
+
+    @property
+    def idf(self):
+        """Smoothed IDF weights, recomputed lazily after appends"""
+        if self._idf is None:
+            self._idf = np.log((1 + self.n_docs) / (1 + self._df)) + 1
+        return self._idf
+
+    @property
+    def counts(self):
+        """Raw term-count matrix of shape (n_docs, n_terms)"""
+        if self._norms is not None:
+            self._recover_counts()
+        if not self._chunks:
+            return sp.csr_matrix((0, len(self.vocabulary)), dtype=np.float64)
+        self._consolidate()
+        indptr, indices, data = self._chunks[0]
+        return sp.csr_matrix((data, indices, indptr), shape=(self.n_docs, len(self.vocabulary)))
+
+    @property
+    def matrix(self):
+        """L2-normalized TF-IDF matrix of shape (n_docs, n_terms)"""
+        if self._matrix is None:
+            from sklearn.preprocessing import normalize
+            counts = self.counts
+            counts.data = counts.data * self.idf[counts.indices]
+            self._matrix = normalize(counts, norm='l2', copy=False)
+        return self._matrix
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the counts, frequencies and matrix"""
+        arrays = [self._df] + [array for chunk in self._chunks for array in chunk]
+        if self._matrix is not None:
+            arrays += [self._matrix.data, self._matrix.indices, self._matrix.indptr]
+        return sum(array.nbytes for array in arrays)
+
+    def _recover_counts(self):
+        """Rebuild raw counts from a loaded matrix before it is modified"""
+        matrix = self._matrix
+        rows = np.repeat(np.arange(self.n_docs), np.diff(matrix.indptr))
+        counts = np.rint(matrix.data * self._norms[rows] / self.idf[matrix.indices])
+        self._chunks = [(np.array(matrix.indptr, dtype=np.int64), np.array(matrix.indices), counts)]
+        self._norms = None
+
+    def save(self, path):
+        """Write vocabulary, IDF weights and the TF-IDF CSR arrays to ``path``"""
+        os.makedirs(path, exist_ok=True)
+        counts = self.counts
+        weighted = counts.data * self.idf[counts.indices]
+        rows = np.repeat(np.arange(self.n_docs), np.diff(counts.indptr))
+        norms = np.sqrt(np.bincount(rows, weights=weighted ** 2, minlength=self.n_docs))
+        matrix = self.matrix
+
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(os.path.join(path, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+            json.dump(terms, f)
+        np.save(os.path.join(path, 'idf.npy'), self.idf)
+        np.save(os.path.join(path, 'df.npy'), self._df)
+        np.save(os.path.join(path, 'norms.npy'), norms)
+        np.save(os.path.join(path, 'data.npy'), matrix.data)
+        np.save(os.path.join(path, 'indices.npy'), matrix.indices)
+        np.save(os.path.join(path, 'indptr.npy'), matrix.indptr)
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_FORMAT_VERSION, 'n_docs': self.n_docs}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open an index written by ``save``, memory-mapping the matrix arrays"""
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(path, 'vocabulary.json'), encoding='utf-8') as f:
+            terms = json.load(f)
+
+        index = cls()
+        index.vocabulary = {term: i for i, term in enumerate(terms)}
+        index.n_docs = meta['n_docs']
+        index._df = np.load(os.path.join(path, 'df.npy'))
+        index._idf = np.load(os.path.join(path, 'idf.npy'))
+        index._norms = np.load(os.path.join(path, 'norms.npy'), mmap_mode=mmap_mode)
+        # The CSR arrays stay backed by the files, so processes share their pages
+        index._matrix = sp.csr_matrix((
+            np.load(os.path.join(path, 'data.npy'), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, 'indices.npy'), mmap_mode=mmap_mode),
+            np.load(os.path.join(path, 'indptr.npy'), mmap_mode=mmap_mode),
+        ), shape=(index.n_docs, len(terms)), copy=False)
+        return index
+
+    def _consolidate(self):
+        """Merge appended CSR chunks into a single set of arrays"""
+        if len(self._chunks) <= 1:
+            return
+        indptrs = [self._chunks[0][0]]
+        offset = self._chunks[0][0][-1]
+        for indptr, _, _ in self._chunks[1:]:
+            indptrs.append(indptr[1:] + offset)
+            offset += indptr[-1]
+        self._chunks = [(
+            np.concatenate(indptrs),
+            np.concatenate([chunk[1] for chunk in self._chunks]),
+            np.concatenate([chunk[2] for chunk in self._chunks]),
+        )]
+
+    def transform(self, queries):
+        """Vectorize queries with the current vocabulary and IDF weights"""
+        indices = []
+        counts = []
+        indptr = [0]
+        for query in queries:
+            query_counts = {}
+            for term in self.analyzer(query):
+                term_id = self.vocabulary.get(term)
+                if term_id is not None:
+                    query_counts[term_id] = query_counts.get(term_id, 0) + 1
+            indices.extend(query_counts.keys())
+            counts.extend(query_counts.values())
+            indptr.append(len(indices))
+
+        vectors = sp.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(indptr) - 1, len(self.vocabulary))
+        )
+        vectors.data = vectors.data * self.idf[vectors.indices]
+        from sklearn.preprocessing import normalize
+        return normalize(vectors, norm='l2', copy=False)
+
+    def search(self, queries, k=5, block_size=65536):
+        """Top ``k`` ``(doc_index, score)`` pairs for each query in ``queries``"""
+        if self.n_docs == 0:
+            return [[] for _ in queries]
+        indices, scores = top_k(self.matrix, self.transform(queries), k, block_size)
+        return [list(zip(row_indices.tolist(), row_scores.tolist())) for row_indices, row_scores in zip(indices, scores)]
+
+    def similarities(self, query):
+        """Cosine similarity between a query and every indexed document"""
+        if self.n_docs == 0:
+            return np.zeros(0)
+        query_vector = self.transform([query])
+        return (self.matrix @ query_vector.T).toarray().ravel()
+
+
+_to_str = np.frompyfunc(str, 1, 1)
+
+
+def _values_dtype(df):
+    """Dtype that ``df.values`` (and therefore ``iterrows``) uses for the frame"""
+    rows = [0]
+    # Masked extension columns only widen to float when a missing value exists
+    extension_cols = [i for i, dtype in enumerate(df.dtypes) if not isinstance(dtype, np.dtype)]
+    if extension_cols:
+        missing = np.flatnonzero(df.iloc[:, extension_cols].isna().any(axis=1).to_numpy())
+        if len(missing):
+            rows.append(missing[0])
+    return df.iloc[rows].to_numpy().dtype
+
+
+def _format_datetimes(values):
+    """Format naive datetime64 values the way ``str(pd.Timestamp)`` does"""
+    strings = np.char.replace(np.datetime_as_string(values, unit='s'), 'T', ' ').astype(object)
+    # Timestamps only print sub-second digits when they are non-zero (NaT lands here too)
+    irregular = np.flatnonzero(values != values.astype('datetime64[s]'))
+    strings[irregular] = [str(pd.Timestamp(value)) for value in values[irregular]]
+    return strings
+
+
+def _format_column(column, values_dtype):
+    """Convert one column to the strings row iteration would print"""
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind == 'M' and values_dtype.kind in 'MO':
+        return _format_datetimes(column.to_numpy())
+    if values_dtype.kind == 'f':
+        values = column.to_numpy(dtype=values_dtype, na_value=np.nan)
+    elif values_dtype.kind in 'biu':
+        values = column.to_numpy(dtype=values_dtype)
+    else:
+        # Object conversion yields the same Timestamp/Timedelta/str scalars as iteration
+        values = column.to_numpy(dtype=object)
+    return _to_str(values.astype(object))
+
+
+def iter_serialized_rows(df, chunksize=100000):
+    """Yield ``"col: val | ..."`` row texts in chunks, built column by column.
+
+    The output is identical to joining ``row.items()`` from ``df.iterrows()``,
+    including the dtype upcasting ``iterrows`` applies to mixed frames. The
+    one exception is a row whose only non-missing values are datetime-like:
+    ``iterrows`` re-infers that row's dtype and prints its blanks as ``NaT``.
+    """
+    if len(df) == 0:
+        return
+    values_dtype = _values_dtype(df)
+    prefixes = [f"{col}: " for col in df.columns]
+
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        if not prefixes:
+            yield [""] * len(chunk)
+            continue
+        columns = [prefix + _format_column(chunk.iloc[:, i], values_dtype) for i, prefix in enumerate(prefixes)]
+        yield list(map(" | ".join, zip(*columns)))
+
+
+def serialize_rows(df, chunksize=100000):
+    """Return the ``"col: val | ..."`` text of every row in ``df``"""
+    texts = []
+    for chunk in iter_serialized_rows(df, chunksize):
+        texts.extend(chunk)
+    return texts
+
+
+class MappedTexts:
+    """Read-only sequence of document texts backed by a memory-mapped file"""
+
+    def __init__(self, path):
+        self.offsets = np.load(os.path.join(path, 'text_offsets.npy'), mmap_mode='r')
+        text_path = os.path.join(path, 'texts.bin')
+        if os.path.getsize(text_path):
+            self.data = np.memmap(text_path, dtype=np.uint8, mode='r')
+        else:
+            self.data = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('text index out of range')
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @staticmethod
+    def write(path, texts):
+        """Write texts as one UTF-8 blob plus an offsets array"""
+        offsets = [0]
+        with open(os.path.join(path, 'texts.bin'), 'wb') as f:
+            for text in texts:
+                encoded = text.encode('utf-8')
+                f.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+        np.save(os.path.join(path, 'text_offsets.npy'), np.asarray(offsets, dtype=np.int64))
+
+
+def file_hash(file):
+    """SHA-256 of a file-like object's contents, leaving its position unchanged"""
+    position = file.tell()
+    file.seek(0)
+    digest = hashlib.sha256()
+    for block in iter(lambda: file.read(1 << 20), b''):
+        digest.update(block)
+    file.seek(position)
+    return digest.hexdigest()
+
+
+def content_key(hashes):
+    """Key for an index built from the given source hashes, in order"""
+    digest = hashlib.sha256(f"v{INDEX_FORMAT_VERSION}".encode())
+    for source_hash in hashes:
+        digest.update(source_hash.encode())
+    return digest.hexdigest()
+
+
+class IndexStore:
+    """Content-addressed directory of saved search indexes and their texts.
+
+    Each entry lives in ``<root>/<key>/`` and is written to a temporary
+    directory first, then renamed into place, so readers never observe a
+    partially written index. With ``max_bytes`` set, saving evicts the
+    least recently used entries (by directory mtime, refreshed on load)
+    until the store fits again; the entry just saved is always kept.
+    """
+
+    def __init__(self, root, max_bytes=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key):
+        return os.path.exists(os.path.join(self.path(key), 'meta.json'))
+
+    def save(self, key, index, texts):
+        """Persist an index and its document texts under ``key``"""
+        if key in self:
+            self._touch(key)
+            return
+        tmp_path = tempfile.mkdtemp(dir=self.root, prefix='.tmp-')
+        try:
+            MappedTexts.write(tmp_path, texts)
+            index.save(tmp_path)
+            os.rename(tmp_path, self.path(key))
+        except OSError:
+            # Another process may have stored the same key concurrently
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            if key not in self:
+                raise
+        if self.max_bytes is not None:
+            self.trim(keep=key)
+
+    def delete(self, key):
+        """Remove a stored key; it is renamed away first so readers never see it half deleted"""
+        if key not in self:
+            return
+        tmp_path = tempfile.mkdtemp(dir=self.root, prefix='.del-')
+        try:
+            os.rename(self.path(key), os.path.join(tmp_path, key))
+        except OSError:
+            pass  # already deleted by another process
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def load(self, key, mmap=True):
+        """Return ``(index, texts)`` for a stored key, raising KeyError if it is not (or no longer) stored"""
+        path = self.path(key)
+        try:
+            loaded = IncrementalTfidfIndex.load(path, mmap=mmap), MappedTexts(path)
+        except FileNotFoundError:
+            # Evicted by another process between the membership check and the load
+            raise KeyError(key)
+        self._touch(key)
+        return loaded
+
+    def _touch(self, key):
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+
+    def entries(self):
+        """``(key, bytes, last_used)`` of every stored entry"""
+        entries = []
+        for key in os.listdir(self.root):
+            path = self.path(key)
+            if key.startswith('.') or key not in self:
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+                entries.append((key, size, os.path.getmtime(path)))
+            except OSError:
+                continue  # deleted while listing
+        return entries
+
+    def trim(self, keep=None):
+        """Evict least recently used entries, other than ``keep``, until the store fits ``max_bytes``"""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                self.delete(key)
+                total -= size
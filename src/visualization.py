@@ -1,27 +1,77 @@
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
 import seaborn as sns
 
-def create_visualization(df, chart_type, x_col, y_col=None, color_col=None):
-    """Create visualization based on user selection"""
+from .aggregation import (DEFAULT_BUDGETS, MAX_GROUPS, as_numeric, box_summary, downsample_line, group_summary,
+                          histogram_2d, stratified_sample)
+
+def create_visualization(df, chart_type, x_col, y_col=None, color_col=None, budgets=None, line_method='lttb'):
+    """Create visualization based on user selection.
+
+    Frames with more rows than the chart's budget (see
+    ``aggregation.DEFAULT_BUDGETS``, overridable through ``budgets``) are
+    reduced before plotting: scatter plots become 2D histograms (or a
+    stratified sample when colored), line charts are downsampled with LTTB or
+    min-max buckets, bar and box plots are drawn from group statistics and
+    violin plots from a stratified sample.
+    """
+    fig = None
     try:
+        budget = {**DEFAULT_BUDGETS, **(budgets or {})}.get(chart_type)
+        reduce = budget is not None and len(df) > budget
         fig, ax = plt.subplots(figsize=(10, 6))
-        
+
         if chart_type == "Bar Chart":
-            sns.barplot(data=df, x=x_col, y=y_col, ax=ax)
+            if reduce and as_numeric(df[y_col]) is not None:
+                stats = group_summary(df, x_col, y_col)
+                ax.bar(stats.index.astype(str), stats['mean'], yerr=stats['ci'], capsize=3)
+                ax.set_xlabel(x_col)
+                ax.set_ylabel(y_col)
+            else:
+                data = stratified_sample(df, budget, x_col, max_groups=MAX_GROUPS) if reduce else df
+                sns.barplot(data=data, x=x_col, y=y_col, ax=ax)
         elif chart_type == "Line Chart":
-            sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
+            if reduce:
+                line = downsample_line(df, x_col, y_col, budget, line_method)
+                ax.plot(line[x_col], line[y_col])
+                ax.set_xlabel(x_col)
+                ax.set_ylabel(y_col)
+            else:
+                sns.lineplot(data=df, x=x_col, y=y_col, ax=ax)
         elif chart_type == "Scatter Plot":
-            sns.scatterplot(data=df, x=x_col, y=y_col, hue=color_col, ax=ax)
+            if reduce and color_col is None and as_numeric(df[x_col]) is not None and as_numeric(df[y_col]) is not None:
+                # Point density on a grid stands in for the individual points
+                counts, x_edges, y_edges = histogram_2d(df, x_col, y_col)
+                mesh = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), norm=LogNorm(), cmap='viridis')
+                fig.colorbar(mesh, ax=ax, label='rows')
+                ax.set_xlabel(x_col)
+                ax.set_ylabel(y_col)
+            else:
+                data = stratified_sample(df, budget, color_col) if reduce else df
+                # A legend entry per color is unreadable, and slow to lay out, past a few dozen
+                legend = 'auto' if color_col is None or data[color_col].nunique() <= MAX_GROUPS else False
+                sns.scatterplot(data=data, x=x_col, y=y_col, hue=color_col, legend=legend, ax=ax)
         elif chart_type == "Histogram":
             sns.histplot(data=df, x=x_col, ax=ax)
         elif chart_type == "Box Plot":
-            sns.boxplot(data=df, x=x_col, y=y_col, ax=ax)
+            if reduce and as_numeric(df[y_col]) is not None:
+                ax.bxp(box_summary(df, x_col, y_col), showfliers=False)
+                ax.set_xlabel(x_col)
+                ax.set_ylabel(y_col)
+            else:
+                sns.boxplot(data=df, x=x_col, y=y_col, ax=ax)
         elif chart_type == "Violin Plot":
-            sns.violinplot(data=df, x=x_col, y=y_col, ax=ax)
-        
+            data = stratified_sample(df, budget, x_col, max_groups=MAX_GROUPS) if reduce else df
+            sns.violinplot(data=data, x=x_col, y=y_col, ax=ax)
+
+        if reduce:
+            ax.set_title(f"{chart_type} of {len(df):,} rows (aggregated)")
         plt.xticks(rotation=45)
         plt.tight_layout()
         return fig
     except Exception as e:
         print(f"Error creating visualization: {str(e)}")
-        return None 
\ No newline at end of file
+        if fig is not None:
+            plt.close(fig)
+        return None
@@ -0,0 +1,91 @@
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from src.aggregation import (box_summary, downsample_line, group_summary, histogram_2d, lttb_indices,
+                             minmax_indices, stratified_sample)
+from src.visualization import create_visualization
+
+class TestDownsampling(unittest.TestCase):
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        x = np.arange(10000, dtype=float)
+        y = np.sin(x / 500)
+        y[4321] = 50.0
+        keep = lttb_indices(x, y, 100)
+        self.assertEqual(len(keep), 100)
+        self.assertEqual((keep[0], keep[-1]), (0, 9999))
+        self.assertIn(4321, keep)
+        self.assertTrue((np.diff(keep) > 0).all())
+
+    def test_minmax_keeps_bucket_extremes(self):
+        y = np.random.default_rng(0).normal(size=1001)
+        keep = minmax_indices(y, 20)
+        self.assertIn(y.argmax(), keep)
+        self.assertIn(y.argmin(), keep)
+        self.assertLessEqual(len(keep), 20)
+
+    def test_downsample_line_averages_repeated_x(self):
+        df = pd.DataFrame({'x': [1, 1, 2, 3], 'y': [1.0, 3.0, 5.0, np.nan]})
+        line = downsample_line(df, 'x', 'y', 10)
+        self.assertEqual(line['y'].tolist(), [2.0, 5.0])
+        self.assertEqual(len(downsample_line(pd.DataFrame({'x': range(5000), 'y': range(5000)}), 'x', 'y', 50)), 50)
+
+class TestGroupStatistics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.df = pd.DataFrame({'g': rng.choice(['a', 'b', 'c'], 3000), 'v': rng.normal(size=3000)})
+
+    def test_group_summary_matches_groupby(self):
+        stats = group_summary(self.df, 'g', 'v')
+        expected = self.df.groupby('g')['v'].mean()
+        np.testing.assert_allclose(stats['mean'], expected.reindex(stats.index))
+        self.assertTrue((stats['ci'] > 0).all())
+
+    def test_box_summary_matches_matplotlib(self):
+        ours = box_summary(self.df, 'g', 'v')
+        for stats in ours:
+            expected = matplotlib.cbook.boxplot_stats(self.df.loc[self.df['g'] == stats['label'], 'v'].to_numpy())[0]
+            for key in ('q1', 'med', 'q3', 'whislo', 'whishi'):
+                self.assertAlmostEqual(stats[key], expected[key])
+
+    def test_stratified_sample_keeps_every_group(self):
+        df = pd.concat([self.df, pd.DataFrame({'g': ['rare'], 'v': [0.0]})], ignore_index=True)
+        sample = stratified_sample(df, 300, 'g')
+        self.assertLess(len(sample), 320)
+        self.assertEqual(set(sample['g']), set(df['g']))
+
+    def test_stratified_sample_respects_budget_with_many_groups(self):
+        df = pd.DataFrame({'g': np.arange(20000) % 5000, 'v': np.arange(20000.0)})
+        self.assertEqual(len(stratified_sample(df, 1000, 'g')), 1000)
+        self.assertLessEqual(len(stratified_sample(df, 6000, 'g')), 6000)
+        self.assertEqual(set(stratified_sample(df, 6000, 'g')['g']), set(df['g']))
+        self.assertEqual(stratified_sample(df, 1000, 'g', max_groups=10)['g'].nunique(), 10)
+
+    def test_missing_dates_do_not_stretch_histogram_bins(self):
+        dates = pd.Series(pd.date_range('2024-01-01', periods=100, freq='D'))
+        dates[::10] = pd.NaT
+        df = pd.DataFrame({'d': dates, 'v': np.arange(100.0)})
+        counts, x_edges, _ = histogram_2d(df, 'd', 'v', bins=10)
+        self.assertEqual(counts.sum(), 90)
+        self.assertEqual(x_edges[0], dates.min().value)
+
+class TestCreateVisualization(unittest.TestCase):
+    def test_large_frames_are_aggregated(self):
+        rng = np.random.default_rng(2)
+        df = pd.DataFrame({'g': rng.choice(['a', 'b'], 5000), 'x': rng.normal(size=5000), 'y': rng.normal(size=5000)})
+        budgets = dict.fromkeys(['Bar Chart', 'Line Chart', 'Scatter Plot', 'Box Plot', 'Violin Plot'], 500)
+        for chart_type, x_col in [('Bar Chart', 'g'), ('Line Chart', 'x'), ('Scatter Plot', 'x'),
+                                  ('Box Plot', 'g'), ('Violin Plot', 'g')]:
+            fig = create_visualization(df, chart_type, x_col, 'y', budgets=budgets)
+            self.assertIsNotNone(fig, chart_type)
+            self.assertIn('aggregated', fig.axes[0].get_title())
+            plt.close(fig)
+
+        fig = create_visualization(df.head(100), 'Scatter Plot', 'x', 'y', 'g', budgets=budgets)
+        self.assertEqual(fig.axes[0].get_title(), '')
+        plt.close(fig)
+
+if __name__ == '__main__':
+    unittest.main()
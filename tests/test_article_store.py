@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from src.article_store import ArticleStore
+
+def scored_article(url, **fields):
+    article = {'url': url, 'title': f"Title {url}", 'text': 'Shares rallied.', 'summary': 'Up.',
+               'keywords': ['shares'], 'published_date': None, 'source': 'example.com',
+               'compound': 0.5, 'pos': 0.4, 'neg': 0.0, 'neu': 0.6}
+    article.update(fields)
+    return article
+
+class TestArticleStore(unittest.TestCase):
+    def test_round_trip_and_expiry(self):
+        now = [0.0]
+        store = ArticleStore(ttl=10, clock=lambda: now[0])
+        published = datetime(2024, 5, 1, 9, 30, tzinfo=timezone.utc)
+        store.put_many([scored_article('http://a', published_date=published), scored_article('http://b')])
+
+        articles = store.get_many(['http://a', 'http://b', 'http://c'])
+        self.assertEqual(sorted(articles), ['http://a', 'http://b'])
+        self.assertEqual(articles['http://a']['published_date'], published)
+        self.assertEqual(articles['http://a']['keywords'], ['shares'])
+        self.assertEqual(articles['http://b']['compound'], 0.5)
+
+        now[0] = 11
+        self.assertEqual(store.get_many(['http://a']), {})
+        self.assertEqual(store.stats(), {'hits': 2, 'misses': 2, 'expired': 1, 'size': 2})
+        self.assertEqual(store.purge_expired(), 2)
+        self.assertEqual(len(store), 0)
+
+    def test_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'news.sqlite')
+            store = ArticleStore(path)
+            store.put_many([scored_article('http://a')])
+            store.close()
+            reopened = ArticleStore(path)
+            self.assertEqual(reopened.get_many(['http://a'])['http://a']['title'], 'Title http://a')
+            reopened.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.cache import SQLiteCache, TieredCache, TTLCache
+from src.article_store import ArticleStore
+from src.news_analyzer import NewsAnalyzer
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestTTLCache(unittest.TestCase):
+    def test_lru_eviction_and_counters(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'evictions': 1, 'expirations': 0, 'size': 2})
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        cache.set('a', 1)
+        clock.now = 9
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 10
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+class TestTieredCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_disk_tier_survives_restart(self):
+        disk = SQLiteCache(self.path, ttl=60)
+        TieredCache(TTLCache(), disk).set(('query', 3), ['http://a', 'http://b'])
+        disk.close()
+
+        disk = SQLiteCache(self.path, ttl=60)
+        restarted = TieredCache(TTLCache(), disk)
+        self.assertEqual(restarted.get(('query', 3)), ['http://a', 'http://b'])
+        self.assertEqual(restarted.memory.get(('query', 3)), ['http://a', 'http://b'])
+        self.assertEqual(restarted.stats()['disk']['hits'], 1)
+        disk.close()
+
+    def test_disk_entries_expire(self):
+        clock = FakeClock()
+        disk = SQLiteCache(self.path, ttl=5, clock=clock)
+        disk.set('key', 'value')
+        clock.now = 6
+        self.assertIsNone(disk.get('key'))
+        self.assertEqual(disk.purge_expired(), 1)
+        disk.close()
+
+class StubFetcher:
+    max_per_host = 2
+
+    def __init__(self):
+        self.fetched = []
+
+    def article(self, url):
+        # Words unique to the URL, so no two stub articles are near-duplicates
+        text = ' '.join(hashlib.sha1(f"{url}/{i}".encode()).hexdigest() for i in range(5))
+        return {'title': url, 'text': text, 'summary': '', 'keywords': [], 'url': url,
+                'published_date': None, 'source': 'example.com'}
+
+    def fetch_all(self, urls, on_article=None, cancel=None, nlp=None):
+        self.fetched.extend(urls)
+        return {url: self.article(url) for url in urls}
+
+    def summarize(self, articles):
+        return articles
+
+class TestNewsAnalyzerCaching(unittest.TestCase):
+    def test_repeat_searches_are_served_from_cache(self):
+        searches = []
+
+        def fake_search(query, num_results):
+            searches.append(query)
+            return [f"http://example.com/{query.split()[0]}/{i}" for i in range(num_results)]
+
+        fetcher = StubFetcher()
+        analyzer = NewsAnalyzer(search_fn=fake_search, fetcher=fetcher)
+        first = analyzer.search_news(['alpha', 'beta'], num_articles=2)
+        second = analyzer.search_news(['alpha', 'beta'], num_articles=2)
+
+        self.assertEqual(first['url'].tolist(), second['url'].tolist())
+        self.assertEqual(len(searches), 2)
+        self.assertEqual(len(fetcher.fetched), 4)
+        stats = analyzer.cache_stats()
+        self.assertEqual(stats['queries']['memory']['hits'], 2)
+        self.assertEqual(stats['articles']['hits'], 4)
+
+    def test_only_new_and_expired_urls_are_fetched(self):
+        results = {'alpha': ['http://a', 'http://b'], 'beta': ['http://b', 'http://c']}
+        fetcher = StubFetcher()
+        clock = FakeClock()
+        analyzer = NewsAnalyzer(search_fn=lambda query, num_results: results[query.split()[0]], fetcher=fetcher,
+                                cache_ttl=100)
+        analyzer.article_store = ArticleStore(ttl=100, clock=clock)
+
+        first, counts = analyzer.refresh_news(['alpha'], num_articles=2)
+        self.assertEqual(counts, {'new': 2, 'cached': 0, 'duplicates': 0})
+        self.assertEqual(first['url'].tolist(), ['http://a', 'http://b'])
+        self.assertIn('compound', first.columns)
+
+        clock.now = 50
+        analyzer.article_store.put_many([dict(fetcher.article('http://b'), compound=-0.9, pos=0.0, neg=0.7, neu=0.3)])
+        clock.now = 120
+        merged, counts = analyzer.refresh_news(['alpha', 'beta'], num_articles=2)
+        self.assertEqual(counts, {'new': 2, 'cached': 1, 'duplicates': 0})
+        self.assertEqual(fetcher.fetched, ['http://a', 'http://b', 'http://a', 'http://c'])
+        self.assertEqual(merged['url'].tolist(), ['http://a', 'http://b', 'http://b', 'http://c'])
+        self.assertEqual(merged['compound'].iloc[1], -0.9)
+        self.assertFalse(merged[['compound', 'pos', 'neg', 'neu']].isna().any().any())
+
+    def test_refresh_after_the_search_expires_reuses_stored_articles(self):
+        results = [['http://a', 'http://b'], ['http://a', 'http://b', 'http://c']]
+        fetcher = StubFetcher()
+        clock = FakeClock()
+        analyzer = NewsAnalyzer(search_fn=lambda query, num_results: results.pop(0), fetcher=fetcher,
+                                cache_ttl=3600, query_ttl=300)
+        analyzer.query_cache = TieredCache(TTLCache(ttl=300, clock=clock))
+        analyzer.article_store = ArticleStore(ttl=3600, clock=clock)
+
+        self.assertEqual(analyzer.refresh_news(['alpha'], num_articles=3)[1], {'new': 2, 'cached': 0, 'duplicates': 0})
+        clock.now = 100
+        self.assertEqual(analyzer.refresh_news(['alpha'], num_articles=3)[1], {'new': 0, 'cached': 2, 'duplicates': 0})
+        clock.now = 400
+        news, counts = analyzer.refresh_news(['alpha'], num_articles=3)
+        self.assertEqual(counts, {'new': 1, 'cached': 2, 'duplicates': 0})
+        self.assertEqual(news['url'].tolist(), ['http://a', 'http://b', 'http://c'])
+        self.assertEqual(fetcher.fetched, ['http://a', 'http://b', 'http://c'])
+
+    def test_syndicated_copies_are_processed_once(self):
+        story = ' '.join(f"word{i}" for i in range(200))
+        texts = {'http://a': story, 'http://b': 'Reported by Wire. ' + story, 'http://c': story + ' Read more.'}
+
+        class SyndicatingFetcher(StubFetcher):
+            def article(self, url):
+                return dict(super().article(url), text=texts.get(url, super().article(url)['text']))
+
+            def summarize(self, articles):
+                self.summarized = [article['url'] for article in articles]
+                for article in articles:
+                    article['summary'] = f"Summary of {article['url']}"
+                return articles
+
+        fetcher = SyndicatingFetcher()
+        analyzer = NewsAnalyzer(search_fn=lambda query, num_results: ['http://a', 'http://d', 'http://b', 'http://c'],
+                                fetcher=fetcher)
+        news, counts = analyzer.refresh_news(['alpha'], num_articles=4)
+
+        self.assertEqual(news['url'].tolist(), ['http://a', 'http://d'])
+        self.assertEqual(news['cluster_size'].tolist(), [3, 1])
+        self.assertEqual(counts, {'new': 4, 'cached': 0, 'duplicates': 2})
+        self.assertEqual(fetcher.summarized, ['http://a', 'http://d'])
+        impact = analyzer.get_impact_analysis(news)
+        self.assertEqual(impact['cluster_size'].tolist(), [3, 1])
+
+        # Copies are stored with the representative's results, so they are not fetched again
+        stored = analyzer.article_store.get_many(['http://b'])['http://b']
+        self.assertEqual(stored['summary'], 'Summary of http://a')
+        self.assertEqual(stored['compound'], news['compound'].iloc[0])
+
+    def test_streamed_analysis_previews_and_scores_each_story_once(self):
+        story = ' '.join(f"word{i}" for i in range(200))
+        urls = [f"http://site{i}.com/story" for i in range(6)]
+
+        class WireFetcher(StubFetcher):
+            def article(self, url):
+                return dict(super().article(url), text=f"Reported by {url}. {story}")
+
+            def fetch_all(self, urls, on_article=None, cancel=None, nlp=None):
+                articles = super().fetch_all(urls)
+                for article in articles.values():
+                    on_article(article)
+                return articles
+
+        analyzer = NewsAnalyzer(search_fn=lambda query, num_results: urls, fetcher=WireFetcher())
+        batches = []
+        score = analyzer.score_sentiment_batch
+        analyzer.score_sentiment_batch = lambda texts, *args: batches.append(list(texts)) or score(texts, *args)
+        previews = []
+        result = analyzer.analyze_news_for_dataset(pd.DataFrame({'company': ['Apple']}), on_impact=previews.append)
+
+        self.assertEqual([len(texts) for texts in batches], [1])
+        self.assertEqual([(row['url'], row['sentiment']) for row in previews], [(urls[0], 'Pending')])
+        # Every keyword search returns the same URLs, so the merged story repeats once per search
+        self.assertEqual(set(zip(result['impact']['url'], result['impact']['cluster_size'])), {(urls[0], 6)})
+        self.assertEqual(result['counts'], {'new': 6, 'cached': 0, 'duplicates': 5})
+
+if __name__ == '__main__':
+    unittest.main()
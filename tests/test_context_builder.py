@@ -0,0 +1,49 @@
+import unittest
+from src.context_builder import ContextBuilder, estimate_tokens, split_passages
+from src.data_analysis import DataAnalyzer
+
+class TestSplitPassages(unittest.TestCase):
+    def test_merges_short_paragraphs_and_cuts_long_ones(self):
+        text = "alpha beta\n\ngamma delta\n\n" + " ".join(f"w{i}" for i in range(25)) + "\n\nomega"
+        passages = split_passages(text, max_words=10)
+        self.assertEqual(passages[0], "alpha beta gamma delta")
+        self.assertTrue(all(len(p.split()) <= 10 for p in passages))
+        self.assertEqual(" ".join(passages).split(), text.split())
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("a b c d"), 4)
+        self.assertEqual(estimate_tokens("x" * 40), 10)
+
+class TestContextBuilder(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = DataAnalyzer(passage_words=20)
+        report = "\n\n".join([
+            "revenue in the north region grew by twelve percent over the last quarter of the year",
+            "staff turnover stayed flat while hiring plans were delayed until spring " * 2,
+            "revenue in the south region fell by four percent after the warehouse closure"
+        ])
+        self.analyzer._add_document(report, "report.pdf")
+        self.analyzer._add_document(
+            "revenue in the north region grew by twelve percent over the last quarter of the year", "copy.docx")
+
+    def test_documents_are_indexed_as_passages(self):
+        # The tail of the long second paragraph shares a passage with the third
+        self.assertEqual(len(self.analyzer.document_texts), 4)
+        sources = [source for _, _, source in self.analyzer.search("warehouse closure", k=1)]
+        self.assertEqual(sources, ["report.pdf passage 3"])
+        self.assertEqual(self.analyzer.search("twelve percent", k=2)[1][2], "copy.docx")
+
+    def test_drops_near_duplicates_and_respects_budget(self):
+        context = ContextBuilder(token_budget=10000).build(self.analyzer, "north region revenue")
+        self.assertEqual(context.duplicates, 1)
+        self.assertEqual(len([p for p in context.passages if "north" in p[1]]), 1)
+        self.assertTrue("[report.pdf passage 1]" in context.text or "[copy.docx]" in context.text)
+
+        small = ContextBuilder(token_budget=40).build(self.analyzer, "north region revenue")
+        self.assertLessEqual(small.tokens, 40)
+        self.assertGreater(small.over_budget, 0)
+        self.assertEqual(small.metrics()['context_tokens'], small.tokens)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.correlation import CorrelationEngine, correlation_matrix
+
+class TestCorrelationEngine(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame(rng.normal(size=(2000, 5)) + 1000, columns=list('abcde'))
+        self.df['b'] = self.df['a'] * 2 + rng.normal(size=2000) * 0.1
+        self.df['c'] = 5.0
+        self.df['label'] = 'x'
+        self.sparse = self.df.copy()
+        self.sparse.iloc[::7, 0] = np.nan
+        self.sparse.iloc[::3, 3] = np.nan
+
+    def assert_matches_pandas(self, result, df, method='pearson'):
+        expected = df.select_dtypes(include=[np.number]).corr(method)
+        pd.testing.assert_frame_equal(result, expected, atol=1e-10, rtol=0)
+
+    def test_matches_pandas_with_and_without_missing_values(self):
+        self.assert_matches_pandas(correlation_matrix(self.df), self.df)
+        self.assert_matches_pandas(correlation_matrix(self.sparse), self.sparse)
+        self.assert_matches_pandas(correlation_matrix(self.df, 'spearman'), self.df, 'spearman')
+
+    def test_incremental_updates_match_full_frame(self):
+        engine = CorrelationEngine(block_rows=300)
+        engine.update(self.df.iloc[:700])
+        engine.update(self.sparse.iloc[700:1500])
+        engine.update(self.df.iloc[1500:])
+        combined = pd.concat([self.df.iloc[:700], self.sparse.iloc[700:1500], self.df.iloc[1500:]])
+        self.assertEqual(engine.n_rows, 2000)
+        self.assert_matches_pandas(engine.matrix(), combined)
+
+    def test_spearman_rejects_a_second_update(self):
+        engine = CorrelationEngine('spearman').update(self.df.iloc[:1000])
+        with self.assertRaises(ValueError):
+            engine.update(self.df.iloc[1000:])
+        self.assert_matches_pandas(engine.matrix(), self.df.iloc[:1000], 'spearman')
+
+    def test_min_periods(self):
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0, np.nan], 'b': [np.nan, 1.0, 2.0, 4.0], 'c': [1.0, 3.0, 2.0, 5.0]})
+        pd.testing.assert_frame_equal(correlation_matrix(df, min_periods=3), df.corr(min_periods=3), atol=1e-12, rtol=0)
+
+    def test_top_pairs(self):
+        pairs = CorrelationEngine.from_frame(self.sparse).top_pairs(2)
+        self.assertEqual(len(pairs), 2)
+        self.assertEqual((pairs.loc[0, 'column_a'], pairs.loc[0, 'column_b']), ('a', 'b'))
+        self.assertEqual(pairs.loc[0, 'observations'], self.sparse[['a', 'b']].dropna().shape[0])
+        self.assertGreaterEqual(abs(pairs.loc[0, 'correlation']), abs(pairs.loc[1, 'correlation']))
+        self.assertNotIn('c', set(pairs['column_a']) | set(pairs['column_b']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_analyzer import CleaningReport, DataAnalyzer, ReservoirQuantiles, column_quantiles, downcast_frame, duplicate_rows
+
+def csv_upload(df, name='data.csv'):
+    upload = io.BytesIO(df.to_csv(index=False).encode())
+    upload.name = name
+    return upload
+
+class TestChunkedIngestion(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 1000
+        self.df = pd.DataFrame({
+            'id': np.arange(n) % 900,
+            'region': rng.choice(['north', 'south', 'east'], n),
+            'price': rng.integers(0, 100, n) / 4,
+            'units': rng.integers(0, 50, n),
+        })
+        self.df.loc[::7, 'price'] = np.nan
+        self.df.loc[900:, 'region'] = 'north'
+        self.df.loc[900:, ['price', 'units']] = self.df.loc[:99, ['price', 'units']].to_numpy()
+
+    def test_chunked_load_matches_full_read(self):
+        analyzer = DataAnalyzer(chunksize=128)
+        chunked = analyzer.load_data(csv_upload(self.df))
+        full = pd.read_csv(csv_upload(self.df))
+
+        self.assertIsInstance(chunked['region'].dtype, pd.CategoricalDtype)
+        self.assertEqual(chunked['units'].dtype, np.uint8)
+        self.assertEqual(chunked['price'].dtype, np.float32)
+        pd.testing.assert_frame_equal(chunked, full, check_dtype=False, check_categorical=False)
+        self.assertLess(chunked.memory_usage(deep=True).sum(), full.memory_usage(deep=True).sum())
+
+    def test_incremental_stats_match_clean_data(self):
+        analyzer = DataAnalyzer(chunksize=128)
+        chunked = analyzer.load_data(csv_upload(self.df))
+        stats = analyzer.ingestion_stats
+        full = pd.read_csv(csv_upload(self.df))
+
+        self.assertEqual(stats.n_rows, len(full))
+        pd.testing.assert_series_equal(stats.missing.reindex(full.columns), full.isnull().sum(), check_dtype=False)
+        np.testing.assert_array_equal(stats.duplicate_mask(), full.duplicated().to_numpy())
+        self.assertEqual(len(analyzer.clean_data(chunked)), len(full.drop_duplicates()))
+
+    def test_ingestion_stats_only_profile_the_ingested_frame(self):
+        analyzer = DataAnalyzer(chunksize=128)
+        chunked = analyzer.load_data(csv_upload(self.df))
+        self.assertTrue(analyzer.profile_data(chunked).approximate)
+
+        # Same length, different rows: the ingestion statistics do not describe it
+        other = chunked.iloc[::-1].reset_index(drop=True)
+        report = analyzer.profile_data(other)
+        self.assertFalse(report.approximate)
+        np.testing.assert_array_equal(report.duplicate_mask, other.duplicated().to_numpy())
+
+    def test_clean_data_returns_frames_without_duplicates_as_is(self):
+        analyzer = DataAnalyzer()
+        unique = self.df.drop_duplicates().reset_index(drop=True)
+        self.assertIs(analyzer.clean_data(unique), unique)
+        self.assertEqual(len(analyzer.clean_data(self.df)), len(unique))
+
+    def test_reservoir_quantiles_track_stream(self):
+        sketch = ReservoirQuantiles(size=2000)
+        values = np.random.default_rng(1).normal(size=50000)
+        for start in range(0, len(values), 5000):
+            sketch.update(values[start:start + 5000])
+        self.assertEqual(sketch.seen, len(values))
+        self.assertAlmostEqual(sketch.quantile(0.25), np.quantile(values, 0.25), delta=0.1)
+
+    def test_downcast_keeps_lossy_floats(self):
+        df = downcast_frame(pd.DataFrame({'x': [0.1, 0.2], 'y': [-3, 200]}))
+        self.assertEqual(df['x'].dtype, np.float64)
+        self.assertEqual(df['y'].dtype, np.int16)
+
+class TestProfileData(unittest.TestCase):
+    def test_column_quantiles_match_pandas(self):
+        values = np.random.default_rng(2).normal(size=(501, 4))
+        values[::3, 1] = np.nan
+        values[:, 2] = np.nan
+        values[1:, 3] = np.nan
+        expected = pd.DataFrame(values).quantile([0.25, 0.75]).to_numpy()
+        np.testing.assert_allclose(column_quantiles(values), expected, equal_nan=True)
+
+    def test_report_matches_per_column_loop(self):
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame({
+            'a': rng.normal(size=300),
+            'b': rng.integers(0, 10, 300),
+            'c': rng.choice(['x', 'y', None], 300),
+        })
+        df.loc[::10, 'a'] = np.nan
+        df.loc[[5, 7], 'a'] = [40.0, -40.0]
+        df = pd.concat([df, df.iloc[:20]], ignore_index=True)
+
+        report = DataAnalyzer().profile_data(df, column_block=1)
+        self.assertIsInstance(report, CleaningReport)
+        self.assertEqual(report.duplicates, df.duplicated().sum())
+        pd.testing.assert_series_equal(report.missing['Missing Values'], df.isnull().sum(), check_names=False)
+
+        deduped = df.drop_duplicates()
+        for col in ['a', 'b']:
+            q1, q3 = deduped[col].quantile(0.25), deduped[col].quantile(0.75)
+            iqr = q3 - q1
+            expected = ((deduped[col] < q1 - 1.5 * iqr) | (deduped[col] > q3 + 1.5 * iqr)).sum()
+            self.assertEqual(report.outliers.loc[col, 'Outliers'], expected)
+            self.assertAlmostEqual(report.outliers.loc[col, 'Q1'], q1)
+        self.assertNotIn('c', report.outliers.index)
+
+    def test_duplicate_rows_confirms_hash_matches(self):
+        df = pd.DataFrame({'a': [1.0, np.nan, 1.0, np.nan, 2.0], 'b': ['x', 'y', 'x', 'y', 'x']})
+        np.testing.assert_array_equal(duplicate_rows(df), df.duplicated().to_numpy())
+        # Forced collisions must not mark distinct rows as duplicates
+        np.testing.assert_array_equal(duplicate_rows(df, np.zeros(len(df), dtype=np.uint64)), df.duplicated().to_numpy())
+
+    def test_clean_data_keeps_report(self):
+        analyzer = DataAnalyzer()
+        df = pd.DataFrame({'a': [1, 1, 2, 3], 'b': ['x', 'x', 'y', 'z']})
+        cleaned = analyzer.clean_data(df)
+        self.assertEqual(len(cleaned), 3)
+        self.assertEqual(analyzer.cleaning_report.duplicates, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.context_builder import estimate_tokens
+from src.correlation import CorrelationEngine
+from src.dataset_stats import compute_stats
+
+class TestDatasetStats(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        n = 2000
+        price = rng.uniform(1, 100, n)
+        cls.df = pd.DataFrame({
+            'region': rng.choice(['North', 'South', 'East'], n, p=[0.5, 0.3, 0.2]),
+            'customer': [f"C{i}" for i in range(n)],
+            'order_date': pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D'),
+            'price': price,
+            'revenue': price * 3 + rng.normal(0, 1, n)
+        })
+        cls.df.loc[::10, 'price'] = np.nan
+        engine = CorrelationEngine()
+        engine.update(cls.df)
+        cls.stats = compute_stats(cls.df, engine.top_pairs())
+
+    def test_column_statistics(self):
+        columns = {column['name']: column for column in self.stats.columns}
+        price = self.df['price']
+        np.testing.assert_allclose(columns['price']['quantiles'], price.quantile([0, 0.25, 0.5, 0.75, 1]))
+        self.assertAlmostEqual(columns['price']['mean'], price.mean())
+        self.assertAlmostEqual(columns['price']['null_rate'], 0.1)
+        self.assertEqual(columns['region']['top_values'][0], ('North', (self.df['region'] == 'North').mean()))
+        self.assertEqual(columns['customer']['distinct'], len(self.df))
+        self.assertEqual(columns['order_date']['range'], (self.df['order_date'].min(), self.df['order_date'].max()))
+
+    def test_group_means_skip_high_cardinality_columns(self):
+        self.assertEqual(list(self.stats.group_means), ['region'])
+        means = self.stats.group_means['region']
+        expected = self.df.groupby('region')['revenue'].mean()
+        np.testing.assert_allclose(means['revenue'], expected[means.index])
+        self.assertEqual(means['rows'].sum(), len(self.df))
+
+    def test_text_includes_correlations_and_respects_budget(self):
+        text = self.stats.text()
+        self.assertIn('price ~ revenue: +1.00', text)
+        self.assertIn('Means by region', text)
+
+        short = self.stats.text(token_budget=60)
+        self.assertLessEqual(estimate_tokens(short), 80)
+        self.assertIn('more lines omitted for length', short)
+        self.assertNotIn('Strongest correlations', short)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['sklearn', 'matplotlib', 'seaborn', 'scipy.stats', 'nltk', 'newspaper', 'googlesearch',
+                 'PyPDF2', 'docx']
+# Modules app.py imports before the first page render
+APP_MODULES = ['src.processing_cache', 'src.news_analyzer', 'src.rendering', 'src.context_builder',
+               'src.llm_client', 'src.jobs']
+
+def cold_import(modules):
+    """Import modules in a fresh interpreter; returns (seconds, heavy modules loaded)"""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {modules!r}: __import__(name)\n"
+        "seconds = time.perf_counter() - start\n"
+        f"print(json.dumps([seconds, [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+class TestImportTime(unittest.TestCase):
+    def test_package_import_is_lazy(self):
+        seconds, heavy = cold_import(['src'])
+        self.assertEqual(heavy, [])
+        self.assertLess(seconds, 0.5)
+
+    def test_app_modules_defer_heavy_dependencies(self):
+        seconds, heavy = cold_import(APP_MODULES)
+        self.assertEqual(heavy, [])
+        # pandas and requests account for most of this; sklearn alone used to add over a second
+        self.assertLess(seconds, 3.0)
+
+    def test_package_exports_load_on_access(self):
+        import src
+        from src.data_analyzer import DataAnalyzer
+        self.assertIs(src.DataAnalyzer, DataAnalyzer)
+        self.assertIn('create_visualization', dir(src))
+        with self.assertRaises(AttributeError):
+            src.missing_name
+
+if __name__ == '__main__':
+    unittest.main()
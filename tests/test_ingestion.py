@@ -0,0 +1,103 @@
+import io
+import os
+import tempfile
+import unittest
+import docx
+from src.data_analysis import DataAnalyzer
+from src.ingestion import extract_text, ingest_files, ingest_folder
+
+def make_pdf(pages):
+    """Minimal PDF with one line of Helvetica text per page"""
+    n = len(pages)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(n))
+               + b"] /Count %d >>" % n,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, text in enumerate(pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode() + b") Tj ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Contents %d 0 R >>" % (5 + 2 * i))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+def make_docx(paragraphs):
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+class CountingAnalyzer(DataAnalyzer):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def add_documents(self, documents):
+        self.batches.append([name for _, name, _ in documents])
+        super().add_documents(documents)
+
+class TestIngestion(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = self.dir.name
+        files = {
+            'lease.pdf': make_pdf(['Lease agreement for the warehouse', 'Termination clause applies']),
+            'supply.docx': make_docx(['Supplier contract', 'Renewal terms are annual']),
+            'notes.txt': b'Indemnity notes for the legal team',
+            'broken.pdf': b'not really a pdf',
+            'image.png': b'ignored'
+        }
+        for name, data in files.items():
+            with open(os.path.join(self.root, name), 'wb') as f:
+                f.write(data)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def test_extract_text_joins_pages_and_paragraphs(self):
+        with open(self.path('lease.pdf'), 'rb') as f:
+            self.assertEqual(extract_text(f, 'lease.pdf'), 'Lease agreement for the warehouse\nTermination clause applies')
+        with open(self.path('supply.docx'), 'rb') as f:
+            self.assertEqual(extract_text(f, 'supply.docx'), 'Supplier contract\nRenewal terms are annual\n')
+
+    def test_ingest_files_reports_failures_and_indexes_once(self):
+        analyzer = CountingAnalyzer()
+        names = ['lease.pdf', 'broken.pdf', 'supply.docx', 'missing.docx', 'notes.txt']
+        report = ingest_files([self.path(name) for name in names], analyzer, workers=2)
+
+        self.assertEqual([result.name for result in report.files], names)
+        self.assertEqual([result.name for result in report.failed], ['broken.pdf', 'missing.docx'])
+        self.assertEqual(analyzer.batches, [['lease.pdf', 'supply.docx', 'notes.txt']])
+        self.assertTrue(all(result.seconds >= 0 for result in report.files))
+        self.assertIn('FAILED', str(report))
+        self.assertEqual(analyzer.search('renewal terms', k=1)[0][2], 'supply.docx')
+
+    def test_uploaded_files_and_folders(self):
+        with open(self.path('notes.txt'), 'rb') as f:
+            upload = io.BytesIO(f.read())
+        upload.name = 'notes.txt'
+        report = ingest_files([upload], workers=1)
+        self.assertEqual(report.files[0].text, 'Indemnity notes for the legal team')
+
+        analyzer = DataAnalyzer()
+        report = ingest_folder(self.root, analyzer, workers=1)
+        self.assertEqual([result.name for result in report.files], ['broken.pdf', 'lease.pdf', 'notes.txt', 'supply.docx'])
+        self.assertEqual(analyzer.search('termination clause', k=1)[0][2], 'lease.pdf')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from src.jobs import CANCELLED, DONE, FAILED, RUNNING, TIMED_OUT, JobScheduler
+
+def stepping_job(steps, release):
+    """Job function publishing ``steps`` partial results, pausing on ``release`` before finishing"""
+    def run(job):
+        for step in range(steps):
+            job.publish(step)
+        while not release.wait(0.01):
+            if job.cancel_event.is_set():
+                return 'stopped'
+        return 'finished'
+    return run
+
+class TestJobScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = JobScheduler(max_workers=2)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.shutdown()
+
+    def wait_for(self, condition, timeout=2):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_same_key_shares_one_job_with_partial_results(self):
+        calls = []
+
+        def run(job):
+            calls.append(job.key)
+            return stepping_job(3, self.release)(job)
+
+        job = self.scheduler.submit(('news', 'abc'), run)
+        self.wait_for(lambda: len(job.partial) == 3)
+        self.assertEqual(job.status, RUNNING)
+        self.assertIs(self.scheduler.submit(('news', 'abc'), run), job)
+
+        self.release.set()
+        self.assertTrue(job.wait(2))
+        self.assertEqual((job.status, job.result, job.partial), (DONE, 'finished', [0, 1, 2]))
+        self.assertIs(self.scheduler.submit(('news', 'abc'), run), job)
+        self.assertEqual(calls, [('news', 'abc')])
+        self.assertEqual(self.scheduler.stats()['deduplicated'], 2)
+
+    def test_force_replaces_a_finished_job_but_not_a_running_one(self):
+        running = self.scheduler.submit('a', stepping_job(0, self.release))
+        self.assertIs(self.scheduler.submit('a', lambda job: 'other', force=True), running)
+        self.release.set()
+        self.assertTrue(running.wait(2))
+
+        refreshed = self.scheduler.submit('a', lambda job: 'refreshed', force=True)
+        self.assertIsNot(refreshed, running)
+        self.assertTrue(refreshed.wait(2))
+        self.assertEqual(refreshed.result, 'refreshed')
+
+    def test_cancel_and_timeout_stop_the_job_and_allow_a_retry(self):
+        job = self.scheduler.submit('a', stepping_job(1, self.release))
+        self.wait_for(lambda: job.partial)
+        self.assertTrue(self.scheduler.cancel('a'))
+        self.assertEqual(job.status, CANCELLED)
+        self.assertTrue(job.cancel_event.is_set())
+        self.assertIsNone(job.result)
+
+        slow = self.scheduler.submit('b', stepping_job(0, self.release), timeout=0.05)
+        self.assertTrue(slow.wait(2))
+        self.assertEqual(slow.status, TIMED_OUT)
+
+        retry = self.scheduler.submit('a', lambda job: 'again')
+        self.assertIsNot(retry, job)
+        self.assertTrue(retry.wait(2))
+        self.assertEqual(retry.result, 'again')
+
+    def test_failures_are_recorded_and_queued_jobs_can_be_cancelled(self):
+        def fail(job):
+            raise ValueError('no news')
+
+        failed = self.scheduler.submit('fail', fail)
+        self.assertTrue(failed.wait(2))
+        self.assertEqual(failed.status, FAILED)
+        self.assertIsInstance(failed.error, ValueError)
+
+        busy = [self.scheduler.submit(key, stepping_job(0, self.release)) for key in ('x', 'y')]
+        queued = self.scheduler.submit('z', lambda job: 'ran')
+        self.assertTrue(queued.cancel())
+        self.release.set()
+        self.assertTrue(all(job.wait(2) for job in busy))
+        self.assertEqual((queued.status, queued.result), (CANCELLED, None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.keywords import rank_keywords
+from src.news_analyzer import NewsAnalyzer
+
+class TestRankKeywords(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 3000
+        self.df = pd.DataFrame({
+            'order_id': [f"ORD-{i}" for i in range(n)],
+            'reference': [f"REF{i:06d}" for i in rng.permutation(n)],
+            'company': rng.choice(['Apple', 'Tesla', 'Nvidia'], n, p=[0.6, 0.3, 0.1]),
+            'comment': rng.choice(['Battery supply delays slowed vehicle deliveries this quarter',
+                                   'Strong chip demand lifted data center revenue again'], n),
+            'price': rng.uniform(1, 100, n)
+        })
+
+    def test_values_ranked_by_frequency_and_ids_skipped(self):
+        ranked = rank_keywords(self.df)
+        keywords = [keyword for keyword, _ in ranked]
+        self.assertEqual(keywords[:3], ['Apple', 'Tesla', 'Nvidia'])
+        self.assertFalse(any(keyword.startswith(('ORD-', 'REF')) for keyword in keywords))
+        self.assertNotIn('order_id', keywords)
+        self.assertIn('price trend', keywords)
+        scores = [score for _, score in ranked]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_free_text_terms_only_with_tfidf(self):
+        plain = [keyword for keyword, _ in rank_keywords(self.df)]
+        self.assertFalse(any('battery' in keyword.lower() for keyword in plain))
+        with_terms = [keyword for keyword, _ in rank_keywords(self.df, tfidf=True)]
+        self.assertIn('battery', with_terms)
+        self.assertIn('chip', with_terms)
+
+    def test_deterministic_and_capped(self):
+        shuffled = self.df.sample(frac=1, random_state=1)[self.df.columns[::-1]]
+        self.assertEqual(rank_keywords(self.df, max_keywords=4), rank_keywords(self.df, max_keywords=4))
+        self.assertEqual([k for k, _ in rank_keywords(shuffled)][:3], ['Apple', 'Tesla', 'Nvidia'])
+        self.assertEqual(len(rank_keywords(self.df, max_keywords=4)), 4)
+
+    def test_extract_keywords_puts_dataset_before_defaults(self):
+        keywords = NewsAnalyzer().extract_keywords(self.df)
+        self.assertEqual(keywords[0], 'Apple')
+        self.assertIn('stock market', keywords)
+        self.assertLess(keywords.index('company'), keywords.index('stock market'))
+
+    def test_defaults_are_not_cut_by_max_keywords(self):
+        analyzer = NewsAnalyzer()
+        keywords = analyzer.extract_keywords(self.df, max_keywords=3)
+        defaults = [keyword for group in analyzer.default_keywords.values() for keyword in group]
+        self.assertEqual(keywords[:3], ['Apple', 'Tesla', 'Nvidia'])
+        self.assertEqual(keywords[3:], list(dict.fromkeys(defaults)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import threading
+import unittest
+from src.lazy_results import LazyResult, LazyResults
+
+class TestLazyResults(unittest.TestCase):
+    def test_computes_once_in_background_with_progress(self):
+        release = threading.Event()
+        calls = []
+
+        def compute(report):
+            calls.append(threading.current_thread().name)
+            report(0.5, 'halfway')
+            release.wait(5)
+            return 42
+
+        result = LazyResult('answer', compute)
+        self.assertFalse(result.started)
+        result.start()
+        result.start()
+        while result.progress < 0.5:
+            pass
+        self.assertEqual(result.message, 'halfway')
+        self.assertFalse(result.done())
+        release.set()
+
+        self.assertEqual(result.result(timeout=5), 42)
+        self.assertEqual(result.result(), 42)
+        self.assertEqual(calls, ['lazy-answer'])
+        self.assertEqual(result.progress, 1.0)
+        self.assertGreaterEqual(result.seconds, 0)
+
+    def test_errors_are_reraised_and_excluded_from_values(self):
+        def fail(report):
+            raise ValueError('bad data')
+
+        results = LazyResults()
+        results.register('broken', fail)
+        results.register('fine', lambda report: 'ok')
+        with self.assertRaises(ValueError):
+            results.get('broken').result(timeout=5)
+        results.get('fine').result(timeout=5)
+
+        self.assertEqual(results.values(), {'fine': 'ok'})
+        self.assertEqual(set(results.timings()), {'broken', 'fine'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.llm_client import GeminiClient, LLMError
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    # Statuses to return before answering, keyed by prompt
+    failures = {}
+    calls = []
+    delay = 0.0
+    chunk_delay = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['contents'][0]['parts'][0]['text']
+        StubGeminiHandler.calls.append(prompt)
+        time.sleep(self.delay)
+        pending = self.failures.get(prompt)
+        if pending:
+            status = pending.pop(0)
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.end_headers()
+            self.wfile.write(b'{"error": "stub"}')
+            return
+        if ':streamGenerateContent' in self.path:
+            self.stream_words(prompt)
+            return
+        payload = json.dumps({
+            'candidates': [{'content': {'parts': [{'text': f"Answer to {prompt}"}]}}],
+            'usageMetadata': {'promptTokenCount': 7, 'candidatesTokenCount': 3}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream_words(self, prompt):
+        words = [] if prompt == 'silence' else f"Streamed answer to {prompt}".split()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        try:
+            if prompt == 'garbled':
+                self.wfile.write(b"data: {not json\r\n\r\n")
+                return
+            for i, word in enumerate(words):
+                time.sleep(self.chunk_delay)
+                candidate = {'content': {'parts': [{'text': word + ' '}]}}
+                if i == len(words) - 1:
+                    candidate['finishReason'] = 'STOP'
+                event = {
+                    'candidates': [candidate],
+                    'usageMetadata': {'promptTokenCount': 7, 'candidatesTokenCount': i + 1}
+                }
+                self.wfile.write(f"data: {json.dumps(event)}\r\n\r\n".encode())
+                self.wfile.flush()
+            if not words:
+                self.wfile.write(b'data: {"candidates": [{"finishReason": "SAFETY"}]}\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+class TestGeminiClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGeminiHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}/v1beta/models"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubGeminiHandler.failures = {}
+        StubGeminiHandler.calls = []
+        StubGeminiHandler.delay = 0.0
+        StubGeminiHandler.chunk_delay = 0.0
+        self.sleeps = []
+        self.client = GeminiClient('test-key', base_url=self.base, sleep=self.sleeps.append)
+
+    def test_retries_transient_statuses(self):
+        StubGeminiHandler.failures = {'flaky': [429, 503]}
+        self.assertEqual(self.client.generate('flaky'), 'Answer to flaky')
+        stats = self.client.stats()
+        self.assertEqual((stats['requests'], stats['retries'], stats['errors']), (3, 2, 0))
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertTrue(all(0 <= delay <= self.client.max_backoff for delay in self.sleeps))
+
+    def test_client_errors_are_not_retried(self):
+        StubGeminiHandler.failures = {'bad': [400]}
+        with self.assertRaises(LLMError):
+            self.client.generate('bad')
+        self.assertEqual(StubGeminiHandler.calls, ['bad'])
+        self.assertEqual(self.client.stats()['errors'], 1)
+
+    def test_gives_up_after_max_retries(self):
+        StubGeminiHandler.failures = {'down': [503] * 10}
+        client = GeminiClient('test-key', base_url=self.base, max_retries=2, sleep=self.sleeps.append)
+        with self.assertRaises(LLMError):
+            client.generate('down')
+        self.assertEqual(len(StubGeminiHandler.calls), 3)
+
+    def test_repeated_prompt_is_served_from_cache(self):
+        first = self.client.generate('hello')
+        second = self.client.generate('hello')
+        self.assertEqual(first, second)
+        self.assertEqual(StubGeminiHandler.calls, ['hello'])
+        stats = self.client.stats()
+        self.assertEqual(stats['cache']['hits'], 1)
+        self.assertEqual((stats['prompt_tokens'], stats['response_tokens']), (7, 3))
+        self.assertIsNotNone(stats['latency_p95'])
+
+    def test_concurrent_identical_prompts_share_one_request(self):
+        StubGeminiHandler.delay = 0.3
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            answers = list(pool.map(self.client.generate, ['same'] * 5))
+        self.assertEqual(set(answers), {'Answer to same'})
+        self.assertEqual(StubGeminiHandler.calls, ['same'])
+        stats = self.client.stats()
+        self.assertEqual(stats['coalesced'] + stats['cache']['hits'], 4)
+
+    def test_stream_yields_chunks_and_caches_full_answer(self):
+        StubGeminiHandler.chunk_delay = 0.05
+        chunks = list(self.client.stream('tell me'))
+        self.assertEqual(chunks, ['Streamed ', 'answer ', 'to ', 'tell ', 'me '])
+        stats = self.client.stats()
+        self.assertLess(stats['first_token_p50'], stats['latency_p50'])
+        self.assertEqual((stats['prompt_tokens'], stats['response_tokens']), (7, 5))
+        self.assertEqual(list(self.client.stream('tell me')), ['Streamed answer to tell me '])
+        self.assertEqual(self.client.generate('tell me'), 'Streamed answer to tell me ')
+        self.assertEqual(StubGeminiHandler.calls, ['tell me'])
+
+    def test_stream_retries_before_first_chunk(self):
+        StubGeminiHandler.failures = {'busy': [503]}
+        self.assertEqual(''.join(self.client.stream('busy')), 'Streamed answer to busy ')
+        self.assertEqual(self.client.stats()['retries'], 1)
+
+    def test_cancelled_stream_stops_early_and_is_not_cached(self):
+        StubGeminiHandler.chunk_delay = 0.1
+        cancel = threading.Event()
+        chunks = []
+        for chunk in self.client.stream('a long question', cancel):
+            chunks.append(chunk)
+            cancel.set()
+        self.assertEqual(chunks, ['Streamed '])
+        self.assertEqual(self.client.stats()['cancelled'], 1)
+        self.assertIsNone(self.client.cache.get(self.client.cache_key('a long question')))
+
+    def test_closed_stream_is_not_cached(self):
+        StubGeminiHandler.chunk_delay = 0.1
+        stream = self.client.stream('stop me')
+        self.assertEqual(next(stream), 'Streamed ')
+        stream.close()
+        self.assertIsNone(self.client.cache.get(self.client.cache_key('stop me')))
+
+    def test_empty_and_malformed_streams_are_not_cached(self):
+        self.assertEqual(list(self.client.stream('silence')), [])
+        self.assertIsNone(self.client.cache.get(self.client.cache_key('silence')))
+        with self.assertRaises(LLMError):
+            list(self.client.stream('garbled'))
+        self.assertIsNone(self.client.cache.get(self.client.cache_key('garbled')))
+        self.assertEqual(self.client.stats()['errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
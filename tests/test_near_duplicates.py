@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from src.near_duplicates import DuplicateFilter, cluster_near_duplicates, minhash_signatures, shingle_hashes
+
+def random_story(rng, words=300):
+    return ' '.join(f"w{i}" for i in rng.integers(0, 5000, words))
+
+def syndicate(rng, story, edits=3):
+    """Copy of a story with a byline and a few words changed, as another site would run it"""
+    words = story.split()
+    for position in rng.integers(0, len(words), edits):
+        words[position] = 'edited'
+    return 'Reported by Wire Service. ' + ' '.join(words)
+
+class TestNearDuplicates(unittest.TestCase):
+    def test_signatures_estimate_jaccard(self):
+        a = ' '.join(f"w{i}" for i in range(400))
+        b = ' '.join(f"w{i}" for i in range(100, 500))
+        shingles_a, shingles_b = shingle_hashes(a), shingle_hashes(b)
+        exact = len(np.intersect1d(shingles_a, shingles_b)) / len(np.union1d(shingles_a, shingles_b))
+        signatures = minhash_signatures([a, b], num_perm=256)
+        self.assertAlmostEqual(np.mean(signatures[0] == signatures[1]), exact, delta=0.08)
+
+    def test_clusters_syndicated_copies_under_first_member(self):
+        rng = np.random.default_rng(0)
+        stories = [random_story(rng) for _ in range(50)]
+        texts = stories + [syndicate(rng, stories[i]) for i in range(10)] + [syndicate(rng, stories[3])]
+        labels = cluster_near_duplicates(texts)
+        self.assertEqual(labels[:50], list(range(50)))
+        self.assertEqual(labels[50:], list(range(10)) + [3])
+
+    def test_empty_and_unrelated_texts_stay_apart(self):
+        self.assertEqual(cluster_near_duplicates(['', '', 'Markets rallied on strong chip demand.',
+                                                  'Rain is expected across the north tomorrow.']), [0, 1, 2, 3])
+        self.assertEqual(cluster_near_duplicates(['Same words here.', 'same words HERE']), [0, 0])
+
+    def test_duplicate_filter_remembers_new_texts_only(self):
+        rng = np.random.default_rng(1)
+        story, other = random_story(rng), random_story(rng)
+        seen = DuplicateFilter()
+        self.assertEqual([seen.add(text) for text in (story, syndicate(rng, story), other, '', '')],
+                         [True, False, True, True, True])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,7 +26,8 @@ class TestNewsAnalyzer(unittest.TestCase):
         })
         result = self.analyzer.analyze_sentiment(test_articles)
         self.assertIsInstance(result, pd.DataFrame)
-        self.assertTrue('sentiment' in result.columns)
+        for col in ['compound', 'pos', 'neg', 'neu']:
+            self.assertEqual(result[col].dtype, np.float64)
 
     def test_get_impact_analysis(self):
         test_articles = pd.DataFrame({
@@ -41,5 +42,32 @@ class TestNewsAnalyzer(unittest.TestCase):
         self.assertTrue('sentiment' in result.columns)
         self.assertTrue('confidence' in result.columns)
 
+    def test_score_sentiment_batch(self):
+        texts = [
+            'Profits soared. The launch was a great success!',
+            'The outlook is terrible. Losses keep growing.',
+            ''
+        ]
+        scores = self.analyzer.score_sentiment_batch(texts)
+        self.assertEqual(list(scores.columns), ['compound', 'pos', 'neg', 'neu'])
+        self.assertGreater(scores['compound'][0], 0)
+        self.assertLess(scores['compound'][1], 0)
+        self.assertEqual(scores.iloc[2].tolist(), [0.0, 0.0, 0.0, 1.0])
+
+        parallel = self.analyzer.score_sentiment_batch(texts * 20, workers=2, chunk_size=10)
+        np.testing.assert_allclose(parallel.iloc[:3].to_numpy(), scores.to_numpy())
+
+    def test_impact_from_flat_columns(self):
+        test_articles = pd.DataFrame({
+            'title': ['Up', 'Down', 'Flat'],
+            'summary': ['', '', ''],
+            'compound': [0.6, -0.4, 0.1],
+            'source': ['a.com', 'b.com', 'c.com'],
+            'url': ['http://a.com', 'http://b.com', 'http://c.com']
+        })
+        result = self.analyzer.get_impact_analysis(test_articles)
+        self.assertEqual(result['sentiment'].tolist(), ['Positive', 'Negative', 'Neutral'])
+        np.testing.assert_allclose(result['confidence'], [0.6, 0.4, 0.1])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
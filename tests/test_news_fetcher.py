@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.news_analyzer import NewsAnalyzer
+from src.news_fetcher import ArticleFetcher
+
+ARTICLE_HTML = """<html><head><title>{title}</title></head><body><article><h1>{title}</h1>
+{paragraphs}</article></body></html>"""
+
+class StubNewsHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(2)
+        time.sleep(self.delay)
+        if not self.path.startswith(('/article', '/slow')):
+            self.send_error(404)
+            return
+        title = f"Story {self.path.rsplit('/', 1)[-1]}"
+        paragraph = f"<p>{title} covers markets, trading volumes and the wider economy in detail today.</p>"
+        body = ARTICLE_HTML.format(title=title, paragraphs=paragraph * 6).encode()
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # the client cancelled or timed out
+
+    def log_message(self, *args):
+        pass
+
+class TestArticleFetcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubNewsHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_fetch_all_skips_failures_and_timeouts(self):
+        fetcher = ArticleFetcher(timeout=0.5, nlp=False)
+        urls = [f"{self.base}/article/1", f"{self.base}/missing", f"{self.base}/slow/2", f"{self.base}/article/3"]
+        articles = fetcher.fetch_all(urls)
+        self.assertEqual(sorted(articles), [urls[0], urls[3]])
+        self.assertEqual(articles[urls[0]]['title'], 'Story 1')
+        self.assertIn('markets', articles[urls[3]]['text'])
+
+    def test_fetch_all_streams_articles_and_stops_on_cancel(self):
+        fetcher = ArticleFetcher(timeout=5, nlp=False)
+        urls = [f"{self.base}/article/1", f"{self.base}/slow/2"]
+        cancel = threading.Event()
+        arrived = []
+
+        def on_article(article):
+            arrived.append(article['title'])
+            cancel.set()
+
+        start = time.perf_counter()
+        articles = fetcher.fetch_all(urls, on_article=on_article, cancel=cancel)
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertEqual(arrived, ['Story 1'])
+        self.assertEqual(list(articles), [urls[0]])
+
+    def test_search_news_keeps_search_order(self):
+        results = {
+            'alpha': [f"{self.base}/article/1", f"{self.base}/article/2"],
+            'beta': [f"{self.base}/article/3", f"{self.base}/article/1"],
+        }
+
+        def fake_search(query, num_results):
+            return results[query.split()[0]][:num_results]
+
+        analyzer = NewsAnalyzer(search_fn=fake_search, fetcher=ArticleFetcher(nlp=False))
+        news = analyzer.search_news(['alpha', 'beta'], num_articles=2)
+        self.assertEqual(news['title'].tolist(), ['Story 1', 'Story 2', 'Story 3', 'Story 1'])
+        self.assertEqual(news['source'].iloc[0], f"127.0.0.1:{self.server.server_address[1]}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import io
+import unittest
+from unittest import mock
+import pandas as pd
+from src.correlation import CorrelationEngine
+from src.processing_cache import ProcessedDataset, ProcessingCache
+
+def csv_upload(df, name='data.csv', file_id=None):
+    upload = io.BytesIO(df.to_csv(index=False).encode())
+    upload.name = name
+    upload.file_id = file_id
+    return upload
+
+class FakeDataset:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+        self.build_seconds = 1.0
+
+class TestProcessingCache(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'region': ['north', 'south', 'north', 'east'],
+            'sales': [10.0, 20.0, 10.0, 40.0],
+            'units': [1, 2, 1, 4]
+        })
+
+    def test_reruns_reuse_processed_upload(self):
+        cache = ProcessingCache()
+        first = cache.process(csv_upload(self.df))
+        second = cache.process(csv_upload(self.df))
+
+        self.assertIsInstance(first, ProcessedDataset)
+        self.assertIs(first, second)
+        self.assertEqual(len(first.df), 3)
+        self.assertIn('sales', first.correlation.columns)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertGreater(cache.stats()['seconds_saved'], 0)
+
+    def test_options_and_content_are_part_of_the_key(self):
+        cache = ProcessingCache()
+        cache.process(csv_upload(self.df))
+        cache.process(csv_upload(self.df), chunksize=2)
+        cache.process(csv_upload(self.df.iloc[:2]))
+        self.assertEqual(cache.stats()['misses'], 3)
+        self.assertEqual(len(cache), 3)
+
+    def test_search_index_is_built_lazily(self):
+        dataset = ProcessingCache().process(csv_upload(self.df))
+        self.assertFalse(any(dataset.results[name].started for name in ('summary', 'search', 'query')))
+        # Prompt statistics, and the correlations they include, start at load
+        self.assertIn('units', dataset.stats.text())
+        frame_bytes = dataset.nbytes
+        results = dataset.search.search('east', k=1)
+        self.assertEqual(results[0][2], 'data.csv row 3')
+        self.assertIs(dataset.search, dataset.search)
+        self.assertGreater(dataset.nbytes, frame_bytes)
+        self.assertEqual(set(dataset.results.timings()), {'correlation', 'stats', 'search'})
+
+    def test_prompt_statistics_survive_a_failed_correlation(self):
+        with mock.patch.object(CorrelationEngine, 'update', side_effect=MemoryError('too wide')):
+            dataset = ProcessingCache().process(csv_upload(self.df))
+            self.assertIn('units', dataset.stats.text())
+        with self.assertRaises(MemoryError):
+            dataset.correlation
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        sizes = {'a': 40, 'b': 40, 'c': 40}
+        cache = ProcessingCache(max_bytes=100, processor=lambda upload, source_hash, **options: FakeDataset(sizes[upload.name]))
+        uploads = {name: csv_upload(self.df, name, file_id=name) for name in sizes}
+        cache.source_hash = lambda upload: upload.name
+
+        cache.process(uploads['a'])
+        cache.process(uploads['b'])
+        cache.process(uploads['a'])
+        cache.process(uploads['c'])
+
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertIsNotNone(cache.get(('a', ())))
+        self.assertIsNone(cache.get(('b', ())))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.query_engine import QueryEngine
+
+class TestQueryEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        n = 5000
+        cls.df = pd.DataFrame({
+            'region': rng.choice(['North', 'South', 'East', 'West'], n),
+            'product': rng.choice([f"P{i}" for i in range(20)], n),
+            'order_date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 1095, n), unit='D'),
+            'unit_price': rng.uniform(1, 100, n).round(2),
+            'quantity': rng.integers(1, 20, n),
+            'net_sales': rng.normal(100, 30, n)
+        })
+        cls.engine = QueryEngine(cls.df)
+
+    def test_group_mean(self):
+        answer = self.engine.answer("What is the average net sales by region?")
+        expected = self.df.groupby('region')['net_sales'].mean().sort_values(ascending=False)
+        self.assertEqual(answer.table['region'].tolist(), expected.index.tolist())
+        np.testing.assert_allclose(answer.table.iloc[:, 1], expected.values)
+
+    def test_year_filter_on_dates(self):
+        answer = self.engine.answer("max unit price in 2023")
+        expected = self.df.loc[self.df['order_date'].dt.year == 2023, 'unit_price'].max()
+        self.assertEqual(answer.value, expected)
+        self.assertIn('2023', answer.text)
+
+    def test_text_dates_are_parsed_for_year_filters(self):
+        df = self.df.assign(order_date=self.df['order_date'].dt.strftime('%Y-%m-%d'))
+        answer = QueryEngine(df).answer("total quantity in 2022")
+        self.assertEqual(answer.value, self.df.loc[self.df['order_date'].dt.year == 2022, 'quantity'].sum())
+
+    def test_comparison_and_category_filters(self):
+        answer = self.engine.answer("how many orders in North where quantity > 10")
+        expected = ((self.df['region'] == 'North') & (self.df['quantity'] > 10)).sum()
+        self.assertEqual(answer.value, expected)
+
+        answer = self.engine.answer("average unit price for north and south")
+        mask = self.df['region'].isin(['North', 'South'])
+        self.assertAlmostEqual(answer.value, self.df.loc[mask, 'unit_price'].mean())
+
+    def test_top_groups_and_rows(self):
+        answer = self.engine.answer("top 3 products by net sales")
+        expected = self.df.groupby('product')['net_sales'].sum().nlargest(3)
+        self.assertEqual(answer.table['product'].tolist(), expected.index.tolist())
+
+        answer = self.engine.answer("bottom 2 rows by unit price")
+        self.assertEqual(answer.table.index.tolist(), self.df['unit_price'].nsmallest(2).index.tolist())
+
+    def test_which_group_is_highest(self):
+        answer = self.engine.answer("which region has the highest average net sales")
+        leader = self.df.groupby('region')['net_sales'].mean().idxmax()
+        self.assertTrue(answer.text.startswith(f"{leader} has the highest average net_sales"))
+
+    def test_counts_of_text_columns_are_distinct_values(self):
+        for question in ["how many regions are there?", "count the distinct regions", "how many products in 2022"]:
+            answer = self.engine.answer(question)
+            column = 'region' if 'region' in question else 'product'
+            mask = self.df['order_date'].dt.year == 2022 if '2022' in question else slice(None)
+            self.assertEqual(answer.value, self.df.loc[mask, column].nunique(), question)
+        self.assertEqual(self.engine.answer("how many rows are there").value, len(self.df))
+
+    def test_counts_and_rankings_without_a_target_fall_back(self):
+        for question in ["top 3 count", "count of rows top 2", "how many customers do we have"]:
+            self.assertIsNone(self.engine.answer(question), question)
+
+    def test_open_questions_fall_back(self):
+        for question in ["tell me about this data", "summarize the main trends", "average by region"]:
+            self.assertIsNone(self.engine.answer(question), question)
+
+if __name__ == '__main__':
+    unittest.main()
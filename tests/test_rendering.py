@@ -0,0 +1,58 @@
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from src.rendering import ChartRenderer, dataset_hash
+
+class TestChartRenderer(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({'g': rng.choice(['a', 'b'], 200), 'x': rng.normal(size=200), 'y': rng.normal(size=200)})
+        plt.close('all')
+
+    def test_render_caches_bytes_and_closes_figures(self):
+        renderer = ChartRenderer()
+        first = renderer.render(self.df, 'Scatter Plot', 'x', 'y', data_hash='data')
+        second = renderer.render(self.df, 'Scatter Plot', 'x', 'y', data_hash='data')
+        renderer.render(self.df, 'Scatter Plot', 'y', 'x', data_hash='data')
+
+        self.assertTrue(first.startswith(b'\x89PNG'))
+        self.assertIs(first, second)
+        self.assertEqual(renderer.stats()['hits'], 1)
+        self.assertEqual(renderer.stats()['misses'], 2)
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_failed_charts_close_their_figures(self):
+        renderer = ChartRenderer()
+        for _ in range(3):
+            self.assertIsNone(renderer.render(self.df, 'Box Plot', 'g', 'missing', data_hash='data'))
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_svg_output_and_dict_options(self):
+        renderer = ChartRenderer(fmt='svg')
+        image = renderer.render(self.df, 'Line Chart', 'x', 'y', budgets={'Line Chart': 50})
+        self.assertIn(b'<svg', image[:500])
+        self.assertIs(renderer.render(self.df, 'Line Chart', 'x', 'y', budgets={'Line Chart': 50}), image)
+
+    def test_dataset_hash_tracks_content(self):
+        self.assertEqual(dataset_hash(self.df), dataset_hash(self.df.copy()))
+        self.assertNotEqual(dataset_hash(self.df), dataset_hash(self.df.iloc[::-1]))
+
+    def test_batch_renders_in_workers(self):
+        renderer = ChartRenderer()
+        specs = [
+            {'chart_type': 'Bar Chart', 'x_col': 'g', 'y_col': 'y'},
+            {'chart_type': 'Histogram', 'x_col': 'x'},
+            {'chart_type': 'Box Plot', 'x_col': 'g', 'y_col': 'x'},
+        ]
+        cached = renderer.render(self.df, 'Histogram', 'x', data_hash='data')
+        images = renderer.render_batch(self.df, specs, data_hash='data', workers=2)
+
+        self.assertTrue(all(image.startswith(b'\x89PNG') for image in images))
+        self.assertIs(images[1], cached)
+        self.assertIs(renderer.render(self.df, 'Box Plot', 'g', 'x', data_hash='data'), images[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from src.data_analysis import DataAnalyzer
+from src.retrieval import ExactBackend, IVFBackend, RetrievalBackend
+from src.search_index import IncrementalTfidfIndex
+
+class TestRetrievalBackends(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        topics = [[f"topic{t}word{w}" for w in range(30)] for t in range(10)]
+        self.docs = [" ".join(rng.choice(topics[i % 10], 12)) for i in range(600)]
+        self.index = IncrementalTfidfIndex()
+        self.index.add_documents(self.docs)
+        self.queries = self.index.transform(["topic1word3 topic1word7", "topic8word2"])
+
+    def test_backends_must_implement_build_and_search(self):
+        class BuildOnly(RetrievalBackend):
+            def build(self, index):
+                self.index = index
+
+        with self.assertRaises(TypeError):
+            BuildOnly()
+
+    def test_probing_every_cell_matches_exact(self):
+        exact = ExactBackend()
+        exact.build(self.index)
+        ivf = IVFBackend(n_components=8, n_clusters=12, n_probe=12, min_docs=0)
+        ivf.build(self.index)
+        _, exact_scores = exact.search(self.queries, k=5)
+        _, ivf_scores = ivf.search(self.queries, k=5)
+        np.testing.assert_allclose(ivf_scores, exact_scores)
+
+    def test_few_probes_find_topic_documents(self):
+        ivf = IVFBackend(n_components=8, n_clusters=12, n_probe=2, min_docs=0)
+        ivf.build(self.index)
+        indices, scores = ivf.search(self.queries, k=5)
+        self.assertTrue(all(i % 10 == 1 for i in indices[0]))
+        self.assertTrue(np.all(scores > 0))
+
+    def test_small_corpus_falls_back_to_exact(self):
+        ivf = IVFBackend(min_docs=10000)
+        ivf.build(self.index)
+        self.assertIsNone(ivf.svd)
+        self.assertEqual(ivf.search(self.queries, k=3)[0].shape, (2, 3))
+
+    def test_analyzer_rebuilds_backend_after_adds(self):
+        analyzer = DataAnalyzer(backend=IVFBackend(n_components=8, n_clusters=12, min_docs=0))
+        for i, doc in enumerate(self.docs):
+            analyzer._add_document(doc, f"doc{i}.pdf")
+        self.assertEqual(analyzer.search("topic4word1", k=1)[0][0] % 10, 4)
+
+        analyzer._add_document("a brand new contract clause", "new.docx")
+        hits = analyzer.search("contract clause", k=1)
+        self.assertEqual(hits[0][2], "new.docx")
+        self.assertEqual(analyzer.backend.n_docs, len(self.docs) + 1)
+
+if __name__ == '__main__':
+    unittest.main()
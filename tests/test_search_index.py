@@ -0,0 +1,200 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from src.data_analysis import DataAnalyzer
+from src.search_index import IncrementalTfidfIndex, IndexStore, iter_serialized_rows, serialize_rows, top_k
+
+class TestIncrementalTfidfIndex(unittest.TestCase):
+    def setUp(self):
+        self.texts = [
+            'Quarterly revenue grew in the north region',
+            'The south region reported lower revenue',
+            'Marketing spend increased across all regions',
+            'Contract renewal terms for the north office',
+            'Employee headcount and hiring plans for next year'
+        ]
+
+    def test_matches_full_refit(self):
+        index = IncrementalTfidfIndex()
+        for text in self.texts:
+            index.add_documents([text])
+
+        vectorizer = TfidfVectorizer()
+        expected_matrix = vectorizer.fit_transform(self.texts)
+        for query in ['north revenue', 'hiring plans', 'unknown words only']:
+            expected = cosine_similarity(vectorizer.transform([query]), expected_matrix).ravel()
+            np.testing.assert_allclose(index.similarities(query), expected, atol=1e-12)
+
+    def test_batch_and_incremental_adds_agree(self):
+        batch = IncrementalTfidfIndex()
+        batch.add_documents(self.texts)
+        incremental = IncrementalTfidfIndex()
+        incremental.add_documents(self.texts[:2])
+        incremental.similarities('revenue')
+        incremental.add_documents(self.texts[2:])
+        np.testing.assert_allclose(incremental.similarities('north region'), batch.similarities('north region'))
+        self.assertEqual(len(incremental), len(self.texts))
+
+    def test_search_documents_after_adding_documents(self):
+        analyzer = DataAnalyzer()
+        for i, text in enumerate(self.texts):
+            analyzer._add_document(text, f'doc{i}.pdf')
+        results = analyzer.search_documents('hiring plans next year', k=2)
+        self.assertEqual(results[0], self.texts[4])
+        self.assertEqual(analyzer.tfidf_matrix.shape[0], len(self.texts))
+
+def is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+class TestTopK(unittest.TestCase):
+    def test_blocked_selection_matches_full_sort(self):
+        rng = np.random.default_rng(0)
+        matrix = sp.random(500, 40, density=0.1, format='csr', random_state=rng)
+        queries = sp.random(3, 40, density=0.3, format='csr', random_state=rng)
+        expected_scores = (matrix @ queries.T).toarray().T
+        for block_size in [7, 64, 1000]:
+            indices, scores = top_k(matrix, queries, k=10, block_size=block_size)
+            self.assertEqual(indices.shape, (3, 10))
+            for q in range(3):
+                np.testing.assert_allclose(scores[q], np.sort(expected_scores[q])[::-1][:10])
+                np.testing.assert_allclose(expected_scores[q][indices[q]], scores[q])
+
+    def test_k_larger_than_corpus(self):
+        matrix = sp.identity(3, format='csr')
+        indices, scores = top_k(matrix, sp.csr_matrix([[0.0, 1.0, 0.0]]), k=5)
+        self.assertEqual(indices.tolist(), [[1, 0, 2]])
+        self.assertEqual(scores.tolist(), [[1.0, 0.0, 0.0]])
+
+    def test_analyzer_batch_search_returns_sources(self):
+        analyzer = DataAnalyzer()
+        analyzer._add_document('north region revenue', 'north.pdf')
+        analyzer._add_document('south region costs', 'south.docx')
+        results = analyzer.search(['revenue', 'costs'], k=1)
+        self.assertEqual([hits[0][0] for hits in results], [0, 1])
+        self.assertEqual([hits[0][2] for hits in results], ['north.pdf', 'south.docx'])
+        self.assertGreater(results[0][0][1], 0)
+
+class TestIndexPersistence(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.texts = ['alpha beta gamma', 'beta delta', 'gamma gamma epsilon', 'caf\u00e9 \u00fcber alpha']
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_is_memory_mapped(self):
+        index = IncrementalTfidfIndex()
+        index.add_documents(self.texts)
+        store = IndexStore(self.tmp.name)
+        store.save('key', index, self.texts)
+
+        loaded, texts = store.load('key')
+        self.assertTrue(is_memory_mapped(loaded.matrix.data))
+        self.assertEqual(list(texts), self.texts)
+        np.testing.assert_allclose(loaded.similarities('gamma alpha'), index.similarities('gamma alpha'))
+
+    def test_append_after_load_matches_fresh_build(self):
+        index = IncrementalTfidfIndex()
+        index.add_documents(self.texts[:3])
+        index.save(self.tmp.name)
+
+        loaded = IncrementalTfidfIndex.load(self.tmp.name)
+        loaded.add_documents(self.texts[3:])
+        fresh = IncrementalTfidfIndex()
+        fresh.add_documents(self.texts)
+        np.testing.assert_allclose(loaded.similarities('alpha beta'), fresh.similarities('alpha beta'))
+
+    def test_analyzer_reuses_saved_index(self):
+        index_dir = os.path.join(self.tmp.name, 'indexes')
+        first = DataAnalyzer(index_dir=index_dir)
+        for i, text in enumerate(self.texts):
+            first._add_document(text, f'doc{i}.pdf')
+
+        second = DataAnalyzer(index_dir=index_dir)
+        for i, text in enumerate(self.texts):
+            second._add_document(text, f'doc{i}.pdf')
+        self.assertTrue(is_memory_mapped(second.index.matrix.data))
+        self.assertEqual(second.search_documents('delta', k=1), ['beta delta'])
+
+    def test_intermediate_indexes_stay_reusable(self):
+        index_dir = os.path.join(self.tmp.name, 'indexes')
+        first = DataAnalyzer(index_dir=index_dir)
+        for i, text in enumerate(self.texts):
+            first._add_document(text, f'doc{i}.pdf')
+
+        second = DataAnalyzer(index_dir=index_dir)
+        second._add_document(self.texts[0], 'doc0.pdf')
+        self.assertTrue(is_memory_mapped(second.index.matrix.data))
+        self.assertEqual(len(os.listdir(index_dir)), len(self.texts))
+
+    def test_store_evicts_least_recently_used_entries(self):
+        index = IncrementalTfidfIndex()
+        index.add_documents(self.texts)
+        store = IndexStore(self.tmp.name)
+        store.save('a', index, self.texts)
+        entry_bytes = store.entries()[0][1]
+
+        store.max_bytes = 2 * entry_bytes
+        store.save('b', index, self.texts)
+        os.utime(store.path('a'), (0, 0))
+        os.utime(store.path('b'), (1, 1))
+        store.load('a')
+        store.save('c', index, self.texts)
+        self.assertEqual(sorted(key for key, _, _ in store.entries()), ['a', 'c'])
+
+    def test_vanished_entries_are_cache_misses(self):
+        index_dir = os.path.join(self.tmp.name, 'indexes')
+        first = DataAnalyzer(index_dir=index_dir)
+        first._add_document(self.texts[0], 'doc0.pdf')
+        store = IndexStore(index_dir)
+        key = first._index_key()
+        with mock.patch.object(IncrementalTfidfIndex, 'load', side_effect=FileNotFoundError(key)):
+            with self.assertRaises(KeyError):
+                store.load(key)
+            second = DataAnalyzer(index_dir=index_dir)
+            second._add_document(self.texts[0], 'doc0.pdf')
+        self.assertFalse(is_memory_mapped(second.index.matrix.data))
+        self.assertEqual(second.search_documents('alpha', k=1), [self.texts[0]])
+
+class TestSerializeRows(unittest.TestCase):
+    @staticmethod
+    def iterrows_texts(df):
+        return [" | ".join([f"{col}: {val}" for col, val in row.items()]) for _, row in df.iterrows()]
+
+    def test_matches_iterrows_format(self):
+        timestamps = pd.to_datetime(['2024-01-01 00:00:00.500000', 'NaT', '2024-03-04 05:06:07.000000'])
+        frames = [
+            pd.DataFrame({'a': [1, 2, 3], 'b': [0.5, np.nan, 1e16]}),
+            pd.DataFrame({'a': np.array([0.1, 2.5, 3], dtype=np.float32)}),
+            pd.DataFrame({'a': pd.array([1, None, 3], dtype='Int64')}),
+            pd.DataFrame({'a': pd.array([1, None, 3], dtype='Int64'), 'b': ['x', None, 'z']}),
+            pd.DataFrame({'when': timestamps, 'flag': [True, False, True], 'name': ['x', 'y', 'z']}),
+            pd.DataFrame({'when': timestamps}),
+            pd.DataFrame({'a': pd.Categorical(['x', None, 'x']), 'b': [1, 2, 3]}),
+            pd.DataFrame({'a': pd.to_timedelta([1, 2, 3], unit='s')}),
+            pd.DataFrame({'a': pd.date_range('2024-01-01', periods=3, tz='UTC')}),
+            pd.DataFrame([[1, 'a'], [2, 'b'], [3, 'c']], columns=['x', 'x']),
+            pd.DataFrame(index=[0, 1, 2]),
+        ]
+        for df in frames:
+            self.assertEqual(serialize_rows(df, chunksize=2), self.iterrows_texts(df))
+
+    def test_chunks_cover_all_rows(self):
+        df = pd.DataFrame({'a': range(10), 'b': list('abcdefghij')})
+        chunks = list(iter_serialized_rows(df, chunksize=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        self.assertEqual(chunks[0][0], 'a: 0 | b: a')
+        self.assertEqual(list(iter_serialized_rows(df.iloc[:0])), [])
+
+if __name__ == '__main__':
+    unittest.main()